@@ -0,0 +1,79 @@
+"""
+Benchmark applying a small diff to a large ontology with `OntologyBuilder.apply`, after indexing its namespace again,
+compared to building the whole namespace again.
+
+Usage:
+
+    python -m benchmarks.bench_apply [num_classes] [extra_triples_per_class] [num_changes]
+
+"""
+import sys
+from timeit import default_timer
+
+from rdflib import Literal, RDFS
+
+from ontology_alchemy.builder import OntologyBuilder
+from ontology_alchemy.session import session_context
+
+from benchmarks.synthetic import SYNTHETIC_NAMESPACE, generate_ontology_graph
+
+
+def generate_diff(num_classes, num_changes):
+    """
+    Generate a diff relabeling classes, and adding new sub-classes and properties in their domain.
+
+    """
+    namespace = SYNTHETIC_NAMESPACE
+    added, removed = [], []
+    for i in range(num_changes // 4):
+        class_uri = namespace["Class{}".format(num_classes - 1 - i)]
+        removed.append((class_uri, RDFS.label, Literal("Class {}".format(num_classes - 1 - i), lang="en")))
+        added.append((class_uri, RDFS.label, Literal("Relabeled class {}".format(i), lang="en")))
+
+        new_class_uri = namespace["NewClass{}".format(i)]
+        property_uri = namespace["newProperty{}".format(i)]
+        added.append((new_class_uri, RDFS.subClassOf, class_uri))
+        added.append((property_uri, RDFS.domain, new_class_uri))
+
+    return added, removed
+
+
+def run(num_classes=40000, extra_triples_per_class=20, num_changes=100):
+    graph = generate_ontology_graph(
+        num_classes=num_classes,
+        num_properties=num_classes // 5,
+        extra_triples_per_class=extra_triples_per_class,
+    )
+    added, removed = generate_diff(num_classes, num_changes)
+
+    with session_context():
+        builder = OntologyBuilder(graph, base_uri=str(SYNTHETIC_NAMESPACE))
+        start = default_timer()
+        builder.build_namespace()
+        build_elapsed = default_timer() - start
+
+        # Eager ontologies do not keep their builder, which is built again when changes are first applied
+        start = default_timer()
+        index_builder = OntologyBuilder(graph, base_uri=str(SYNTHETIC_NAMESPACE))
+        index_builder.index_namespace(builder.namespace)
+        index_elapsed = default_timer() - start
+
+        start = default_timer()
+        index_builder.apply(added, removed)
+        apply_elapsed = default_timer() - start
+
+    print(
+        "triples: {}, classes: {}, build_namespace: {:.3f}s, index_namespace: {:.3f}s, "
+        "apply ({} changes): {:.2f}ms".format(
+            len(graph),
+            len(builder.namespace),
+            build_elapsed,
+            index_elapsed,
+            len(added) + len(removed),
+            apply_elapsed * 1000,
+        )
+    )
+
+
+if __name__ == "__main__":
+    run(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,49 @@
+"""
+Benchmark assigning values to the properties of ontology class instances (e.g `instance.label += "Acme Inc."`).
+
+Usage:
+
+    python -m benchmarks.bench_assign [num_assignments] [num_repeats]
+
+"""
+import sys
+from timeit import default_timer
+
+from rdflib import Literal
+
+from ontology_alchemy.session import session_context
+from ontology_alchemy.tests.fixtures import create_ontology
+
+
+def time_assignments(property_proxy, value, num_assignments):
+    start = default_timer()
+    for _ in range(num_assignments):
+        property_proxy += value
+    elapsed = default_timer() - start
+    del property_proxy.values[:]
+
+    return elapsed
+
+
+def run(num_assignments=100000, num_repeats=10):
+    ontology = create_ontology()
+
+    with session_context(weak=True):
+        organization = ontology.Organization(uri="http://example.com/organization")
+        person = ontology.Person(uri="http://example.com/person")
+        literal = Literal("Acme Inc.", lang="en")
+
+        for name, value in (("hasEmployee", person), ("label", literal), ("numberOfEmployees", 42)):
+            property_proxy = getattr(organization, name)
+            # Best of several runs, as timings of such short operations are noisy
+            elapsed = min(time_assignments(property_proxy, value, num_assignments) for _ in range(num_repeats))
+
+            print("{} += {}: {:.3f}us per assignment".format(
+                name,
+                type(value).__name__,
+                elapsed * 1e6 / num_assignments,
+            ))
+
+
+if __name__ == "__main__":
+    run(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,38 @@
+"""
+Benchmark `OntologyBuilder.build_namespace` on a large synthetic ontology.
+
+Usage:
+
+    python -m benchmarks.bench_builder [num_classes] [extra_triples_per_class]
+
+"""
+import sys
+from timeit import default_timer
+
+from ontology_alchemy.builder import OntologyBuilder
+from ontology_alchemy.session import session_context
+
+from benchmarks.synthetic import SYNTHETIC_NAMESPACE, generate_ontology_graph
+
+
+def run(num_classes=20000, extra_triples_per_class=20, repeat=3):
+    graph = generate_ontology_graph(
+        num_classes=num_classes,
+        num_properties=num_classes // 5,
+        extra_triples_per_class=extra_triples_per_class,
+    )
+    timings = []
+    for _ in range(repeat):
+        with session_context():
+            builder = OntologyBuilder(graph, base_uri=str(SYNTHETIC_NAMESPACE))
+            start = default_timer()
+            builder.build_namespace()
+            timings.append(default_timer() - start)
+
+    print("triples: {}, classes: {}, build_namespace best of {}: {:.3f}s".format(
+        len(graph), len(builder.namespace), repeat, min(timings),
+    ))
+
+
+if __name__ == "__main__":
+    run(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,70 @@
+"""
+Benchmark creating many instances one at a time through the class constructor,
+compared to `bulk_create()` and `from_records()`.
+
+Usage:
+
+    python -m benchmarks.bench_bulk [num_instances]
+
+"""
+import gc
+import sys
+from timeit import default_timer
+
+from ontology_alchemy.session import session_context
+from ontology_alchemy.tests.fixtures import create_ontology
+
+
+def create_one_at_a_time(ontology, records):
+    return [ontology.Corporation(**record) for record in records]
+
+
+def create_from_dicts(ontology, records):
+    return ontology.Corporation.bulk_create(records)
+
+
+def create_from_tuples(ontology, records):
+    return ontology.Corporation.from_records(
+        (
+            (record["uri"], record["label"], record["naics"], record["numberOfEmployees"])
+            for record in records
+        ),
+        fields=("uri", "label", "naics", "numberOfEmployees"),
+    )
+
+
+def run(num_instances=200000):
+    ontology = create_ontology()
+    records = [
+        {
+            "uri": "http://example.com/corporation/{}".format(i),
+            "label": "Corporation {}".format(i),
+            # Industry codes, shared by many corporations
+            "naics": "{}".format(i % 1000),
+            "numberOfEmployees": i,
+        }
+        for i in range(num_instances)
+    ]
+
+    for name, function in (
+        ("constructor", create_one_at_a_time),
+        ("bulk_create", create_from_dicts),
+        ("from_records", create_from_tuples),
+    ):
+        with session_context():
+            gc.collect()
+            start = default_timer()
+            instances = function(ontology, records)
+            elapsed = default_timer() - start
+            del instances
+
+        print("{}: {} instances, {:.2f}s ({:.2f}us per instance)".format(
+            name,
+            num_instances,
+            elapsed,
+            elapsed * 1e6 / num_instances,
+        ))
+
+
+if __name__ == "__main__":
+    run(*[int(arg) for arg in sys.argv[1:]])
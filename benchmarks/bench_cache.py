@@ -0,0 +1,58 @@
+"""
+Benchmark cold vs warm `Ontology.load` startup using the compiled ontology cache.
+
+Usage:
+
+    python -m benchmarks.bench_cache [num_classes]
+
+"""
+import sys
+from os import path
+from shutil import rmtree
+from tempfile import mkdtemp
+from timeit import default_timer
+
+from ontology_alchemy.cache import CompiledOntologyCache
+from ontology_alchemy.ontology import Ontology
+from ontology_alchemy.session import session_context
+
+from benchmarks.synthetic import generate_ontology_graph
+
+
+def timed_load(filename, cache_dir):
+    with session_context():
+        start = default_timer()
+        Ontology.load(filename, cache_dir=cache_dir)
+        return default_timer() - start
+
+
+def run(num_classes=20000, repeat=3):
+    directory = mkdtemp()
+    try:
+        filename = path.join(directory, "ontology.ttl")
+        generate_ontology_graph(
+            num_classes=num_classes,
+            num_properties=num_classes // 5,
+        ).serialize(destination=filename, format="turtle")
+        cache_dir = path.join(directory, "cache")
+        cache = CompiledOntologyCache(cache_dir)
+
+        cold_timings = []
+        for _ in range(repeat):
+            cache.invalidate()
+            cold_timings.append(timed_load(filename, cache_dir))
+
+        warm_timings = [timed_load(filename, cache_dir) for _ in range(repeat)]
+    finally:
+        rmtree(directory)
+
+    print("classes: {}, cold load: {:.3f}s, warm load: {:.3f}s ({:.1f}x faster)".format(
+        num_classes + num_classes // 5,
+        min(cold_timings),
+        min(warm_timings),
+        min(cold_timings) / min(warm_timings),
+    ))
+
+
+if __name__ == "__main__":
+    run(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,58 @@
+"""
+Benchmark the memory footprint of generated classes, using tracemalloc.
+
+Usage:
+
+    python -m benchmarks.bench_class_memory [num_classes]
+
+"""
+import gc
+import sys
+import tracemalloc
+
+from ontology_alchemy.base import RDFS_Class
+from ontology_alchemy.builder import OntologyBuilder
+from ontology_alchemy.session import session_context
+
+from benchmarks.synthetic import SYNTHETIC_NAMESPACE, generate_ontology_graph
+
+
+def traced_memory(function, *args):
+    gc.collect()
+    with session_context():
+        tracemalloc.start()
+        result = function(*args)
+        gc.collect()
+        memory, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return result, memory
+
+
+def create_bare_classes(num_classes):
+    return [type("Class{}".format(i), (RDFS_Class,), {}) for i in range(num_classes)]
+
+
+def build_namespace(compiled):
+    return OntologyBuilder(None, base_uri=compiled["base_uri"]).build_namespace(compiled)
+
+
+def run(num_classes=20000):
+    graph = generate_ontology_graph(num_classes=num_classes, num_properties=num_classes // 5)
+    compiled = OntologyBuilder(graph, base_uri=str(SYNTHETIC_NAMESPACE)).compile()
+    del graph
+
+    classes, memory = traced_memory(create_bare_classes, num_classes)
+    print("bare classes: {}, {:.0f} bytes per class".format(len(classes), float(memory) / len(classes)))
+    del classes
+
+    namespace, memory = traced_memory(build_namespace, compiled)
+    print("ontology classes (labeled and commented): {}, {:.1f}MB allocated, {:.0f} bytes per class".format(
+        len(namespace),
+        memory / 1024.0 / 1024.0,
+        float(memory) / len(namespace),
+    ))
+
+
+if __name__ == "__main__":
+    run(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,85 @@
+"""
+Benchmark the memory footprint of instances stored in a `ColumnarStore`, compared to class instances,
+along with scanning all instances for a given property value.
+
+Usage:
+
+    python -m benchmarks.bench_columnar [num_instances]
+
+"""
+import gc
+import sys
+import tracemalloc
+from timeit import default_timer
+
+from rdflib import Literal
+
+from ontology_alchemy.columnar import ColumnarStore
+from ontology_alchemy.session import session_context
+from ontology_alchemy.tests.fixtures import create_ontology
+
+
+def generate_records(num_instances):
+    # Each corporation has an industry code and a size shared by many other corporations
+    return (
+        {
+            "uri": "http://example.com/corporation/{}".format(i),
+            "naics": "{}".format(i % 1000),
+            "numberOfEmployees": i % 5000,
+        }
+        for i in range(num_instances)
+    )
+
+
+def traced_memory(function, *args):
+    gc.collect()
+    tracemalloc.start()
+    result = function(*args)
+    gc.collect()
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return result, memory
+
+
+def create_instances(ontology, num_instances):
+    return ontology.Corporation.bulk_create(generate_records(num_instances))
+
+
+def create_columnar_instances(ontology, num_instances):
+    store = ColumnarStore(ontology.Corporation)
+    store.extend(generate_records(num_instances))
+    return store
+
+
+def run(num_instances=200000):
+    ontology = create_ontology()
+
+    with session_context(weak=True):
+        instances, memory = traced_memory(create_instances, ontology, num_instances)
+        start = default_timer()
+        value = Literal("42", lang="en")
+        matches = [instance for instance in instances if value in instance.naics.values]
+        elapsed = default_timer() - start
+        print("class instances: {}, {:.0f} bytes per instance, scan: {:.3f}s ({} matches)".format(
+            num_instances,
+            float(memory) / num_instances,
+            elapsed,
+            len(matches),
+        ))
+        del instances
+
+    store, memory = traced_memory(create_columnar_instances, ontology, num_instances)
+    start = default_timer()
+    matches = store.rows_with("naics", "42")
+    elapsed = default_timer() - start
+    print("columnar instances: {}, {:.0f} bytes per instance, scan: {:.3f}s ({} matches)".format(
+        num_instances,
+        float(memory) / num_instances,
+        elapsed,
+        len(matches),
+    ))
+
+
+if __name__ == "__main__":
+    run(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,85 @@
+"""
+Benchmark queries over the class hierarchy (sub-class checks, and listing the descendants of classes)
+through the reachability index of the hierarchy, compared to `issubclass()` and `__subclasses__()` walks,
+on a synthetic class hierarchy in which some classes also have a mixin class as a second base class.
+
+Usage:
+
+    python -m benchmarks.bench_hierarchy [num_classes] [num_queries]
+
+"""
+import random
+import sys
+from timeit import default_timer
+
+from rdflib import RDF, RDFS
+
+from ontology_alchemy.builder import OntologyBuilder
+from ontology_alchemy.ontology import Ontology
+from ontology_alchemy.session import session_context
+
+from benchmarks.synthetic import SYNTHETIC_NAMESPACE, generate_ontology_graph
+
+
+def walk_subclasses(klass):
+    descendants = []
+    seen = set([klass])
+    stack = [klass]
+    while stack:
+        for sub_class in stack.pop().__subclasses__():
+            if sub_class not in seen:
+                seen.add(sub_class)
+                descendants.append(sub_class)
+                stack.append(sub_class)
+
+    return descendants
+
+
+def run(num_classes=20000, num_queries=100000, num_mixins=100):
+    random.seed(0)
+    graph = generate_ontology_graph(num_classes=num_classes, num_properties=0)
+    mixins = [SYNTHETIC_NAMESPACE["Mixin{}".format(i)] for i in range(num_mixins)]
+    for mixin in mixins:
+        graph.add((mixin, RDF.type, RDFS.Class))
+    # One class in ten also has a mixin class as a second base class
+    for i in range(10, num_classes, 10):
+        graph.add((SYNTHETIC_NAMESPACE["Class{}".format(i)], RDFS.subClassOf, random.choice(mixins)))
+
+    with session_context():
+        builder = OntologyBuilder(graph, base_uri=str(SYNTHETIC_NAMESPACE))
+        ontology = Ontology(builder.build_namespace(), graph=None, base_uri=builder.base_uri, builder=builder)
+        classes = [getattr(ontology, name) for name in ontology.__terms__]
+        pairs = [(random.choice(classes), random.choice(classes)) for _ in range(num_queries)]
+
+        start = default_timer()
+        hierarchy = ontology.__builder__.hierarchy()
+        print("index: {} classes, {} intervals, built in {:.3f}s".format(
+            len(hierarchy),
+            sum(len(intervals) // 2 for intervals in hierarchy.intervals.values()),
+            default_timer() - start,
+        ))
+
+        start = default_timer()
+        for klass, base in pairs:
+            issubclass(klass, base)
+        print("{} checks with issubclass(): {:.3f}s".format(num_queries, default_timer() - start))
+        start = default_timer()
+        for klass, base in pairs:
+            ontology.is_subclass(klass, base)
+        print("{} checks with Ontology.is_subclass(): {:.3f}s".format(num_queries, default_timer() - start))
+
+        roots = classes[:50] + [getattr(ontology, "Mixin{}".format(i)) for i in range(50)]
+        start = default_timer()
+        walked = sum(len(walk_subclasses(klass)) for klass in roots)
+        print("descendants of {} classes ({} in all) with __subclasses__() walks: {:.3f}s".format(
+            len(roots), walked, default_timer() - start,
+        ))
+        start = default_timer()
+        listed = sum(len(ontology.descendants(klass)) for klass in roots)
+        print("descendants of {} classes ({} in all) with Ontology.descendants(): {:.3f}s".format(
+            len(roots), listed, default_timer() - start,
+        ))
+
+
+if __name__ == "__main__":
+    run(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,52 @@
+"""
+Benchmark looking up the inferred domain and range of property classes in a deep rdfs:subPropertyOf chain.
+
+Usage:
+
+    python -m benchmarks.bench_inferred [depth] [num_lookups]
+
+"""
+import sys
+from timeit import default_timer
+
+from ontology_alchemy.base import RDF_Property, RDFS_Class
+from ontology_alchemy.session import session_context
+
+
+def create_property_chain(depth):
+    domain_class = type("Domain", (RDFS_Class,), {})
+    range_class = type("Range", (RDFS_Class,), {})
+
+    property_class = type("property0", (RDF_Property,), {})
+    property_class.domain += domain_class
+    property_class.range += range_class
+    for i in range(1, depth):
+        property_class = type("property{}".format(i), (property_class,), {})
+
+    return property_class
+
+
+def run(depth=300, num_lookups=10000):
+    with session_context():
+        property_class = create_property_chain(depth)
+
+        start = default_timer()
+        property_class.inferred_domain()
+        property_class.inferred_range()
+        elapsed = default_timer() - start
+        print("first lookup (depth={}): {:.2f}ms".format(depth, elapsed * 1000))
+
+        start = default_timer()
+        for _ in range(num_lookups):
+            property_class.inferred_domain()
+            property_class.inferred_range()
+        elapsed = default_timer() - start
+        print("{} lookups: {:.3f}s, {:.2f}us per lookup".format(
+            num_lookups,
+            elapsed,
+            elapsed / num_lookups * 1e6,
+        ))
+
+
+if __name__ == "__main__":
+    run(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,56 @@
+"""
+Benchmark loading an N-Triples ontology by parsing it into a graph, compared to
+parsing it in chunks, straight into the builder, with `ontology_alchemy.ingestion`.
+
+Usage:
+
+    python -m benchmarks.bench_ingestion [num_classes] [extra_triples_per_class] [max_processes]
+
+"""
+import sys
+from multiprocessing import cpu_count
+from os import path
+from shutil import rmtree
+from tempfile import mkdtemp
+from timeit import default_timer
+
+from ontology_alchemy.ontology import Ontology
+from ontology_alchemy.session import session_context
+
+from benchmarks.synthetic import generate_ontology_graph
+
+
+def timed_load(filename, processes=None, repeat=3):
+    timings = []
+    for _ in range(repeat):
+        with session_context():
+            start = default_timer()
+            Ontology.load(filename, processes=processes)
+            timings.append(default_timer() - start)
+    return min(timings)
+
+
+def run(num_classes=20000, extra_triples_per_class=20, max_processes=None):
+    directory = mkdtemp()
+    try:
+        filename = path.join(directory, "ontology.nt")
+        graph = generate_ontology_graph(
+            num_classes=num_classes,
+            num_properties=num_classes // 5,
+            extra_triples_per_class=extra_triples_per_class,
+        )
+        graph.serialize(destination=filename, format="nt")
+
+        print("triples: {}, graph load: {:.3f}s".format(len(graph), timed_load(filename)))
+        del graph
+
+        processes = 1
+        while processes <= (max_processes or cpu_count()):
+            print("processes: {}, chunked load: {:.3f}s".format(processes, timed_load(filename, processes)))
+            processes *= 2
+    finally:
+        rmtree(directory)
+
+
+if __name__ == "__main__":
+    run(*[int(arg) for arg in sys.argv[1:]])
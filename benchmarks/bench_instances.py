@@ -0,0 +1,52 @@
+"""
+Benchmark the construction time and memory footprint of ontology class instances.
+
+Usage:
+
+    python -m benchmarks.bench_instances [num_instances]
+
+"""
+import gc
+import sys
+import tracemalloc
+from timeit import default_timer
+
+from ontology_alchemy.session import session_context
+from ontology_alchemy.tests.fixtures import create_ontology
+
+
+def create_instances(ontology, num_instances):
+    return [
+        ontology.Corporation(uri="http://example.com/corporation/{}".format(i), label="Corporation")
+        for i in range(num_instances)
+    ]
+
+
+def run(num_instances=1000000):
+    ontology = create_ontology()
+
+    with session_context():
+        gc.collect()
+        start = default_timer()
+        instances = create_instances(ontology, num_instances)
+        elapsed = default_timer() - start
+        del instances
+
+    with session_context():
+        gc.collect()
+        tracemalloc.start()
+        instances = create_instances(ontology, num_instances)
+        memory, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del instances
+
+    print("instances: {}, construction: {:.2f}s ({:.2f}us per instance), {:.0f} bytes per instance".format(
+        num_instances,
+        elapsed,
+        elapsed * 1e6 / num_instances,
+        float(memory) / num_instances,
+    ))
+
+
+if __name__ == "__main__":
+    run(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,64 @@
+"""
+Benchmark eager vs lazy class materialization from a compiled ontology.
+
+Usage:
+
+    python -m benchmarks.bench_lazy [num_classes] [num_accessed]
+
+"""
+import sys
+import tracemalloc
+from timeit import default_timer
+
+from ontology_alchemy.builder import OntologyBuilder
+from ontology_alchemy.session import session_context
+
+from benchmarks.synthetic import SYNTHETIC_NAMESPACE, generate_ontology_graph
+
+
+def build(compiled, lazy, accessed):
+    builder = OntologyBuilder(None, base_uri=compiled["base_uri"])
+    namespace = builder.build_namespace(compiled, lazy=lazy)
+    for class_name in accessed:
+        namespace.get(class_name) or builder.materialize(class_name).__properties__
+
+    return builder
+
+
+def measure(compiled, lazy, accessed):
+    with session_context():
+        start = default_timer()
+        builder = build(compiled, lazy, accessed)
+        elapsed = default_timer() - start
+        created = len(builder.namespace)
+        del builder
+
+    with session_context():
+        tracemalloc.start()
+        builder = build(compiled, lazy, accessed)
+        memory, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del builder
+
+    return elapsed, created, memory
+
+
+def run(num_classes=50000, num_accessed=50):
+    graph = generate_ontology_graph(num_classes=num_classes, num_properties=num_classes // 5)
+    compiled = OntologyBuilder(graph, base_uri=str(SYNTHETIC_NAMESPACE)).compile()
+    del graph
+    step = num_classes // num_accessed
+    accessed = ["Class{}".format(i) for i in range(0, num_classes, step)][:num_accessed]
+
+    for lazy in (False, True):
+        elapsed, created, memory = measure(compiled, lazy, accessed)
+        print("{}: {:.3f}s, {} classes created, {:.1f}MB allocated".format(
+            "lazy" if lazy else "eager",
+            elapsed,
+            created,
+            memory / 1024.0 / 1024.0,
+        ))
+
+
+if __name__ == "__main__":
+    run(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,117 @@
+"""
+Benchmark loading many ontologies with `Ontology.load_many`, parsing files in the current process compared to
+parsing them across a pool of processes, with and without keeping their graphs, along with the cost for the parent
+process of receiving what a worker process parsed from a file.
+
+Usage:
+
+    python -m benchmarks.bench_load_many [num_files] [num_classes] [extra_triples_per_class] [max_processes]
+
+"""
+import pickle
+import sys
+from multiprocessing import cpu_count
+from os import path
+from shutil import rmtree
+from tempfile import mkdtemp
+from timeit import default_timer
+
+from rdflib import Graph, RDFS
+
+from ontology_alchemy.builder import OntologyBuilder
+from ontology_alchemy.ontology import Ontology, _batch_statements, _parse_ontology
+from ontology_alchemy.session import session_context
+
+from benchmarks.synthetic import SYNTHETIC_NAMESPACE, generate_ontology_graph
+
+
+def write_ontologies(directory, num_files, num_classes, extra_triples_per_class):
+    """
+    Write ontologies of distinct namespaces, each extending the classes of the previous one.
+
+    """
+    graph = generate_ontology_graph(
+        num_classes=num_classes,
+        num_properties=num_classes // 5,
+        extra_triples_per_class=extra_triples_per_class,
+    )
+    content = graph.serialize(format="nt", encoding="utf-8").decode("utf-8")
+    filenames = []
+    for index in range(num_files):
+        namespace = str(SYNTHETIC_NAMESPACE).replace("#", "{}#".format(index))
+        filename = path.join(directory, "ontology-{}.nt".format(index))
+        with open(filename, "w") as ontology_file:
+            ontology_file.write(content.replace(str(SYNTHETIC_NAMESPACE), namespace))
+            if index:
+                base_class_uri = str(SYNTHETIC_NAMESPACE).replace("#", "{}#Class1".format(index - 1))
+                ontology_file.write("<{}Class0> <{}> <{}> .\n".format(namespace, RDFS.subClassOf, base_class_uri))
+        filenames.append(filename)
+
+    return filenames, len(graph)
+
+
+def timed_load_many(filenames, processes, keep_graph=True, repeat=1):
+    timings = []
+    for _ in range(repeat):
+        with session_context():
+            start = default_timer()
+            Ontology.load_many(filenames, processes=processes, keep_graph=keep_graph)
+            timings.append(default_timer() - start)
+    return min(timings)
+
+
+def run(num_files=4, num_classes=2000, extra_triples_per_class=20, max_processes=None):
+    directory = mkdtemp()
+    try:
+        filenames, num_triples = write_ontologies(directory, num_files, num_classes, extra_triples_per_class)
+
+        graph = Graph()
+        start = default_timer()
+        graph.parse(filenames[0], format="nt")
+        parse_elapsed = default_timer() - start
+
+        data = pickle.dumps(list(graph), pickle.HIGHEST_PROTOCOL)
+        start = default_timer()
+        received_graph = Graph()
+        for statement in pickle.loads(data):
+            received_graph.add(statement)
+        statements_elapsed = default_timer() - start
+
+        data = pickle.dumps(graph, pickle.HIGHEST_PROTOCOL)
+        start = default_timer()
+        pickle.loads(data)
+        graph_elapsed = default_timer() - start
+
+        base_uri, batch = _parse_ontology((filenames[0], "nt", False))
+        data = pickle.dumps(batch, pickle.HIGHEST_PROTOCOL)
+        start = default_timer()
+        OntologyBuilder(_batch_statements(pickle.loads(data)), base_uri=base_uri)
+        batch_elapsed = default_timer() - start
+
+        print(
+            "triples per file: {}, parse: {:.3f}s, receive as statements: {:.3f}s, as a graph: {:.3f}s, "
+            "as a batch of the statements needed to build the namespace: {:.3f}s".format(
+                num_triples,
+                parse_elapsed,
+                statements_elapsed,
+                graph_elapsed,
+                batch_elapsed,
+            )
+        )
+        del graph, received_graph, batch, data
+
+        processes = 1
+        while processes <= max(max_processes or cpu_count(), 2):
+            print("files: {}, processes: {}, load_many: {:.3f}s, without graphs: {:.3f}s".format(
+                num_files,
+                processes,
+                timed_load_many(filenames, processes),
+                timed_load_many(filenames, processes, keep_graph=False),
+            ))
+            processes *= 2
+    finally:
+        rmtree(directory)
+
+
+if __name__ == "__main__":
+    run(*[int(arg) for arg in sys.argv[1:]])
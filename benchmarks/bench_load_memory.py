@@ -0,0 +1,73 @@
+"""
+Benchmark the peak memory footprint of `Ontology.load`, parsing the ontology into a graph
+compared to streaming its statements straight into the builder (`keep_graph=False`).
+
+Each load runs in a fresh process, whose peak resident set size is reported. The ontology is also generated
+in its own process, as the peak resident set size of processes includes that of their parent when started.
+
+Usage:
+
+    python -m benchmarks.bench_load_memory [num_classes] [extra_triples_per_class]
+
+"""
+import resource
+import sys
+from multiprocessing import get_context
+from os import path
+from shutil import rmtree
+from tempfile import mkdtemp
+from timeit import default_timer
+
+from benchmarks.synthetic import generate_ontology_graph
+
+
+def generate(filename, num_classes, extra_triples_per_class, results):
+    graph = generate_ontology_graph(
+        num_classes=num_classes,
+        num_properties=num_classes // 5,
+        extra_triples_per_class=extra_triples_per_class,
+    )
+    graph.serialize(destination=filename, format="turtle")
+    results.put(len(graph))
+
+
+def run_in_process(function, *args):
+    context = get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=function, args=args + (results,))
+    process.start()
+    result = results.get()
+    process.join()
+    return result
+
+
+def load(filename, keep_graph, results):
+    from ontology_alchemy.ontology import Ontology
+
+    start = default_timer()
+    ontology = Ontology.load(filename, keep_graph=keep_graph)
+    elapsed = default_timer() - start
+    # Peak resident set size, in kilobytes on Linux
+    results.put((len(ontology.__terms__), elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss))
+
+
+def run(num_classes=20000, extra_triples_per_class=20):
+    directory = mkdtemp()
+    try:
+        filename = path.join(directory, "ontology.ttl")
+        print("triples: {}".format(run_in_process(generate, filename, num_classes, extra_triples_per_class)))
+
+        for keep_graph in (True, False):
+            num_terms, elapsed, max_rss = run_in_process(load, filename, keep_graph)
+            print("keep_graph: {}, classes: {}, load: {:.3f}s, peak RSS: {:.1f}MB".format(
+                keep_graph,
+                num_terms,
+                elapsed,
+                max_rss / 1024.0,
+            ))
+    finally:
+        rmtree(directory)
+
+
+if __name__ == "__main__":
+    run(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,50 @@
+"""
+Benchmark the propagation of properties to the classes in their domain (and their sub-classes)
+on a wide or deep synthetic class hierarchy.
+
+Usage:
+
+    python -m benchmarks.bench_propagation [wide|deep] [num_classes] [num_properties]
+
+"""
+import sys
+from timeit import default_timer
+
+from ontology_alchemy.builder import OntologyBuilder
+from ontology_alchemy.session import session_context
+
+from benchmarks.synthetic import SYNTHETIC_NAMESPACE, generate_ontology_graph
+
+
+def timed(function, timings):
+    def timed_function(*args, **kwargs):
+        start = default_timer()
+        result = function(*args, **kwargs)
+        timings.append(default_timer() - start)
+        return result
+
+    return timed_function
+
+
+def run(shape="wide", num_classes=10000, num_properties=1000):
+    # Every class is a sub-class of the root class in a wide hierarchy, and of the previous class in a deep one
+    branching = num_classes if shape == "wide" else 1
+    graph = generate_ontology_graph(num_classes=num_classes, num_properties=num_properties, branching=branching)
+    compiled = OntologyBuilder(graph, base_uri=str(SYNTHETIC_NAMESPACE)).compile()
+
+    with session_context():
+        builder = OntologyBuilder(None, base_uri=compiled["base_uri"])
+        timings = []
+        builder._build_property_proxies = timed(builder._build_property_proxies, timings)
+        start = default_timer()
+        namespace = builder.build_namespace(compiled)
+        elapsed = default_timer() - start
+
+        num_properties = sum(len(klass.__properties__) for klass in namespace.values())
+        print("{} hierarchy, classes: {}, class properties: {}, build_namespace: {:.3f}s, propagation: {:.3f}s".format(
+            shape, len(namespace), num_properties, elapsed, timings[0],
+        ))
+
+
+if __name__ == "__main__":
+    run(*[arg if i == 0 else int(arg) for i, arg in enumerate(sys.argv[1:])])
@@ -0,0 +1,51 @@
+"""
+Benchmark querying the instances of a class (and its sub-classes) from a session holding many instances.
+
+Usage:
+
+    python -m benchmarks.bench_queries [num_instances] [num_queries]
+
+"""
+import sys
+from timeit import default_timer
+
+from ontology_alchemy.session import session_context
+from ontology_alchemy.tests.fixtures import create_ontology
+
+
+def run(num_instances=200000, num_queries=100):
+    ontology = create_ontology()
+
+    with session_context() as session:
+        # Most instances are of unrelated classes, as is typical of sessions holding data of a whole ontology
+        for i in range(num_instances):
+            if i % 100:
+                ontology.Person()
+            else:
+                ontology.Corporation()
+
+        start = default_timer()
+        for _ in range(num_queries):
+            scanned = [
+                instance
+                for instance in session.instances
+                if isinstance(instance, ontology.Organization)
+            ]
+        scan_elapsed = (default_timer() - start) / num_queries
+
+        start = default_timer()
+        for _ in range(num_queries):
+            queried = list(session.instances_of(ontology.Organization))
+        query_elapsed = (default_timer() - start) / num_queries
+
+    assert len(scanned) == len(queried)
+    print("instances: {}, results: {}, isinstance scan: {:.2f}ms, instances_of: {:.2f}ms".format(
+        num_instances,
+        len(queried),
+        scan_elapsed * 1000,
+        query_elapsed * 1000,
+    ))
+
+
+if __name__ == "__main__":
+    run(*[int(arg) for arg in sys.argv[1:]])
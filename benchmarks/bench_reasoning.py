@@ -0,0 +1,92 @@
+"""
+Benchmark the entailment of the statements of instances (transitive, inverse, symmetric and sub-properties,
+domains and ranges) on a synthetic family tree, from scratch and incrementally, compared to a naive fixpoint
+which joins all known statements on every round.
+
+Usage:
+
+    python -m benchmarks.bench_reasoning [num_people] [branching]
+
+"""
+import sys
+from timeit import default_timer
+
+from six import StringIO
+
+from ontology_alchemy.ontology import Ontology
+from ontology_alchemy.reasoning import Reasoner
+from ontology_alchemy.session import session_context
+
+
+FAMILY_ONTOLOGY = """
+    @prefix rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#> .
+    @prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+    @prefix owl: <http://www.w3.org/2002/07/owl#> .
+    @prefix ex: <http://example.com/family#> .
+
+    ex:Person a rdfs:Class .
+    ex:Parent a rdfs:Class; rdfs:subClassOf ex:Person .
+    ex:knows a rdf:Property, owl:SymmetricProperty; rdfs:domain ex:Person; rdfs:range ex:Person .
+    ex:hasAncestor a rdf:Property, owl:TransitiveProperty; rdfs:domain ex:Person; rdfs:range ex:Person .
+    ex:hasParent a rdf:Property; rdfs:subPropertyOf ex:hasAncestor; rdfs:range ex:Parent .
+    ex:hasChild a rdf:Property; owl:inverseOf ex:hasParent; rdfs:domain ex:Person .
+"""
+
+
+class NaiveReasoner(Reasoner):
+    """Joins all known statements (rather than the delta) on every round, until a fixpoint is reached."""
+
+    def run(self, instances=None):
+        instances = list(instances or self.session.instances)
+        self._index_property_classes(instances)
+        num_inferred = len(self.inferred)
+        new = [statement for statement in self._asserted_statements(instances) if self._add(*statement)]
+        while new:
+            new = []
+            for p, objects_by_subject in list(self.statements.items()):
+                for s, objects in list(objects_by_subject.items()):
+                    for o in list(objects):
+                        for statement in self._entail(s, p, o):
+                            if self._add(*statement):
+                                self.inferred.append(statement)
+                                new.append(statement)
+
+        return len(self.inferred) - num_inferred
+
+
+def run(num_people=5000, branching=3):
+    for reasoner_class in (Reasoner, NaiveReasoner):
+        with session_context():
+            ontology = Ontology.load(StringIO(FAMILY_ONTOLOGY), format="turtle")
+            people = [ontology.Person(uri="http://example.com/person/{}".format(i)) for i in range(num_people)]
+            for i, person in enumerate(people):
+                if i:
+                    person.hasParent += people[(i - 1) // branching]
+                    person.knows += people[i - 1]
+
+            reasoner = reasoner_class()
+            start = default_timer()
+            num_inferred = reasoner.run()
+            print("{}: {} people, {} statements entailed in {:.3f}s".format(
+                reasoner_class.__name__, num_people, num_inferred, default_timer() - start,
+            ))
+
+            newcomers = [ontology.Person(uri="http://example.com/newcomer/{}".format(i)) for i in range(100)]
+            for i, newcomer in enumerate(newcomers):
+                newcomer.hasParent += people[-1 - i]
+            start = default_timer()
+            num_inferred = reasoner.run(newcomers)
+            print("{}: {} newcomers, {} statements entailed in {:.3f}s".format(
+                reasoner_class.__name__, len(newcomers), num_inferred, default_timer() - start,
+            ))
+
+            people[-1].knows += newcomers[0]
+            start = default_timer()
+            num_inferred = reasoner.run()
+            print("{}: run over all instances after adding 1 value, {} statements entailed in {:.3f}s".format(
+                reasoner_class.__name__, num_inferred, default_timer() - start,
+            ))
+
+
+if __name__ == "__main__":
+    run(*[int(arg) for arg in sys.argv[1:]])
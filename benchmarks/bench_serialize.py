@@ -0,0 +1,75 @@
+"""
+Benchmark serializing the instances of a session to N-Triples, streaming statements out with
+`Session.serialize()` compared to loading them into an `rdflib.Graph` first.
+
+Usage:
+
+    python -m benchmarks.bench_serialize [num_instances]
+
+"""
+import gc
+import sys
+import tracemalloc
+from os import devnull
+from timeit import default_timer
+
+from rdflib import Graph, URIRef
+
+from ontology_alchemy.serialization import to_term
+from ontology_alchemy.session import session_context
+from ontology_alchemy.tests.fixtures import create_ontology
+
+
+def serialize_with_session(session, stream):
+    session.serialize(stream, format="nt")
+
+
+def serialize_with_graph(session, stream):
+    graph = Graph()
+    for subject, predicate, value in session.rdf_statements():
+        graph.add((URIRef(subject), predicate, to_term(value)))
+    graph.serialize(stream, format="nt")
+
+
+def measure(function, *args):
+    gc.collect()
+    start = default_timer()
+    function(*args)
+    elapsed = default_timer() - start
+
+    gc.collect()
+    tracemalloc.start()
+    function(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return elapsed, peak
+
+
+def run(num_instances=100000):
+    ontology = create_ontology()
+
+    with session_context() as session:
+        for i in range(num_instances):
+            corporation = ontology.Corporation(
+                uri="http://example.com/corporation/{}".format(i),
+                label="Corporation {}".format(i),
+            )
+            corporation.numberOfEmployees += i
+
+        for name, function in (
+            ("Session.serialize", serialize_with_session),
+            ("Graph.serialize", serialize_with_graph),
+        ):
+            with open(devnull, "wb") as stream:
+                elapsed, peak = measure(function, session, stream)
+            print("{}: {} instances, {:.2f}s, peak memory: {:.1f}MB".format(
+                name,
+                num_instances,
+                elapsed,
+                peak / 1024.0 / 1024.0,
+            ))
+
+
+if __name__ == "__main__":
+    run(*[int(arg) for arg in sys.argv[1:]])
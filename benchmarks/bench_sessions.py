@@ -0,0 +1,158 @@
+"""
+Stress test sessions under concurrency: threads and asyncio tasks creating instances, each in their own
+session context, and threads creating instances in a shared session, checking that no registration is lost
+or leaks into another session. Also times registering instances in a single thread, which every instance
+construction pays for.
+
+Usage:
+
+    python -m benchmarks.bench_sessions [num_workers] [num_instances]
+
+"""
+import asyncio
+import sys
+from threading import Thread
+from timeit import default_timer
+
+from ontology_alchemy.session import Session, session_context
+from ontology_alchemy.tests.fixtures import create_ontology
+
+
+def create_instances(ontology, worker, num_instances):
+    for i in range(num_instances):
+        ontology.Organization(uri="http://example.com/{}/{}".format(worker, i), label="Organization {}".format(i))
+
+
+def check_session(session, ontology, workers, num_instances):
+    expected = len(workers) * num_instances
+    actual = (
+        len(session.instances),
+        len(session.instances_by_uri),
+        len(list(session.instances_of(ontology.Organization))),
+    )
+    if actual != (expected, expected, expected):
+        raise AssertionError("Expected {} instances in all indexes, found {}".format(expected, actual))
+
+    for worker in workers:
+        for i in (0, num_instances - 1):
+            if session.get("http://example.com/{}/{}".format(worker, i)) is None:
+                raise AssertionError("Instance {} of worker {} is not registered".format(i, worker))
+
+
+def run_threads(ontology, num_workers, num_instances):
+    scoped_sessions = {}
+
+    def scoped_worker(worker):
+        with session_context() as session:
+            scoped_sessions[worker] = session
+            create_instances(ontology, worker, num_instances)
+
+    # Threads without a session context of their own share the default session
+    shared_session = Session.default
+    shared_session.clear()
+    threads = [Thread(target=scoped_worker, args=(worker,)) for worker in range(num_workers)]
+    threads.extend(
+        Thread(target=create_instances, args=(ontology, "shared-{}".format(worker), num_instances))
+        for worker in range(num_workers)
+    )
+
+    start = default_timer()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = default_timer() - start
+
+    for worker, session in scoped_sessions.items():
+        check_session(session, ontology, [worker], num_instances)
+    shared_workers = ["shared-{}".format(worker) for worker in range(num_workers)]
+    check_session(shared_session, ontology, shared_workers, num_instances)
+    shared_session.clear()
+
+    return elapsed
+
+
+def run_tasks(ontology, num_tasks, num_instances, batch_size=100):
+    scoped_sessions = {}
+
+    async def scoped_worker(task):
+        with session_context() as session:
+            scoped_sessions[task] = session
+            for i in range(0, num_instances, batch_size):
+                create_instances(ontology, "{}-{}".format(task, i), batch_size)
+                # Interleave the tasks, as request handlers awaiting I/O would
+                await asyncio.sleep(0)
+
+    async def run_workers():
+        await asyncio.gather(*[scoped_worker(task) for task in range(num_tasks)])
+
+    start = default_timer()
+    asyncio.run(run_workers())
+    elapsed = default_timer() - start
+
+    for task, session in scoped_sessions.items():
+        check_session(
+            session,
+            ontology,
+            ["{}-{}".format(task, i) for i in range(0, num_instances, batch_size)],
+            batch_size,
+        )
+
+    return elapsed
+
+
+def run_registration(ontology, num_instances, repeat=5):
+    """
+    Time registering instances in a session, from a single thread.
+
+    :returns {float} the best time per registration, in seconds
+
+    """
+    with session_context():
+        instances = [ontology.Organization(uri="http://example.com/{}".format(i)) for i in range(num_instances)]
+
+    timings = []
+    for weak in (False, True) * repeat:
+        session = Session(weak=weak)
+        start = default_timer()
+        for instance in instances:
+            session.register_instance(instance)
+        timings.append((weak, default_timer() - start))
+
+    return [
+        min(elapsed for weak, elapsed in timings if weak is weak_session) / num_instances
+        for weak_session in (False, True)
+    ]
+
+
+def run(num_workers=8, num_instances=20000):
+    ontology = create_ontology()
+    total = num_workers * 2 * num_instances
+
+    with session_context():
+        start = default_timer()
+        create_instances(ontology, "single", total)
+        single_elapsed = default_timer() - start
+
+    threads_elapsed = run_threads(ontology, num_workers, num_instances)
+    tasks_elapsed = run_tasks(ontology, num_workers * 2, num_instances)
+
+    print("instances: {}, single thread: {:.3f}s, {} scoped + {} shared threads: {:.3f}s, {} tasks: {:.3f}s".format(
+        total,
+        single_elapsed,
+        num_workers,
+        num_workers,
+        threads_elapsed,
+        num_workers * 2,
+        tasks_elapsed,
+    ))
+
+    registration, weak_registration = run_registration(ontology, total)
+    print("registration: {:.3f}us per instance, {:.3f}us in a weak session".format(
+        registration * 1e6,
+        weak_registration * 1e6,
+    ))
+
+
+if __name__ == "__main__":
+    run(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,276 @@
+"""
+Benchmark suite timing the hot paths of the library (loading an ontology, building its namespace, creating
+instances, assigning their properties and exporting their statements) on synthetic ontologies of varying shapes,
+and measuring the peak memory allocated by each.
+
+Results are saved as JSON, and can be compared with the results of a previous run (e.g of another commit),
+flagging the phases which got slower or use more memory.
+
+Usage:
+
+    python -m benchmarks.suite [--scenario NAME ...] [--repeat N] [--output results.json] [--compare baseline.json]
+
+"""
+import gc
+import json
+import platform
+import subprocess
+import sys
+import tracemalloc
+from argparse import ArgumentParser
+from collections import OrderedDict
+from datetime import datetime
+from os import devnull, path
+from shutil import rmtree
+from tempfile import mkdtemp
+from timeit import default_timer
+
+import rdflib
+
+from ontology_alchemy.builder import OntologyBuilder
+from ontology_alchemy.ontology import Ontology
+from ontology_alchemy.session import session_context
+
+from benchmarks.synthetic import SYNTHETIC_NAMESPACE, generate_ontology_graph
+
+
+# Version of the format of saved results. Bump whenever results stop being comparable with previous ones.
+RESULTS_FORMAT_VERSION = 1
+
+# Synthetic ontologies and instance volumes benchmarked, keyed by name:
+# - classes: number of classes
+# - branching: number of sub-classes per class (or depth: number of levels of the class hierarchy)
+# - fan_out: number of properties having each class as their domain
+# - instances: number of instances created
+SCENARIOS = OrderedDict((
+    ("balanced", dict(classes=5000, branching=4, fan_out=1, instances=20000)),
+    ("wide", dict(classes=10000, branching=10000, fan_out=0.2, instances=20000)),
+    ("deep", dict(classes=2000, depth=200, fan_out=1, instances=20000)),
+    ("fan-out", dict(classes=1000, branching=4, fan_out=10, instances=20000)),
+    ("instances", dict(classes=1000, branching=4, fan_out=1, instances=200000)),
+))
+
+# Phases benchmarked for each scenario, in order
+PHASES = ("load", "build_namespace", "instantiate", "assign", "export")
+
+# Relative slowdown (or memory increase) from which phases are flagged when comparing results
+DEFAULT_THRESHOLD = 0.1
+
+
+class Scenario(object):
+    """
+    A synthetic ontology, saved to a file, and the state shared by the benchmarked phases.
+
+    """
+
+    def __init__(self, directory, session, classes, fan_out, instances, branching=4, depth=None):
+        self.graph = generate_ontology_graph(
+            num_classes=classes,
+            num_properties=int(classes * fan_out),
+            branching=branching,
+            depth=depth,
+        )
+        self.filename = path.join(directory, "ontology.ttl")
+        self.graph.serialize(destination=self.filename, format="turtle")
+        self.num_classes = classes
+        self.num_instances = instances
+        self.session = session
+        self.namespace = None
+        self.instances = None
+
+    def load(self):
+        Ontology.load(self.filename)
+
+    def build_namespace(self):
+        self.namespace = OntologyBuilder(self.graph, base_uri=str(SYNTHETIC_NAMESPACE)).build_namespace()
+
+    def instantiate(self):
+        # Instances of the last class, which is a leaf of the class hierarchy
+        klass = self.namespace["Class{}".format(self.num_classes - 1)]
+        self.instances = [
+            klass(uri="http://example.com/instance/{}".format(i), label="Instance {}".format(i))
+            for i in range(self.num_instances)
+        ]
+
+    def assign(self):
+        # A value for each of the properties of the instances: a literal or an instance of (the class of) their range
+        values = []
+        for property_class in self.instances[0].__class__.__properties__:
+            range_class = property_class.range.values[0]
+            value = range_class("Value") if range_class is rdflib.Literal else range_class()
+            values.append((property_class.__name__, value))
+
+        for instance in self.instances:
+            for name, value in values:
+                property_proxy = getattr(instance, name)
+                property_proxy += value
+
+    def export(self):
+        with open(devnull, "wb") as stream:
+            self.session.serialize(stream, format="nt")
+
+    def setup(self, phase):
+        """
+        Prepare the state a phase runs from, e.g the instances properties are assigned to,
+        starting from an empty session so that each run of a phase does the same work.
+
+        """
+        if phase == "export":
+            return
+
+        self.session.clear()
+        if phase in ("instantiate", "assign"):
+            self.build_namespace()
+        if phase == "assign":
+            self.instantiate()
+
+
+def measure(scenario, phase, repeat):
+    """
+    Time a phase (best of `repeat` runs), then run it once more to measure the peak memory it allocates.
+
+    :returns {dict} the elapsed time, in seconds, and the peak memory, in bytes
+
+    """
+    function = getattr(scenario, phase)
+    timings = []
+    for _ in range(repeat):
+        scenario.setup(phase)
+        gc.collect()
+        start = default_timer()
+        function()
+        timings.append(default_timer() - start)
+
+    scenario.setup(phase)
+    gc.collect()
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return OrderedDict((("seconds", min(timings)), ("peak_memory", peak)))
+
+
+def run_scenario(params, repeat):
+    directory = mkdtemp()
+    try:
+        with session_context() as session:
+            scenario = Scenario(directory, session, **params)
+            results = OrderedDict(
+                (phase, measure(scenario, phase, repeat))
+                for phase in PHASES
+            )
+    finally:
+        rmtree(directory)
+
+    return results
+
+
+def run(scenarios=None, repeat=3):
+    """
+    Run the benchmark suite.
+
+    :param scenarios - the names of the scenarios to run. Defaults to all scenarios.
+    :param repeat - the number of times each phase is timed
+    :returns {dict} the results
+
+    """
+    results = OrderedDict((
+        ("version", RESULTS_FORMAT_VERSION),
+        ("commit", _git_commit()),
+        ("date", datetime.utcnow().isoformat()),
+        ("python", platform.python_version()),
+        ("rdflib", rdflib.__version__),
+        ("scenarios", OrderedDict()),
+    ))
+    for name in scenarios or SCENARIOS:
+        params = SCENARIOS[name]
+        results["scenarios"][name] = OrderedDict((
+            ("params", params),
+            ("phases", run_scenario(params, repeat)),
+        ))
+        for phase, result in results["scenarios"][name]["phases"].items():
+            print("{}: {}: {:.3f}s, peak memory: {:.1f}MB".format(
+                name,
+                phase,
+                result["seconds"],
+                result["peak_memory"] / 1024.0 / 1024.0,
+            ))
+
+    return results
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compare results with the results of a previous run.
+
+    :param results - the results
+    :param baseline - the results of the previous run
+    :param threshold - the relative slowdown (or memory increase) from which phases are flagged
+    :returns {list} the (scenario, phase, metric, ratio) of the flagged phases
+
+    """
+    if baseline.get("version") != results["version"]:
+        raise ValueError("Cannot compare with results of version {}".format(baseline.get("version")))
+
+    regressions = []
+    for name, scenario in results["scenarios"].items():
+        baseline_scenario = baseline["scenarios"].get(name)
+        if baseline_scenario is None or baseline_scenario["params"] != scenario["params"]:
+            continue
+
+        for phase, result in scenario["phases"].items():
+            baseline_result = baseline_scenario["phases"][phase]
+            ratios = [
+                (metric, float(result[metric]) / baseline_result[metric])
+                for metric in ("seconds", "peak_memory")
+                if baseline_result[metric]
+            ]
+            print("{}: {}: {}".format(name, phase, ", ".join(
+                "{} x{:.2f}".format(metric, ratio) for metric, ratio in ratios
+            )))
+            regressions.extend(
+                (name, phase, metric, ratio)
+                for metric, ratio in ratios
+                if ratio > 1 + threshold
+            )
+
+    return regressions
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"],
+            cwd=path.dirname(path.abspath(__file__)),
+        ).decode("utf-8").strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = ArgumentParser(description="Benchmark the hot paths of ontology-alchemy.")
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS), dest="scenarios")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="file to save the results to, as JSON")
+    parser.add_argument("--compare", help="file of previously saved results to compare the results with")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    results = run(args.scenarios, repeat=args.repeat)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            regressions = compare(results, json.load(baseline_file), threshold=args.threshold)
+        for name, phase, metric, ratio in regressions:
+            print("REGRESSION {}: {}: {} x{:.2f}".format(name, phase, metric, ratio))
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
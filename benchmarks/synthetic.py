@@ -0,0 +1,64 @@
+"""Synthetic ontology generators used by the benchmarks."""
+from rdflib import Graph, Literal, Namespace, RDF, RDFS
+from rdflib.namespace import SKOS, XSD
+
+
+SYNTHETIC_NAMESPACE = Namespace("http://example.com/synthetic#")
+
+
+def generate_ontology_graph(num_classes=1000, num_properties=200, branching=4, extra_triples_per_class=0, depth=None):
+    """
+    Generate an RDFS ontology graph with a balanced class hierarchy.
+
+    :param num_classes - number of rdfs:Class resources to generate
+    :param num_properties - number of rdf:Property resources, each with a domain and range. Properties are spread
+        evenly over classes, so that each class is the domain of `num_properties / num_classes` of them.
+    :param branching - number of sub-classes per class in the hierarchy
+    :param depth - if given, classes are instead split into this many levels of about the same size, the classes
+        of each level being sub-classes of the classes of the previous level in turn
+    :param extra_triples_per_class - number of non-schema (skos) annotation triples
+        to attach to every class, mimicking large real-world ontologies
+    :returns populated `rdflib.Graph` instance
+
+    """
+    graph = Graph()
+    namespace = SYNTHETIC_NAMESPACE
+
+    classes = [namespace["Class{}".format(i)] for i in range(num_classes)]
+    for i, class_uri in enumerate(classes):
+        graph.add((class_uri, RDF.type, RDFS.Class))
+        graph.add((class_uri, RDFS.label, Literal("Class {}".format(i), lang="en")))
+        graph.add((class_uri, RDFS.comment, Literal("Synthetic class number {}".format(i))))
+        if depth:
+            level_start, previous_level_start = _level_start(i, num_classes, depth)
+            if level_start:
+                parent = previous_level_start + (i - level_start) % (level_start - previous_level_start)
+                graph.add((class_uri, RDFS.subClassOf, classes[parent]))
+        elif i:
+            graph.add((class_uri, RDFS.subClassOf, classes[(i - 1) // branching]))
+        for j in range(extra_triples_per_class):
+            graph.add((class_uri, SKOS.altLabel, Literal("Class {} alias {}".format(i, j), lang="en")))
+
+    for i in range(num_properties):
+        property_uri = namespace["property{}".format(i)]
+        graph.add((property_uri, RDF.type, RDF.Property))
+        graph.add((property_uri, RDFS.label, Literal("property {}".format(i), lang="en")))
+        graph.add((property_uri, RDFS.domain, classes[i % num_classes]))
+        if i % 2:
+            graph.add((property_uri, RDFS.range, classes[(i * 7) % num_classes]))
+        else:
+            graph.add((property_uri, RDFS.range, XSD.string))
+        if i and i % 10 == 0:
+            graph.add((property_uri, RDFS.subPropertyOf, namespace["property{}".format(i - 1)]))
+
+    return graph
+
+
+def _level_start(index, num_classes, depth):
+    """
+    :returns {tuple} the index of the first class of the level of a class, and of the previous level,
+        when splitting classes into `depth` levels of about the same size
+
+    """
+    level = index * depth // num_classes
+    return -(-level * num_classes // depth), -(-max(level - 1, 0) * num_classes // depth)
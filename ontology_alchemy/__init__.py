@@ -1,3 +1,4 @@
 # Global namespace imports
 from ontology_alchemy.ontology import Ontology  # noqa:F401
 from ontology_alchemy.session import Session  # noqa:F401
+from ontology_alchemy.version import __version__  # noqa:F401
@@ -1,12 +1,18 @@
 """Base classes used in constructing ontologies."""
-from itertools import chain
 from random import choice
 from string import ascii_lowercase, ascii_uppercase, digits
+from weakref import WeakKeyDictionary
 
-from rdflib.namespace import RDF, RDFS, SKOS
+from rdflib.namespace import OWL, RDF, RDFS, SKOS
 from six import with_metaclass
 
-from ontology_alchemy.proxy import LiteralPropertyProxy, PropertyProxy
+from ontology_alchemy.proxy import (
+    LiteralPropertyProxy,
+    PropertyProxy,
+    SchemaMemo,
+    SchemaPropertyProxy,
+    VersionedList,
+)
 from ontology_alchemy.session import Session
 
 
@@ -18,6 +24,69 @@ def generate_uri(base_uri, random_length=8):
     return "{}_{}".format(base_uri, random_id)
 
 
+# Core RDFS properties, as defined in the RDF Schema specification, of all class instances.
+INSTANCE_CORE_PROPERTIES = (
+    ("label", RDFS.label, LiteralPropertyProxy),
+    ("comment", RDFS.comment, LiteralPropertyProxy),
+    ("seeAlso", RDFS.seeAlso, PropertyProxy),
+    ("isDefinedBy", RDFS.isDefinedBy, PropertyProxy),
+    ("value", RDF.value, PropertyProxy),
+)
+
+# Class-level property proxies of all generated classes, keyed by class.
+CLASS_PROPERTY_PROXIES = WeakKeyDictionary()
+
+
+class ClassPropertyProxyDescriptor(object):
+    """
+    Descriptor for a class-level property proxy (e.g `Cls.label`), defined on a metaclass.
+
+    Proxies are created the first time they are accessed and kept in the `CLASS_PROPERTY_PROXIES` table,
+    so that generated classes only carry the proxies of the properties actually used on them.
+
+    """
+    __slots__ = ("name", "uri", "proxy_class")
+
+    def __init__(self, name, uri, proxy_class=PropertyProxy):
+        self.name = name
+        self.uri = uri
+        self.proxy_class = proxy_class
+
+    def __get__(self, cls, meta_cls=None):
+        if cls is None:
+            return self
+
+        proxies = CLASS_PROPERTY_PROXIES.get(cls)
+        if proxies is None:
+            proxies = CLASS_PROPERTY_PROXIES[cls] = {}
+
+        proxy = proxies.get(self.name)
+        if proxy is None:
+            proxy = proxies[self.name] = self.proxy_class(name=self.name, uri=self.uri)
+
+        return proxy
+
+    def __set__(self, cls, proxy):
+        proxies = CLASS_PROPERTY_PROXIES.setdefault(cls, {})
+        previous = proxies.get(self.name)
+        proxies[self.name] = proxy
+        if isinstance(previous, SchemaPropertyProxy):
+            # Values memoized from the replaced proxy are stale
+            previous.invalidate()
+
+
+def _versioned(properties):
+    """
+    Return the given property classes as a list which changes version whenever it is modified, unless they are
+    already kept in one (e.g a `PendingPropertyList`).
+
+    """
+    if getattr(properties, "version", None) is not None:
+        return properties
+
+    return VersionedList(properties)
+
+
 class RDFS_ClassMeta(type):
     """
     Metaclass for the `RDFS_Class` class.
@@ -26,26 +95,65 @@ class RDFS_ClassMeta(type):
     to an RDFS.Class resource.
 
     """
+    # Define proxies for the core RDFS properties as defined in the RDF Schema specification
+    label = ClassPropertyProxyDescriptor("label", RDFS.label, LiteralPropertyProxy)
+    comment = ClassPropertyProxyDescriptor("comment", RDFS.comment, LiteralPropertyProxy)
+    seeAlso = ClassPropertyProxyDescriptor("seeAlso", RDFS.seeAlso)
+    isDefinedBy = ClassPropertyProxyDescriptor("isDefinedBy", RDFS.isDefinedBy)
+    value = ClassPropertyProxyDescriptor("value", RDF.value)
+
+    # Define proxies for other common properties
+    prefLabel = ClassPropertyProxyDescriptor("prefLabel", SKOS.prefLabel, LiteralPropertyProxy)
+
     def __new__(meta_cls, name, bases, dct):
-        dct.setdefault("__properties__", [])
+        dct["__properties__"] = _versioned(dct.get("__properties__", ()))
         dct.setdefault("__uri__", None)
 
         return super(RDFS_ClassMeta, meta_cls).__new__(meta_cls, name, bases, dct)
 
     def __init__(cls, name, bases, dct):
-        # Define proxies for the core RDFS properties as defined in the RDF Schema specification
-        cls.label = LiteralPropertyProxy(name="label", uri=RDFS.label)
-        cls.comment = LiteralPropertyProxy(name="comment", uri=RDFS.comment)
-        cls.seeAlso = PropertyProxy(name="seeAlso", uri=RDFS.seeAlso)
-        cls.isDefinedBy = PropertyProxy(name="isDefinedBy", uri=RDFS.isDefinedBy)
-        cls.value = PropertyProxy(name="value", uri=RDF.value)
-
-        # Define proxies for other common properties
-        cls.prefLabel = LiteralPropertyProxy(name="prefLabel", uri=SKOS.prefLabel)
-
         Session.get_current().register_class(cls)
         return super(RDFS_ClassMeta, cls).__init__(name, bases, dct)
 
+    def __setattr__(cls, name, value):
+        if name == "__properties__":
+            # Kept in a list which changes version whenever it is modified, see `_property_schema()`
+            value = _versioned(value)
+        super(RDFS_ClassMeta, cls).__setattr__(name, value)
+
+    def _property_schema(cls):
+        """
+        Return the (empty) prototypes of the property proxies of the class instances, keyed by property name.
+
+        The schema is computed once per class, and computed again whenever the properties of the class
+        (i.e the version of `__properties__`, see `VersionedList`), or the (inferred) range of any of its
+        properties, change.
+
+        """
+        properties = cls.__properties__
+        cached = cls.__dict__.get("__property_schema__")
+        if (
+            cached is not None and cached[0] is properties and
+            cached[1] == properties.version and
+            (cached[2].latest == SchemaPropertyProxy.latest or cached[2].is_current())
+        ):
+            return cached[2].values
+
+        latest = SchemaPropertyProxy.latest
+        schema = dict(
+            (name, proxy_class(name=name, uri=uri))
+            for name, uri, proxy_class in INSTANCE_CORE_PROPERTIES
+        )
+        for property_class in properties:
+            schema[property_class.__name__] = PropertyProxy.for_(property_class)
+
+        # Prototypes depend on the inferred range of the properties
+        dependencies = [property_class._inferred_memo("range") for property_class in properties]
+        # Read once the properties are iterated over, as lazily built namespaces only resolve them then
+        version = properties.version
+        cls.__property_schema__ = (properties, version, SchemaMemo(latest, None, dependencies, schema))
+        return schema
+
 
 class RDF_PropertyMeta(RDFS_ClassMeta):
     """
@@ -55,12 +163,76 @@ class RDF_PropertyMeta(RDFS_ClassMeta):
     to an RDFS.Property resource.
 
     """
-    def __init__(cls, name, bases, dct):
-        # Define proxies for the core RDFS properties as defined in the RDF Schema specification
-        cls.domain = PropertyProxy(name="domain", uri=RDFS.domain)
-        cls.range = PropertyProxy(name="range", uri=RDFS.range)
+    # Define proxies for the core RDFS properties as defined in the RDF Schema specification
+    domain = ClassPropertyProxyDescriptor("domain", RDFS.domain, SchemaPropertyProxy)
+    range = ClassPropertyProxyDescriptor("range", RDFS.range, SchemaPropertyProxy)
 
-        return super(RDF_PropertyMeta, cls).__init__(name, bases, dct)
+    # Define proxies for the OWL properties relating properties
+    inverseOf = ClassPropertyProxyDescriptor("inverseOf", OWL.inverseOf)
+
+    def _inferred(cls, name):
+        """
+        Return the values of the `domain` or `range` property of the class and of all its ancestors.
+
+        Values are memoized per class, along with the versions of the proxies they are derived from
+        (see `SchemaPropertyProxy`), so that repeated lookups do not walk the property hierarchy.
+
+        :param name - either "domain" or "range"
+        :returns {list} the inferred values. Callers must not modify it.
+
+        """
+        return cls._inferred_memo(name).values
+
+    def _inferred_memo(cls, name):
+        """
+        Return the memoized values of the `domain` or `range` property of the class and of all its ancestors,
+        computing them again if any of the proxies they are derived from changed.
+
+        :param name - either "domain" or "range"
+        :returns {SchemaMemo} the memo
+
+        """
+        memo_name = "__inferred_{}__".format(name)
+        latest = SchemaPropertyProxy.latest
+        memo = cls.__dict__.get(memo_name)
+        if memo is not None and memo.latest == latest:
+            return memo
+
+        # Memos computed by this lookup, which are current even when derived from proxies which are not versioned
+        computed = {}
+
+        def memoized(klass):
+            memo = computed.get(klass)
+            if memo is None:
+                memo = klass.__dict__.get(memo_name)
+                if memo is not None and not memo.is_current():
+                    memo = None
+            return memo
+
+        # Memoize the ancestors first (without recursion, as sub-property chains can be arbitrarily deep)
+        stack = [(cls, False)]
+        while stack:
+            klass, bases_memoized = stack.pop()
+            if memoized(klass) is not None:
+                continue
+            base_classes = [
+                base_class
+                for base_class in klass.__bases__
+                if getattr(base_class, name, None)
+            ]
+            if bases_memoized:
+                proxy = getattr(klass, name)
+                values = list(proxy.values)
+                dependencies = [memoized(base_class) for base_class in base_classes]
+                for dependency in dependencies:
+                    values.extend(dependency.values)
+                memo = computed[klass] = SchemaMemo(latest, proxy, dependencies, values)
+                setattr(klass, memo_name, memo)
+            else:
+                stack.append((klass, True))
+                stack.extend((base_class, False) for base_class in base_classes)
+
+        return memoized(cls)
 
 
 class RDFS_Class(with_metaclass(RDFS_ClassMeta)):
@@ -71,23 +243,121 @@ class RDFS_Class(with_metaclass(RDFS_ClassMeta)):
     """
 
     def __init__(self, uri=None, **kwargs):
-        # Define proxies for the core RDFS properties as defined in the RDF Schema specification
-        self.label = LiteralPropertyProxy(name="label", uri=RDFS.label)
-        self.comment = LiteralPropertyProxy(name="comment", uri=RDFS.comment)
-        self.seeAlso = PropertyProxy(name="seeAlso", uri=RDFS.seeAlso)
-        self.isDefinedBy = PropertyProxy(name="isDefinedBy", uri=RDFS.isDefinedBy)
-        self.value = PropertyProxy(name="value", uri=RDF.value)
+        # Property proxies are only created when first accessed, see `__getattr__`
         self.uri = uri or generate_uri(self.__class__.__uri__)
 
-        for property_class in self.__class__.__properties__:
-            setattr(self, property_class.__name__, PropertyProxy.for_(property_class))
-
         for k, v in kwargs.items():
             property_proxy = getattr(self, k)
             property_proxy += v
 
         Session.get_current().register_instance(self)
 
+    @classmethod
+    def bulk_create(cls, records):
+        """
+        Create and register many instances of the class at once.
+
+        This is equivalent to, but much faster than, calling the class constructor for each record:
+        the property schema of the class is resolved once, and instances are registered in one step.
+
+        :param records - iterable over dicts of property values keyed by property name,
+            as passed to the class constructor (e.g `{"uri": ..., "label": ...}`)
+        :returns {list} the created instances
+
+        """
+        return cls._bulk_create(record.items() for record in records)
+
+    @classmethod
+    def from_records(cls, records, fields):
+        """
+        Create and register many instances of the class at once, from tuples of property values.
+
+        :param records - iterable over tuples of property values, ordered as `fields`
+        :param fields - the names of the properties (or "uri") of the values of each record
+        :returns {list} the created instances
+
+        """
+        fields = tuple(fields)
+        return cls._bulk_create(zip(fields, record) for record in records)
+
+    @classmethod
+    def _bulk_create(cls, records):
+        instances = cls._create_instances(records)
+        Session.get_current().register_instances(instances)
+
+        return instances
+
+    @classmethod
+    def _create_instances(cls, records):
+        schema = cls._property_schema()
+        new_instance = object.__new__
+        # For each property: its prototype proxy, the types of the values known to be valid (the validity of a value
+        # only depends on its type, see `PropertyProxy.is_valid()`) and the converted values (e.g literals), so that
+        # values repeated across records are only converted once and share a same (immutable) converted value.
+        properties = {}
+
+        instances = []
+        for items in records:
+            instance = new_instance(cls)
+            attributes = instance.__dict__
+            uri = None
+            for name, value in items:
+                if name == "uri":
+                    uri = value
+                    continue
+
+                property_ = properties.get(name)
+                if property_ is None:
+                    prototype = schema.get(name)
+                    if prototype is None:
+                        # Class-level property proxies, or unknown properties
+                        property_proxy = getattr(instance, name)
+                        property_proxy += value
+                        continue
+                    property_ = properties[name] = (prototype, set(), {})
+                prototype, valid_types, converted_values = property_
+
+                if value.__class__ not in valid_types:
+                    prototype.validate(value)
+                    valid_types.add(value.__class__)
+
+                try:
+                    converted = converted_values.get(value)
+                except TypeError:
+                    # Unhashable values (e.g lists, for properties with an unrestricted range) are not memoized
+                    converted = prototype.convert(value)
+                else:
+                    if converted is None:
+                        converted = prototype.convert(value)
+                        if converted is not value:
+                            converted_values[value] = converted
+
+                property_proxy = attributes.get(name)
+                if property_proxy is None:
+                    property_proxy = attributes[name] = prototype.empty_copy()
+                property_proxy.values.append(converted)
+
+            attributes["uri"] = uri or generate_uri(cls.__uri__)
+            instances.append(instance)
+
+        return instances
+
+    def __getattr__(self, name):
+        # Only invoked for attributes not set on the instance, i.e property proxies not created yet
+        klass = self.__class__
+        prototype = klass._property_schema().get(name)
+        if prototype is not None:
+            property_proxy = prototype.empty_copy()
+            setattr(self, name, property_proxy)
+            return property_proxy
+
+        # Class-level property proxies (e.g `prefLabel`) are shared with instances
+        descriptor = getattr(type(klass), name, None)
+        if isinstance(descriptor, ClassPropertyProxyDescriptor):
+            return descriptor.__get__(klass)
+
+        raise AttributeError("{} object has no attribute {}".format(klass.__name__, name))
+
     def iter_rdf_statements(self):
         """
         Returns an iterable over (subject, predicate, object) triples
@@ -108,6 +378,9 @@ class RDF_Property(with_metaclass(RDF_PropertyMeta, RDFS_Class)):
     corresponding to the RDFS.Property resource.
 
     """
+    # The characteristics (e.g OWL.TransitiveProperty) a property class is declared with. Characteristics are
+    # not inherited by sub-properties, and are therefore only looked up in the `__dict__` of property classes.
+    __characteristics__ = frozenset()
 
     def __init__(self, *args, **kwargs):
         super(RDF_Property, self).__init__(*args, **kwargs)
@@ -125,14 +398,10 @@ class RDF_Property(with_metaclass(RDF_PropertyMeta, RDFS_Class)):
         Calculate the full domain for this property class based on traversing up the full
         property inheritance hierarchy.
 
+        The result is memoized, and only calculated again after the domain of a property changes.
+
         """
-        return cls.domain.values + list(
-            chain.from_iterable(
-                base_class.inferred_domain()
-                for base_class in cls.__bases__
-                if getattr(base_class, 'domain', None)
-            )
-        )
+        return list(cls._inferred("domain"))
 
     @classmethod
     def inferred_range(cls):
@@ -140,11 +409,7 @@ class RDF_Property(with_metaclass(RDF_PropertyMeta, RDFS_Class)):
         Calculate the full range for this property class based on traversing up the full
         property inheritance hierarchy.
 
+        The result is memoized, and only calculated again after the range of a property changes.
+
         """
-        return cls.range.values + list(
-            chain.from_iterable(
-                base_class.inferred_range()
-                for base_class in cls.__bases__
-                if getattr(base_class, 'range', None)
-            )
-        )
+        return list(cls._inferred("range"))
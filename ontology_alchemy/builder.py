@@ -1,91 +1,608 @@
-from collections import Counter, defaultdict
-from itertools import islice
+from collections import OrderedDict, defaultdict
 from logging import getLogger
-from random import sample
 
-from rdflib import Literal, RDF, RDFS
-from six.moves.urllib.parse import urldefrag, urlparse
+from rdflib import Literal, OWL, RDF, RDFS, URIRef
+from six import text_type
 from toposort import toposort
 
-from ontology_alchemy.base import RDFS_Class, RDF_Property
-from ontology_alchemy.constants import DEFAULT_LANGUAGE_TAG
+from ontology_alchemy.base import RDFS_Class, RDFS_ClassMeta, RDF_Property, RDF_PropertyMeta
+from ontology_alchemy.constants import DEFAULT_LANGUAGE_TAG, PROPERTY_CHARACTERISTIC_URIS
+from ontology_alchemy.hierarchy import HierarchyIndex
+from ontology_alchemy.proxy import SchemaPropertyProxy, VersionedList
 from ontology_alchemy.schema import (
     in_namespace,
     is_a_property,
     is_a_property_subtype,
     is_a_list,
     is_a_literal,
-    is_comment_predicate,
-    is_domain_predicate,
-    is_label_predicate,
-    is_range_predicate,
-    is_sub_class_predicate,
-    is_sub_property_predicate,
-    is_type_predicate,
     looks_like_a_property_uri,
 )
+from ontology_alchemy.stats import phase
+
+try:
+    from collections.abc import MutableSequence
+except ImportError:  # Python 2
+    from collections import MutableSequence
+
+
+# Version of the compiled ontology format returned by `OntologyBuilder.compile()`.
+# Bump whenever the structure of compiled ontologies changes.
+COMPILED_FORMAT_VERSION = 2
+
+# Types which are not part of an ontology namespace, as referenced from compiled class definitions.
+BUILTIN_TYPES = {
+    text_type(RDFS.Class): RDFS_Class,
+    text_type(RDF.Property): RDF_Property,
+    text_type(RDFS.Literal): Literal,
+    text_type(RDF.List): RDF.List,
+}
+
+# Maximum number of distinct base URIs counted at once when inferring the base URI of an ontology
+MAX_BASE_URI_CANDIDATES = 1000
+
+# Positions of the builtin base classes of compiled class definitions, sub-classes coming first.
+BUILTIN_POSITIONS = {
+    text_type(RDF.Property): -1,
+    text_type(RDFS.Class): -2,
+}
+
+# References to the builtin types each builtin base class of compiled class definitions descends from.
+BUILTIN_ANCESTORS = {
+    text_type(RDFS.Class): (text_type(RDFS.Class),),
+    text_type(RDF.Property): (text_type(RDF.Property), text_type(RDFS.Class)),
+}
 
 
 def get_base_uri(uri):
-    parsed = urlparse(uri)
-    if parsed.fragment:
-        return "{}#".format(urldefrag(uri)[0])
+    # Equivalent to parsing the URI, without its cost, as the base URI of every typed subject is looked up
+    fragment_start = uri.find("#") + 1
+    if 0 < fragment_start < len(uri):
+        return uri[:fragment_start]
 
     return "{}/".format(uri.rsplit('/', 1)[0])
 
 
+def _remove_value(proxy, value):
+    """
+    Remove a value from a property proxy, if present.
+
+    """
+    try:
+        proxy.values.remove(value)
+    except ValueError:
+        pass
+
+
+class PendingPropertyList(MutableSequence):
+    """
+    The list of property classes of a class from a lazily built namespace, which materializes
+    the property classes from their names the first time the list is used.
+
+    """
+    __slots__ = ("_builder", "_property_names", "_items")
+
+    def __init__(self, builder, property_names):
+        self._builder = builder
+        self._property_names = property_names
+        self._items = VersionedList()
+
+    @property
+    def version(self):
+        """
+        :returns {int} the version of the property classes, which changes whenever they are modified
+            (see `VersionedList`)
+
+        """
+        return self._items.version
+
+    def _resolve(self):
+        """
+        :returns {list} the property classes
+
+        """
+        if self._property_names is not None:
+            property_names, self._property_names = self._property_names, None
+            self._items.extend(self._builder._resolve_type(name) for name in property_names)
+            self._builder = None
+
+        return self._items
+
+    def __getitem__(self, index):
+        return self._resolve()[index]
+
+    def __setitem__(self, index, value):
+        self._resolve()[index] = value
+
+    def __delitem__(self, index):
+        del self._resolve()[index]
+
+    def __len__(self):
+        return len(self._resolve())
+
+    def __iter__(self):
+        return iter(self._resolve())
+
+    def __contains__(self, value):
+        return value in self._resolve()
+
+    def insert(self, index, value):
+        self._resolve().insert(index, value)
+
+    def __eq__(self, other):
+        return self._resolve() == list(other) if isinstance(other, (list, PendingPropertyList)) else NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = None
+
+    def __add__(self, other):
+        return self._resolve() + list(other)
+
+    def __radd__(self, other):
+        return list(other) + self._resolve()
+
+    def __repr__(self):
+        return repr(self._resolve())
+
+
 class OntologyBuilder(object):
 
-    def __init__(self, graph, base_uri=None):
+    def __init__(self, graph, base_uri=None, imported_classes=None, stats=None):
         """
         Build the Python class hierarchy representing the ontology given
-        its triplestore graph.
+        its triplestore graph, or its statements.
 
         The supported vocabulary of asserted statements consists of the
         RDF Schema classes and properties as defined in https://www.w3.org/TR/rdf-schema/
 
-        :param graph - the populated `rdflib.Graph` instance for the Ontology
+        :param graph - the populated `rdflib.Graph` instance for the Ontology, or any other iterable over
+            its (subject, predicate, object) statements, e.g a streaming parser. Statements which are not
+            in a graph are consumed right away, only keeping those needed to build the namespace, and the
+            builder then has no graph. Can be None when building the namespace from a compiled ontology,
+            or from statements added with `add_statements()`.
         :param base_uri - The base URI namespace for the Ontology. If not provided,
             will try to infer from ontology definition directly.
+        :param imported_classes - the Python classes of other ontologies that classes and properties of the ontology
+            reference (e.g as base classes, or in their domain or range), keyed by URI. Other references to types
+            outside of the ontology namespace resolve to builtin types.
+        :param stats - if provided, the `BuildStats` the build is instrumented with
         """
-        self.base_uri = base_uri or self._infer_base_uri(graph)
+        self.base_uri = base_uri
         self.graph = graph
+        self.imported_classes = dict(imported_classes or {})
         self.namespace = {}
+        self.stats = stats
         self.logger = getLogger(__name__)
 
+        # Compiled class definitions keyed by class name, in topological order of inheritance
+        self.definitions = OrderedDict()
+        self._lazy = False
+        self._positions = {}
+        self._next_position = 0
+        self._inferred_domains = {}
+        self._properties_by_domain = defaultdict(list)
+        self._property_names = {}
+        # Names of the classes and properties of the ontology, keyed by URI
+        self._names = {}
+        # Namespaces declared by the ontology, keyed by prefix
+        self._namespace_bindings = {}
+        # Reachability index of the class hierarchy, built on first use
+        self._hierarchy = None
+
         self._type_graph = {
             RDFS.Class: RDFS.Class,
             RDF.Property: RDFS.Class,
         }
         self._sub_class_graph = defaultdict(set)
-        self._asserted_statements = set()
+        # Characteristics (e.g owl:TransitiveProperty) of each property, see `PROPERTY_CHARACTERISTIC_URIS`
+        self._characteristics = defaultdict(set)
+        # Sub-classes of each class, i.e the reverse of the sub class graph
+        self._sub_classes = defaultdict(set)
+        # Objects of the asserted statements, keyed by predicate and subject
+        self._asserted_statements = defaultdict(lambda: defaultdict(set))
 
-    def build_namespace(self):
+        # Dispatch table for partitioning statements by predicate. Statements
+        # with any other predicate are not needed to build the namespace and are ignored.
+        self._index_handlers = {
+            RDF.type: self._index_type,
+            RDFS.subClassOf: self._index_sub_class,
+            RDFS.subPropertyOf: self._index_sub_property,
+            RDFS.label: self._index_asserted_statement,
+            RDFS.comment: self._index_asserted_statement,
+            RDFS.domain: self._index_asserted_statement,
+            RDFS.range: self._index_asserted_statement,
+            OWL.inverseOf: self._index_asserted_statement,
+        }
+        # Handlers for asserted statements, applied once the class hierarchy is compiled.
+        self._statement_handlers = (
+            (RDFS.label, self._compile_label),
+            (RDFS.comment, self._compile_comment),
+            (RDFS.domain, self._compile_property_domain),
+            (RDFS.range, self._compile_property_range),
+            (OWL.inverseOf, self._compile_property_inverse),
+        )
+        if stats is not None:
+            # Only instrumented builds pay for counting statements
+            self._index_handlers = dict(
+                (predicate, stats.counting(predicate, handler))
+                for predicate, handler in self._index_handlers.items()
+            )
+
+        if graph is not None and not hasattr(graph, "triples"):
+            self.graph = None
+            with phase(stats, "index"):
+                self.add_statements(graph)
+        elif base_uri is None and graph is not None:
+            with phase(stats, "infer_base_uri"):
+                self.base_uri = self._infer_base_uri(
+                    ((s, o) for s, p, o in graph.triples((None, RDF.type, None))),
+                    namespaces=(namespace for prefix, namespace in graph.namespaces()),
+                )
+
+    def build_namespace(self, compiled=None, lazy=False):
         """
         Iterate over all RDF statements describing ontology in a stable ordering
         that guarantees type definitions and inheritance relationships are evaluated first,
         and build the Python class hierarchy under a common namespace object.
 
+        :param compiled - compiled ontology as returned by `compile()`. If given, the namespace
+            is built from it directly and the graph is not looked at.
+        :param lazy - if True, no class is created upfront. Classes are instead created
+            on demand with `materialize()`, and added to the namespace as they are.
         :returns {dict} namespace containing all the defined Python classes
 
         """
-        for s, p, o in self.graph:
-            if is_type_predicate(p):
-                self._type_graph[s] = o
-            elif is_sub_class_predicate(p):
-                self._sub_class_graph[s].add(o)
-            elif is_sub_property_predicate(p):
-                self._sub_class_graph[s].add(o)
-                # TODO: We're cheating a bit by asserting the type of any sub-property is simply rdfs:Property
-                # self._type_graph[s] = RDF.Property
-            else:
-                self._asserted_statements.add((s, p, o))
+        if compiled is None:
+            compiled = self.compile()
+
+        with phase(self.stats, "index_definitions"):
+            self._index_definitions(compiled)
+        self._lazy = lazy
+        if lazy:
+            return self.namespace
+
+        with phase(self.stats, "create_types"):
+            for class_definition in compiled["classes"]:
+                self._add_type(class_definition)
+        with phase(self.stats, "add_annotations"):
+            for class_definition in compiled["classes"]:
+                self._add_annotations(class_definition)
 
-        self._build_class_hierarchy()
-        self._build_property_proxies()
+        with phase(self.stats, "build_property_proxies"):
+            self._build_property_proxies()
 
         return self.namespace
 
+    def compile(self):
+        """
+        Compile the class hierarchy described by the graph into a compact, JSON-serializable
+        description which `build_namespace()` can turn into Python classes without any RDF parsing.
+
+        Compiled class definitions are listed in topological order of inheritance, and reference
+        other classes by name, or by URI for types outside of the ontology namespace (see `BUILTIN_TYPES`).
+
+        :returns {dict} compiled ontology
+
+        """
+        if self.graph is not None:
+            with phase(self.stats, "index"):
+                self._index_statements()
+        if self.base_uri is None:
+            with phase(self.stats, "infer_base_uri"):
+                self.base_uri = self._infer_base_uri(
+                    ((s, o) for s, o in self._type_graph.items() if s not in (RDFS.Class, RDF.Property)),
+                    namespaces=self._namespace_bindings.values(),
+                )
+
+        return {
+            "version": COMPILED_FORMAT_VERSION,
+            "base_uri": text_type(self.base_uri),
+            "classes": list(self._compile_class_hierarchy().values()),
+        }
+
+    def index_namespace(self, namespace):
+        """
+        Index the class definitions of a namespace built beforehand from the same statements, e.g by a builder
+        which was not kept, without creating any class, so that changes can then be applied to the namespace
+        (see `apply()`).
+
+        :param namespace - the Python classes of the namespace, keyed by name, as returned by `build_namespace()`
+
+        """
+        compiled = self.compile()
+        with phase(self.stats, "index_definitions"):
+            self._index_definitions(compiled)
+        self.namespace = dict(namespace)
+        for class_name in self.definitions:
+            self._property_names[class_name] = self._compile_property_names(class_name)
+
+    def import_classes(self, imported_classes):
+        """
+        Add to the classes of other ontologies that the ontology references, once its namespace is built, e.g
+        when ontologies reference each other, and update the namespace in place.
+
+        Only the classes referencing the added classes (as base classes, or in their domain or range) are compiled
+        again, along with their sub-classes, as when applying changes (see `apply()`).
+
+        :param imported_classes - the Python classes of other ontologies, keyed by URI
+
+        """
+        self.imported_classes.update(imported_classes)
+        imported_uris = set(URIRef(uri) for uri in imported_classes)
+
+        class_uris = set(
+            class_uri
+            for class_uri, base_class_uris in self._sub_class_graph.items()
+            if not base_class_uris.isdisjoint(imported_uris)
+        )
+        class_uris.update(
+            s
+            for s, objects in self._asserted_statements[RDFS.domain].items()
+            if not objects.isdisjoint(imported_uris)
+        )
+        affected_uris = set(
+            class_uri
+            for class_uri in self._sub_class_closure(class_uris)
+            if self._is_defined(class_uri)
+        )
+        affected_uris.update(
+            s
+            for predicate in (RDFS.range, OWL.inverseOf)
+            for s, objects in self._asserted_statements[predicate].items()
+            if not objects.isdisjoint(imported_uris) and self._is_defined(s)
+        )
+
+        previous_definitions = self._compile_affected_definitions(affected_uris)
+        self._check_types(previous_definitions)
+        self._update_types(previous_definitions, {})
+        self._update_properties(previous_definitions, [])
+        self._hierarchy = None
+
+    def materialize(self, class_name):
+        """
+        Create the Python class of a lazily built namespace (see `build_namespace()`),
+        along with all of its ancestors and the property classes in its domain.
+
+        :param class_name - the name of the class
+        :returns the Python class
+
+        """
+        if class_name in self.namespace:
+            return self.namespace[class_name]
+
+        with phase(self.stats, "materialize"):
+            pending = self._pending_ancestors(class_name)
+            for name in pending:
+                self._add_type(self.definitions[name])
+                self._property_names[name] = self._compile_property_names(name)
+                # Property classes are only resolved when first needed, as their domain and range
+                # would otherwise in turn require materializing most of the ontology.
+                self.namespace[name].__properties__ = PendingPropertyList(self, self._property_names[name])
+
+            for name in pending:
+                self._add_annotations(self.definitions[name])
+
+        return self.namespace[class_name]
+
+    def apply(self, added=(), removed=()):
+        """
+        Apply changes to the statements of the ontology graph, and update the namespace in place.
+
+        Only the classes affected by the changes are compiled again, i.e the subjects of the changed statements,
+        the properties whose domain or range are classes added to or removed from the ontology, and the sub-classes
+        of classes whose bases or domain changed. Existing classes are updated in place (including their bases),
+        so that references to them, and their instances, remain valid.
+
+        Changes which cannot be applied in place, i.e which turn classes into properties (or the reverse), or leave
+        classes with no consistent method resolution order, are rejected with a `ValueError`, leaving the graph
+        and the namespace unchanged.
+
+        :param added - iterable over the (subject, predicate, object) statements to add to the graph
+        :param removed - iterable over the (subject, predicate, object) statements to remove from the graph
+        :returns {tuple} the names of the classes added, updated and removed
+
+        """
+        if self.graph is None:
+            raise RuntimeError("Ontology was built without its graph, e.g from a compiled ontology cache")
+
+        added = set(tuple(statement) for statement in added)
+        removed = set(tuple(statement) for statement in removed)
+        changed = set(statement[:2] for statement in added | removed)
+        # Only the statements actually added to or removed from the graph are reverted if changes are rejected
+        added_statements = [statement for statement in added if statement not in self.graph]
+        removed_statements = [statement for statement in removed - added if statement in self.graph]
+        for statement in removed_statements:
+            self.graph.remove(statement)
+        for statement in added_statements:
+            self.graph.add(statement)
+
+        try:
+            removed_names, removed_classes, previous_definitions = self._compile_changes(changed)
+        except Exception:
+            for statement in added_statements:
+                self.graph.remove(statement)
+            for statement in removed_statements:
+                self.graph.add(statement)
+            self._reindex_statements(changed)
+            raise
+
+        added_names = [name for name, definition in previous_definitions.items() if definition is None]
+        updated_names = [name for name, definition in previous_definitions.items() if definition is not None]
+
+        self._update_types(previous_definitions, removed_classes)
+        self._update_properties(previous_definitions, removed_names)
+        self._hierarchy = None
+
+        return added_names, updated_names, removed_names
+
+    def _compile_changes(self, changed):
+        """
+        Index again the statements of the graph with the given subjects and predicates, once changed, and compile
+        again the definitions of the classes affected. Changes are checked before any class is updated (see
+        `_check_types()`), and the compiled definitions are reverted if they cannot be applied.
+
+        :param changed - the (subject, predicate) pairs of the changed statements
+        :returns {tuple} the names of the classes removed, their Python classes keyed by name, and the previous
+            definitions of the classes compiled again (see `_compile_affected_definitions()`)
+
+        """
+        class_uris, structural_uris = self._reindex_statements(changed)
+
+        # Classes added to or removed from the ontology change the resolved domain and range of the properties
+        # referencing them, and the resolved bases of their sub-classes
+        removed_names = []
+        existence_changes = set()
+        for class_uri in class_uris:
+            class_name = self._extract_name(class_uri)
+            if self._is_defined(class_uri) != (class_name in self.definitions):
+                existence_changes.add(class_uri)
+                if class_name in self.definitions:
+                    removed_names.append(class_name)
+        if existence_changes:
+            for predicate in (RDFS.domain, RDFS.range):
+                for s, objects in self._asserted_statements[predicate].items():
+                    if not objects.isdisjoint(existence_changes):
+                        class_uris.add(s)
+                        structural_uris.add(s)
+        structural_uris.update(existence_changes)
+
+        affected_uris = set(class_uri for class_uri in class_uris if self._is_defined(class_uri))
+        affected_uris.update(
+            class_uri
+            for class_uri in self._sub_class_closure(structural_uris)
+            if self._is_defined(class_uri)
+        )
+
+        # State of the definitions compiled again or removed, restored if changes are rejected
+        removed_definitions = [
+            (class_name, self.definitions[class_name], self._property_names.get(class_name))
+            for class_name in removed_names
+        ]
+        previous_positions = dict(
+            (class_name, self._positions[class_name])
+            for class_name in set(self._extract_name(class_uri) for class_uri in affected_uris).union(removed_names)
+            if class_name in self._positions
+        )
+        next_position = self._next_position
+
+        removed_classes = {}
+        for class_name in removed_names:
+            del self.definitions[class_name]
+            del self._positions[class_name]
+            self._property_names.pop(class_name, None)
+            if class_name in self.namespace:
+                removed_classes[class_name] = self.namespace.pop(class_name)
+
+        previous_definitions = OrderedDict()
+        try:
+            previous_definitions = self._compile_affected_definitions(affected_uris)
+            self._check_types(previous_definitions)
+        except Exception:
+            self._revert_definitions(previous_definitions, removed_definitions, removed_classes, previous_positions)
+            self._next_position = next_position
+            raise
+
+        return removed_names, removed_classes, previous_definitions
+
+    def _revert_definitions(self, previous_definitions, removed_definitions, removed_classes, previous_positions):
+        """
+        Revert the definitions compiled again and removed by `_compile_changes()`, along with their positions.
+
+        """
+        for class_name, previous_definition in previous_definitions.items():
+            if previous_definition is None:
+                self.definitions.pop(class_name, None)
+                self._positions.pop(class_name, None)
+            else:
+                self.definitions[class_name] = previous_definition
+        for class_name, class_definition, property_names in removed_definitions:
+            self.definitions[class_name] = class_definition
+            if property_names is not None:
+                self._property_names[class_name] = property_names
+        self.namespace.update(removed_classes)
+        self._positions.update(previous_positions)
+
+        # Definitions are kept in topological order, i.e by position
+        definitions = sorted(self.definitions.items(), key=lambda item: self._positions[item[0]])
+        self.definitions.clear()
+        self.definitions.update(definitions)
+
+    def property_names(self, class_name):
+        """
+        Return the names of the properties of a class, i.e the properties of its base classes along with the ones
+        having the class in their (inferred) domain, once its definition is indexed (see `build_namespace()`),
+        without creating any class. Properties of imported classes are referenced by URI.
+
+        Names are computed once, along with the names of the properties of the ancestors of the class.
+
+        :param class_name - the name of the class
+        :returns {list} the names of the properties
+
+        """
+        if class_name not in self._property_names:
+            pending = set()
+            stack = [class_name]
+            while stack:
+                name = stack.pop()
+                if name in pending or name in self._property_names:
+                    continue
+                pending.add(name)
+                stack.extend(
+                    reference for reference in self.definitions[name]["bases"] if reference in self.definitions
+                )
+            for name in sorted(pending, key=self._positions.get):
+                self._property_names[name] = self._compile_property_names(name)
+
+        return self._property_names[class_name]
+
+    def hierarchy(self):
+        """
+        Return the reachability index of the class hierarchy (see `HierarchyIndex`), built from the compiled
+        class definitions on first use, and built again after changes are applied.
+
+        :returns {HierarchyIndex} the index, keyed by class name
+
+        """
+        if self._hierarchy is None:
+            self._hierarchy = HierarchyIndex(OrderedDict(
+                (class_name, class_definition["bases"])
+                for class_name, class_definition in self.definitions.items()
+            ))
+
+        return self._hierarchy
+
+    def add_statements(self, statements):
+        """
+        Add statements describing the ontology, e.g parsed from a file without building a graph
+        (see `ontology_alchemy.ingestion`), to those of the graph.
+
+        Statements are dispatched on their predicate into the tables the namespace is built from.
+
+        Only the statements needed to build the namespace are kept. Statements must all be added
+        before the namespace is built.
+
+        :param statements - iterable over (subject, predicate, object) statements
+
+        """
+        index_handlers = self._index_handlers
+        for s, p, o in statements:
+            handler = index_handlers.get(p)
+            if handler is not None:
+                handler(s, p, o)
+
+    def bind(self, prefix, namespace):
+        """
+        Declare a namespace of the ontology (e.g an `@prefix` binding of the file it is parsed from),
+        which is taken into account when inferring the base URI of the ontology.
+
+        :param prefix - the prefix of the namespace
+        :param namespace - the URI of the namespace
+
+        """
+        self._namespace_bindings[prefix] = namespace
+
     def add_property_domain(self, property_uri, domain_uri):
         self.logger.debug(
             "add_property_domain() - adding domain uri %s for property %s",
@@ -93,7 +610,7 @@ class OntologyBuilder(object):
             property_uri,
         )
         property_name = self._extract_name(property_uri)
-        domain_class = self._resolve_domain(domain_uri)
+        domain_class = self._resolve_type(self._resolve_domain(domain_uri, self.namespace))
         self.namespace[property_name].domain += domain_class
 
     def add_property_range(self, property_uri, range_uri):
@@ -103,7 +620,7 @@ class OntologyBuilder(object):
             property_uri,
         )
         property_name = self._extract_name(property_uri)
-        range_class = self._resolve_range(range_uri)
+        range_class = self._resolve_type(self._resolve_range(range_uri, self.namespace))
         self.namespace[property_name].range += range_class
 
     def add_comment(self, class_uri, comment, lang=DEFAULT_LANGUAGE_TAG):
@@ -115,84 +632,495 @@ class OntologyBuilder(object):
         self.namespace[class_name].label += Literal(label, lang=lang)
 
     def _extract_name(self, uri):
-        return str(
-            uri.replace(self.base_uri, "")
+        name = self._names.get(uri)
+        if name is None:
+            name = self._names[uri] = str(
+                uri.replace(self.base_uri, "")
+            )
+
+        return name
+
+    def _index_statements(self):
+        """
+        Partition the statements of the graph into predicate-keyed tables in a single pass.
+
+        The store's predicate index is used to visit only the statements of interest
+        (statements which are not in a graph are dispatched on their predicate instead, see `add_statements()`).
+
+        """
+        for predicate, handler in self._index_handlers.items():
+            for s, p, o in self.graph.triples((None, predicate, None)):
+                handler(s, p, o)
+
+    def _index_type(self, s, p, o):
+        self._type_graph[s] = o
+        if o in PROPERTY_CHARACTERISTIC_URIS:
+            self._characteristics[s].add(o)
+
+    def _index_sub_class(self, s, p, o):
+        self._sub_class_graph[s].add(o)
+        self._sub_classes[o].add(s)
+
+    def _index_sub_property(self, s, p, o):
+        self._sub_class_graph[s].add(o)
+        self._sub_classes[o].add(s)
+        # TODO: We're cheating a bit by asserting the type of any sub-property is simply rdfs:Property
+        # self._type_graph[s] = RDF.Property
+
+    def _index_asserted_statement(self, s, p, o):
+        self._asserted_statements[p][s].add(o)
+
+    def _reindex_statements(self, changed):
+        """
+        Index again the statements of the graph with the given subjects and predicates.
+
+        :param changed - the (subject, predicate) pairs of the changed statements
+        :returns {tuple} the URIs of the classes whose definitions may have changed,
+            and the URIs of the classes whose type, bases or domain may have changed
+
+        """
+        class_uris = set()
+        structural_uris = set()
+        for s, p in changed:
+            if p not in self._index_handlers or s in (RDFS.Class, RDF.Property):
+                continue
+
+            class_uris.add(s)
+            if p == RDF.type:
+                structural_uris.add(s)
+                types = list(self.graph.objects(s, RDF.type))
+                if types:
+                    self._type_graph[s] = types[-1]
+                else:
+                    self._type_graph.pop(s, None)
+                characteristics = PROPERTY_CHARACTERISTIC_URIS.intersection(types)
+                if characteristics:
+                    self._characteristics[s] = set(characteristics)
+                else:
+                    self._characteristics.pop(s, None)
+            elif p in (RDFS.subClassOf, RDFS.subPropertyOf):
+                structural_uris.add(s)
+                base_class_uris = set(self.graph.objects(s, RDFS.subClassOf))
+                base_class_uris.update(self.graph.objects(s, RDFS.subPropertyOf))
+                previous_base_class_uris = self._sub_class_graph.get(s, set()).difference({s})
+                for o in previous_base_class_uris.difference(base_class_uris):
+                    self._sub_classes[o].discard(s)
+                for o in base_class_uris.difference(previous_base_class_uris):
+                    self._sub_classes[o].add(s)
+                # Classes which are no longer (or are now) only referenced as base classes
+                class_uris.update(previous_base_class_uris.symmetric_difference(base_class_uris))
+                self._sub_class_graph[s] = base_class_uris
+            else:
+                if p == RDFS.domain:
+                    structural_uris.add(s)
+                objects = set(self.graph.objects(s, p))
+                if objects:
+                    self._asserted_statements[p][s] = objects
+                else:
+                    self._asserted_statements[p].pop(s, None)
+
+        for class_uri in class_uris:
+            # Make sure types with no base class are represented in the sub class graph by a self link,
+            # as when compiling the class hierarchy (see `_compile_class_hierarchy()`)
+            base_class_uris = self._sub_class_graph.get(class_uri)
+            if base_class_uris and base_class_uris != {class_uri}:
+                continue
+            if class_uri in self._type_graph:
+                self._sub_class_graph[class_uri] = {class_uri}
+            else:
+                self._sub_class_graph.pop(class_uri, None)
+
+        return class_uris, structural_uris
+
+    def _is_defined(self, class_uri):
+        """
+        Check whether a class is part of the compiled class hierarchy, i.e is part of the ontology namespace
+        and either has a type or takes part in a sub class relation.
+
+        """
+        return in_namespace(class_uri, base_uri=self.base_uri) and bool(
+            self._sub_class_graph.get(class_uri) or self._sub_classes.get(class_uri)
+        )
+
+    def _sub_class_closure(self, class_uris):
+        """
+        Return the URIs of the given classes along with all their (direct and indirect) sub-classes.
+
+        """
+        closure = set(class_uris)
+        stack = list(closure)
+        while stack:
+            for sub_class_uri in self._sub_classes.get(stack.pop(), ()):
+                if sub_class_uri not in closure:
+                    closure.add(sub_class_uri)
+                    stack.append(sub_class_uri)
+
+        return closure
+
+    def _compile_affected_definitions(self, affected_uris):
+        """
+        Compile again the definitions of the given classes. Classes which are new, or whose base classes moved
+        after them, are moved to the end of the topological order, along with their sub-classes (which must
+        be part of the given classes).
+
+        :returns {OrderedDict} the previous definitions of the classes (None for new classes), keyed by name,
+            in topological order
+
+        """
+        dependencies = dict(
+            (class_uri, self._sub_class_graph.get(class_uri, set()).intersection(affected_uris).difference({class_uri}))
+            for class_uri in affected_uris
         )
+        previous_definitions = OrderedDict()
+        for class_uris in toposort(dependencies):
+            for class_uri in sorted(class_uris):
+                class_definition = self._compile_definition(class_uri, self._positions)
+                class_name = class_definition["name"]
+                previous_definitions[class_name] = self.definitions.get(class_name)
+                position = self._positions.get(class_name)
+                if position is None or any(
+                    self._positions.get(reference, -1) >= position
+                    for reference in class_definition["bases"]
+                ):
+                    # Moved after its base classes, as are all its sub-classes, which are then affected as well
+                    self.definitions.pop(class_name, None)
+                    self._positions[class_name] = self._next_position
+                    self._next_position += 1
+                self.definitions[class_name] = class_definition
+
+        # Asserted statements are compiled once all classes are defined, as their domain or range may reference
+        # any of them
+        self._compile_statements(self.definitions, dict(
+            (predicate, dict(
+                (s, self._asserted_statements[predicate][s])
+                for s in affected_uris
+                if s in self._asserted_statements[predicate]
+            ))
+            for predicate, _ in self._statement_handlers
+        ))
+
+        return previous_definitions
+
+    def _check_types(self, previous_definitions):
+        """
+        Check that the Python classes of the given (compiled again) class definitions can be updated in place,
+        i.e that their metaclass does not change (e.g classes turned into properties), and that their bases,
+        along with the bases of all the other classes compiled again, have a consistent method resolution order.
+
+        :param previous_definitions - the previous definitions of the classes compiled again, keyed by name
+        :raises ValueError if the classes cannot be updated in place
+
+        """
+        linearizations = {}
+        for class_name in previous_definitions:
+            klass = self.namespace.get(class_name)
+            if klass is None:
+                continue
+
+            try:
+                linearization = self._linearize(class_name, previous_definitions, linearizations)
+            except TypeError as error:
+                raise ValueError("Cannot change the bases of class {} in place: {}".format(class_name, error))
+            metaclass = RDF_PropertyMeta if RDF_Property in linearization else RDFS_ClassMeta
+            if type(klass) is not metaclass:
+                raise ValueError(
+                    "Cannot change class {} into {} in place".format(
+                        class_name,
+                        "a property" if metaclass is RDF_PropertyMeta else "a class which is not a property",
+                    )
+                )
+
+    def _linearize(self, reference, previous_definitions, linearizations):
+        """
+        Compute the method resolution order (C3 linearization) a type reference would have once the classes of the
+        given definitions are updated, without updating any class. Classes of the ontology which are compiled again,
+        or yet to be created, are represented by name in the linearization, other classes by their Python class.
+
+        :raises TypeError if there is no consistent method resolution order
 
-    def _infer_base_uri(self, graph):
+        """
+        if reference in linearizations:
+            return linearizations[reference]
+
+        klass = self.namespace.get(reference)
+        if reference in previous_definitions or (klass is None and reference in self.definitions):
+            bases = self.definitions[reference]["bases"]
+            sequences = [list(self._linearize(base, previous_definitions, linearizations)) for base in bases]
+            sequences.append([linearization[0] for linearization in sequences])
+            linearization = [reference]
+            sequences = [sequence for sequence in sequences if sequence]
+            while sequences:
+                for sequence in sequences:
+                    head = sequence[0]
+                    if not any(head in other[1:] for other in sequences):
+                        break
+                else:
+                    raise TypeError("no consistent method resolution order for bases {}".format(", ".join(bases)))
+                linearization.append(head)
+                for sequence in sequences:
+                    if sequence[0] == head:
+                        del sequence[0]
+                sequences = [sequence for sequence in sequences if sequence]
+        else:
+            if klass is None:
+                klass = self._resolve_type(reference)
+            linearization = []
+            for ancestor in klass.__mro__:
+                name = getattr(ancestor, "__name__", None)
+                if name in previous_definitions and self.namespace.get(name) is ancestor:
+                    linearization.append(name)
+                else:
+                    linearization.append(ancestor)
+
+        linearizations[reference] = linearization
+        return linearization
+
+    def _update_types(self, previous_definitions, removed_classes):
+        """
+        Create or update the Python classes of the given (compiled again) class definitions, for classes
+        which are part of the namespace, i.e all classes unless the namespace is built lazily.
+
+        :param removed_classes - the Python classes removed from the namespace, keyed by name, which previous
+            definitions may still reference
+
+        """
+        for class_name, previous_definition in previous_definitions.items():
+            class_definition = self.definitions[class_name]
+            klass = self.namespace.get(class_name)
+            if klass is None:
+                if not self._lazy:
+                    self._add_type(class_definition)
+            elif previous_definition["bases"] != class_definition["bases"]:
+                base_classes = tuple(self._resolve_type(reference) for reference in class_definition["bases"])
+                try:
+                    klass.__bases__ = base_classes
+                except TypeError as error:
+                    raise ValueError("Cannot change the bases of class {} in place: {}".format(class_name, error))
+                # The inferred domain and range of property classes (and of their sub-properties) depend on their bases
+                if issubclass(klass, RDF_Property):
+                    for proxy in (klass.domain, klass.range):
+                        if isinstance(proxy, SchemaPropertyProxy):
+                            proxy.invalidate()
+
+        for class_name, previous_definition in previous_definitions.items():
+            class_definition = self.definitions[class_name]
+            klass = self.namespace.get(class_name)
+            if klass is None:
+                continue
+            if previous_definition is not None:
+                if all(
+                    previous_definition.get(key) == class_definition.get(key)
+                    for key in ("label", "comment", "domain", "range", "inverse_of", "characteristics")
+                ):
+                    continue
+                self._clear_annotations(klass, previous_definition, removed_classes)
+            self._add_annotations(class_definition)
+
+    def _clear_annotations(self, klass, class_definition, removed_classes):
+        """
+        Remove the annotations (e.g labels, or the domain and range of property classes) added to a class from
+        its compiled definition, keeping the values added to it otherwise (e.g at runtime).
+
+        """
+        for key in ("label", "comment"):
+            proxy = getattr(klass, key)
+            for value, lang, datatype in class_definition.get(key, ()):
+                _remove_value(proxy, Literal(value, lang=lang, datatype=datatype))
+        for key, name in (("domain", "domain"), ("range", "range"), ("inverse_of", "inverseOf")):
+            references = class_definition.get(key, ())
+            if not references:
+                continue
+            proxy = getattr(klass, name)
+            for reference in references:
+                if reference in removed_classes:
+                    _remove_value(proxy, removed_classes[reference])
+                elif reference in self.namespace or reference in self.imported_classes or reference in BUILTIN_TYPES:
+                    _remove_value(proxy, self._resolve_type(reference))
+        if "characteristics" in class_definition:
+            klass.__characteristics__ = frozenset()
+
+    def _update_properties(self, previous_definitions, removed_names):
+        """
+        Update the inferred domains of the given (compiled again) and removed class definitions,
+        and the properties of all the classes affected.
+
+        """
+        class_names = set(previous_definitions)
+        domain_references = set()
+        for class_name in removed_names:
+            inferred_domain = self._inferred_domains.pop(class_name, ())
+            for reference in inferred_domain:
+                self._properties_by_domain[reference].remove(class_name)
+            domain_references.update(inferred_domain)
+
+        for class_name in previous_definitions:
+            previous_inferred_domain = self._inferred_domains.get(class_name, [])
+            inferred_domain = self._index_inferred_domain(self.definitions[class_name])
+            if inferred_domain == previous_inferred_domain:
+                continue
+            for reference in previous_inferred_domain:
+                if reference not in inferred_domain:
+                    self._properties_by_domain[reference].remove(class_name)
+            for reference in inferred_domain:
+                if reference not in previous_inferred_domain:
+                    self._properties_by_domain[reference].append(class_name)
+            domain_references.update(set(previous_inferred_domain).symmetric_difference(inferred_domain))
+
+        if domain_references.intersection(BUILTIN_ANCESTORS):
+            # Properties of all classes changed
+            class_names.update(self.definitions)
+        else:
+            class_names.update(
+                self._extract_name(class_uri)
+                for class_uri in self._sub_class_closure(
+                    URIRef(self.definitions[reference]["uri"] if reference in self.definitions else reference)
+                    for reference in domain_references
+                    if reference in self.definitions or reference in self.imported_classes
+                )
+            )
+
+        for class_name in sorted(class_names.intersection(self.namespace), key=self._positions.get):
+            property_names = self._compile_property_names(class_name)
+            self._property_names[class_name] = property_names
+            if self._lazy:
+                self.namespace[class_name].__properties__ = PendingPropertyList(self, property_names)
+            else:
+                self.namespace[class_name].__properties__ = [self._resolve_type(name) for name in property_names]
+
+    def _infer_base_uri(self, types, namespaces=()):
         """
         Attempt to infer automatically the base URI for the given ontology
         by looking at definitions.
 
-        The simple heuristic employed is to URL-parse the most common subject
-        base URI appearing in the first few hundred triples with RDF.type as its predicate in the RDF graph and
-        extract its last path component.
+        The typed subjects of the ontology (its classes, properties, ...) are counted, in a single pass,
+        under their base URI (see `get_base_uri()`), or the longest declared namespace it is part of (e.g
+        an `@prefix` binding). If the ontology declares its own URI (as an owl:Ontology), the most common
+        base URI matching it is inferred, and the most common base URI overall otherwise. Ties are broken in
+        alphabetical order, so that the same ontology always has the same base URI.
+
+        At most `MAX_BASE_URI_CANDIDATES` base URIs are counted at once (using the Misra-Gries algorithm),
+        so that memory is bounded however many distinct base URIs subjects have.
 
-        :param graph - `rdflib.Graph` instance populated with ontology
+        :param types - iterable over the (subject, type) pairs of the triples with RDF.type as their predicate
+        :param namespaces - the namespaces declared by the ontology
         :returns {str} the inferred base URI
 
         """
-        triples_subset = list(islice(
-            (get_base_uri(s)
-             for (s, p, o)
-             in graph.triples((None, RDF.type, None))),
-            200
-        ))
-        random_sample = sample(
-            triples_subset,
-            k=min(30, len(triples_subset)),
-        )
-        return Counter(random_sample).most_common(1)[0][0]
+        counts = {}
+        ontology_uris = set()
+        for s, o in types:
+            if o == OWL.Ontology:
+                ontology_uris.add(text_type(s).rstrip("#/"))
+                continue
+            if not isinstance(s, URIRef):
+                continue
 
-    def _resolve_domain(self, domain_uri):
+            base_uri = get_base_uri(s)
+            if base_uri in counts:
+                counts[base_uri] += 1
+            elif len(counts) < MAX_BASE_URI_CANDIDATES:
+                counts[base_uri] = 1
+            else:
+                for candidate in list(counts):
+                    counts[candidate] -= 1
+                    if not counts[candidate]:
+                        del counts[candidate]
+
+        # Base URIs are counted under the longest declared namespace they are part of,
+        # unless they are distinct (hash) namespaces
+        namespaces = sorted(set(text_type(namespace) for namespace in namespaces if namespace), key=len, reverse=True)
+        namespace_counts = defaultdict(int)
+        for base_uri, count in counts.items():
+            namespace_counts[next(
+                (
+                    namespace
+                    for namespace in namespaces
+                    if base_uri.startswith(namespace) and "#" not in base_uri[len(namespace):]
+                ),
+                base_uri,
+            )] += count
+
+        candidates = [
+            base_uri
+            for base_uri in namespace_counts
+            if base_uri.rstrip("#/") in ontology_uris
+        ] or list(namespace_counts)
+        if not candidates:
+            raise ValueError("Cannot infer the base URI of an ontology without typed resources")
+
+        return min(candidates, key=lambda base_uri: (-namespace_counts[base_uri], base_uri))
+
+    def _resolve_domain(self, domain_uri, definitions):
         """
-        Resolve a rdfs.Property rdfs.domain value to a type.
+        Resolve a rdfs.Property rdfs.domain value to a type reference.
 
         """
         domain_name = self._extract_name(domain_uri)
-        if domain_name in self.namespace:
-            return self.namespace[domain_name]
+        if domain_name in definitions:
+            return domain_name
+        elif text_type(domain_uri) in self.imported_classes:
+            return text_type(domain_uri)
         elif is_a_property(domain_uri):
-            return RDF_Property
+            return text_type(RDF.Property)
 
-        return RDFS_Class
+        return text_type(RDFS.Class)
 
-    def _resolve_range(self, range_uri):
+    def _resolve_range(self, range_uri, definitions):
         """
-        Resolve a rdfs.Property rdfs.range value to a type.
+        Resolve a rdfs.Property rdfs.range value to a type reference.
 
         """
         range_name = self._extract_name(range_uri)
-        if range_name in self.namespace:
-            return self.namespace[range_name]
-        if is_a_literal(range_uri):
-            return Literal
+        if range_name in definitions:
+            return range_name
+        elif text_type(range_uri) in self.imported_classes:
+            return text_type(range_uri)
+        elif is_a_literal(range_uri):
+            return text_type(RDFS.Literal)
         elif is_a_property(range_uri):
-            return RDF_Property
+            return text_type(RDF.Property)
         elif is_a_list(range_uri):
-            return RDF.List
+            return text_type(RDF.List)
 
-        return RDFS_Class
+        return text_type(RDFS.Class)
 
-    def _resolve_base_class(self, base_class_uri):
+    def _resolve_base_class(self, base_class_uri, definitions):
         base_class_name = self._extract_name(base_class_uri)
-        if base_class_name in self.namespace:
-            return self.namespace[base_class_name]
+        if base_class_name in definitions:
+            return base_class_name
+        elif text_type(base_class_uri) in self.imported_classes:
+            return text_type(base_class_uri)
         elif looks_like_a_property_uri(base_class_uri):
-            return RDF_Property
+            return text_type(RDF.Property)
+
+        return text_type(RDFS.Class)
+
+    def _resolve_type(self, type_reference):
+        """
+        Resolve a type reference of a compiled class definition to the corresponding Python type.
+
+        """
+        if type_reference in self.namespace:
+            return self.namespace[type_reference]
+        elif type_reference in self.definitions:
+            return self.materialize(type_reference)
+        elif type_reference in self.imported_classes:
+            return self.imported_classes[type_reference]
 
-        return RDFS_Class
+        return BUILTIN_TYPES[type_reference]
 
-    def _build_class_hierarchy(self):
+    def _compile_class_hierarchy(self):
         """
         Given the graphs of rdf:type and rdfs:subClassOf relations,
-        build the class hierarchy.
-        We use topological sort to build the hierarchy in order of
+        compile the class hierarchy.
+        We use topological sort to compile the hierarchy in order of
         dependencies and to identify any circular dependencies.
 
         For reference on the logic rules governing type and subClassOf relations
         see the diagrams here: http://liris.cnrs.fr/~pchampin/2001/rdf-tutorial/node14.html
 
+        :returns {OrderedDict} compiled class definitions keyed by class name
+
         """
         for uri in self._type_graph:
             if all((
@@ -202,76 +1130,294 @@ class OntologyBuilder(object):
                 # Make sure all types are represented in the sub class graph by adding self links.
                 self._sub_class_graph[uri].add(uri)
 
-        for classes in toposort(self._sub_class_graph):
-            for class_uri in classes:
-                if not in_namespace(class_uri, base_uri=self.base_uri):
-                    # Do not add types which are not explicitly part of our current ontology URI namespace.
-                    self.logger.debug(
-                        "_build_class_hierarchy() - class_uri: %s not based in base_uri: %s, skipping",
-                        class_uri,
-                        self.base_uri,
-                    )
-                    continue
+        if self.stats is None:
+            levels = toposort(self._sub_class_graph)
+        else:
+            # Sorted upfront, rather than as definitions are compiled, so that sorting is timed on its own
+            with phase(self.stats, "toposort"):
+                levels = list(toposort(self._sub_class_graph))
 
-                is_property = is_a_property_subtype(class_uri, type_graph=self._type_graph)
+        definitions = OrderedDict()
+        # Position of each compiled class definition in topological order
+        positions = {}
+        with phase(self.stats, "compile_definitions"):
+            for classes in levels:
+                for class_uri in sorted(classes):
+                    if not in_namespace(class_uri, base_uri=self.base_uri):
+                        # Do not add types which are not explicitly part of our current ontology URI namespace.
+                        self.logger.debug(
+                            "_compile_class_hierarchy() - class_uri: %s not based in base_uri: %s, skipping",
+                            class_uri,
+                            self.base_uri,
+                        )
+                        if self.stats is not None:
+                            self.stats.skipped_uris.append(class_uri)
+                        continue
 
-                self._add_type(
-                    class_uri,
-                    base_class_uris=self._sub_class_graph[class_uri],
-                    is_property=is_property
-                )
+                    class_definition = self._compile_definition(class_uri, positions)
+                    definitions[class_definition["name"]] = class_definition
+                    positions[class_definition["name"]] = len(positions)
+
+        with phase(self.stats, "compile_statements"):
+            self._compile_statements(definitions, self._asserted_statements)
+
+        return definitions
+
+    def _compile_definition(self, class_uri, positions):
+        """
+        Compile the definition of a class, without its asserted statements (see `_compile_statements()`).
+
+        :param class_uri - the URI of the class
+        :param positions - the topological positions of the definitions of the classes compiled so far
+        :returns {dict} the class definition
 
-        for s, p, o in self._asserted_statements:
-            if is_label_predicate(p):
-                self.add_label(s, o)
-            elif is_comment_predicate(p):
-                self.add_comment(s, o)
-            elif is_domain_predicate(p):
-                self.add_property_domain(s, o)
-            elif is_range_predicate(p):
-                self.add_property_range(s, o)
-
-    def _add_type(self, class_uri, base_class_uris=None, is_property=False):
+        """
         class_name = self._extract_name(class_uri)
+        class_definition = {
+            "name": class_name,
+            "uri": text_type(class_uri),
+            "bases": self._compile_base_classes(
+                class_uri,
+                base_class_uris=self._sub_class_graph.get(class_uri, set()),
+                is_property=is_a_property_subtype(class_uri, type_graph=self._type_graph),
+                positions=positions,
+            ),
+        }
+        characteristics = self._characteristics.get(class_uri)
+        if characteristics:
+            class_definition["characteristics"] = sorted(text_type(uri) for uri in characteristics)
 
-        self.logger.debug("_add_type() - Adding type: %s", class_name)
+        return class_definition
+
+    def _compile_statements(self, definitions, asserted_statements):
+        """
+        Add the asserted statements (e.g labels, domains and ranges) about classes to their definitions.
 
-        base_classes = (RDF_Property,) if is_property else (RDFS_Class,)
+        :param definitions - all class definitions, keyed by class name
+        :param asserted_statements - the objects of the statements to add, keyed by predicate and subject
+
+        """
+        for predicate, handler in self._statement_handlers:
+            for s, objects in asserted_statements[predicate].items():
+                for o in objects:
+                    handler(definitions, s, o)
+
+    def _compile_base_classes(self, class_uri, base_class_uris, is_property, positions):
+        class_name = self._extract_name(class_uri)
         distinct_base_class_uris = base_class_uris.difference({class_uri})
 
-        if distinct_base_class_uris:
-            adds = []
-            for base_class_uri in distinct_base_class_uris:
-                base_class_name = self._extract_name(base_class_uri)
-                if class_name != base_class_name:
-                    adds.append(self._resolve_base_class(base_class_uri))
-            base_classes = tuple(set(adds))
+        if not distinct_base_class_uris:
+            return [text_type(RDF.Property) if is_property else text_type(RDFS.Class)]
+
+        references = set()
+        for base_class_uri in distinct_base_class_uris:
+            base_class_name = self._extract_name(base_class_uri)
+            if class_name != base_class_name:
+                references.add(self._resolve_base_class(base_class_uri, positions))
+
+        # Order base classes most derived first so that a consistent method resolution order exists
+        return sorted(
+            references,
+            key=lambda reference: (self._base_class_rank(reference, positions), reference),
+            reverse=True,
+        )
+
+    def _base_class_rank(self, reference, positions):
+        """
+        Rank a base class reference, classes of the ontology (by topological position) ranking above
+        imported classes (by depth), which rank above builtin types.
+
+        """
+        if reference in positions:
+            return (2, positions[reference])
+        elif reference in self.imported_classes:
+            return (1, len(self.imported_classes[reference].__mro__))
+
+        return (0, BUILTIN_POSITIONS[reference])
+
+    def _compile_literal(self, value, lang=DEFAULT_LANGUAGE_TAG):
+        literal = Literal(value, lang=lang)
+        return [
+            text_type(literal),
+            literal.language,
+            text_type(literal.datatype) if literal.datatype else None,
+        ]
+
+    def _compile_label(self, definitions, class_uri, label):
+        class_name = self._extract_name(class_uri)
+        definitions[class_name].setdefault("label", []).append(self._compile_literal(label))
+
+    def _compile_comment(self, definitions, class_uri, comment):
+        class_name = self._extract_name(class_uri)
+        definitions[class_name].setdefault("comment", []).append(self._compile_literal(comment))
+
+    def _compile_property_domain(self, definitions, property_uri, domain_uri):
+        property_name = self._extract_name(property_uri)
+        definitions[property_name].setdefault("domain", []).append(self._resolve_domain(domain_uri, definitions))
+
+    def _compile_property_range(self, definitions, property_uri, range_uri):
+        property_name = self._extract_name(property_uri)
+        definitions[property_name].setdefault("range", []).append(self._resolve_range(range_uri, definitions))
+
+    def _compile_property_inverse(self, definitions, property_uri, inverse_uri):
+        property_name = self._extract_name(property_uri)
+        inverse_name = self._extract_name(inverse_uri)
+        if inverse_name in definitions:
+            definitions[property_name].setdefault("inverse_of", []).append(inverse_name)
+        elif text_type(inverse_uri) in self.imported_classes:
+            definitions[property_name].setdefault("inverse_of", []).append(text_type(inverse_uri))
+
+    def _add_type(self, class_definition):
+        class_name = class_definition["name"]
+
+        self.logger.debug("_add_type() - Adding type: %s", class_name)
+
+        base_classes = tuple(
+            self._resolve_type(reference)
+            for reference in class_definition["bases"]
+        )
 
         self.namespace[class_name] = type(
-            class_name,
+            str(class_name),
             base_classes,
-            {"__uri__": class_uri}
+            {"__uri__": URIRef(class_definition["uri"])}
         )
+        if self.stats is not None:
+            self.stats.classes_created += 1
 
-    def _build_property_proxies(self):
+    def _add_annotations(self, class_definition):
+        klass = self.namespace[class_definition["name"]]
+
+        for value, lang, datatype in class_definition.get("label", ()):
+            klass.label += Literal(value, lang=lang, datatype=datatype)
+        for value, lang, datatype in class_definition.get("comment", ()):
+            klass.comment += Literal(value, lang=lang, datatype=datatype)
+        for reference in class_definition.get("domain", ()):
+            self.logger.debug("_add_annotations() - adding domain %s for property %s", reference, klass)
+            klass.domain += self._resolve_type(reference)
+        for reference in class_definition.get("range", ()):
+            self.logger.debug("_add_annotations() - adding range %s for property %s", reference, klass)
+            klass.range += self._resolve_type(reference)
+        for reference in class_definition.get("inverse_of", ()):
+            klass.inverseOf += self._resolve_type(reference)
+        if "characteristics" in class_definition:
+            klass.__characteristics__ = frozenset(URIRef(uri) for uri in class_definition["characteristics"])
+
+    def _index_definitions(self, compiled):
         """
-        Build `PropertyProxy` instances for all (Class, Property) pairs
-        that are specified via an rdfs.domain statement.
+        Index compiled class definitions by name and by topological position.
+
+        Properties are indexed by each of the types in their domain, as inferred by traversing up the
+        property inheritance hierarchy, so that the properties of a class can be resolved
+        without creating any other class.
 
         """
-        visited = set()
+        for position, class_definition in enumerate(compiled["classes"]):
+            class_name = class_definition["name"]
+            self.definitions[class_name] = class_definition
+            self._positions[class_name] = position
+
+            for reference in self._index_inferred_domain(class_definition):
+                self._properties_by_domain[reference].append(class_name)
 
-        for klass in self.namespace.values():
-            if issubclass(klass, RDF_Property):
-                for property_class in set([klass] + klass.__subclasses__()) - visited:
-                    self.logger.debug("_build_property_proxies() - propagating property_class: %s", property_class)
-                    self._propagate_property(property_class, klass.inferred_domain())
-                    visited.add(property_class)
+        self._next_position = len(self._positions)
+
+    def _index_inferred_domain(self, class_definition):
+        """
+        Compute and index the inferred domain of a (property) class definition, i.e its domain along with
+        the inferred domain of its base classes, which must have been indexed beforehand.
+
+        :returns {list} the type references of the inferred domain
+
+        """
+        inferred_domain = OrderedDict.fromkeys(class_definition.get("domain", ()))
+        for reference in class_definition["bases"]:
+            inferred_domain.update(OrderedDict.fromkeys(self._inferred_domains.get(reference, ())))
+
+        inferred_domain = list(inferred_domain)
+        if inferred_domain:
+            self._inferred_domains[class_definition["name"]] = inferred_domain
+        else:
+            self._inferred_domains.pop(class_definition["name"], None)
+
+        return inferred_domain
+
+    def _pending_ancestors(self, class_name):
+        """
+        Return the names of the given class and of all its ancestors that are yet to be materialized,
+        in topological order of inheritance.
 
-    def _propagate_property(self, property_class, domain_classes):
-        for base_class in domain_classes:
-            self.logger.debug(
-                "_propagate_property() - adding property %s to domain class: %s", property_class, base_class
+        """
+        pending = set()
+        stack = [class_name]
+        while stack:
+            name = stack.pop()
+            if name in pending or name in self.namespace:
+                continue
+            pending.add(name)
+            stack.extend(
+                reference
+                for reference in self.definitions[name]["bases"]
+                if reference in self.definitions
             )
-            base_class.__properties__.append(property_class)
-            self._propagate_property(property_class, base_class.__subclasses__())
+
+        return sorted(pending, key=self._positions.get)
+
+    def _compile_property_names(self, class_name):
+        """
+        Compute the names of the properties of a class: the properties of its base classes,
+        along with the ones having the class (or a builtin or imported type it descends from) in their domain.
+        Properties of imported classes are referenced by URI.
+
+        """
+        property_names = OrderedDict()
+        for reference in self.definitions[class_name]["bases"]:
+            if reference in self._property_names:
+                property_names.update(OrderedDict.fromkeys(self._property_names[reference]))
+            for builtin_reference in BUILTIN_ANCESTORS.get(reference, ()):
+                property_names.update(OrderedDict.fromkeys(self._properties_by_domain.get(builtin_reference, ())))
+            if reference in self.imported_classes:
+                property_names.update(OrderedDict.fromkeys(self._imported_property_names(reference)))
+        property_names.update(OrderedDict.fromkeys(self._properties_by_domain.get(class_name, ())))
+        if self.stats is not None:
+            self.stats.properties_propagated += len(property_names)
+
+        return list(property_names)
+
+    def _imported_property_names(self, reference):
+        """
+        Compute the names of the properties of a class that the given imported class is a base class of:
+        the properties of the imported class (referenced by URI), along with the properties of the ontology
+        having the imported class, or any type it descends from, in their domain.
+
+        """
+        imported_class = self.imported_classes[reference]
+        for property_class in imported_class.__properties__:
+            property_reference = text_type(property_class.__uri__)
+            self.imported_classes.setdefault(property_reference, property_class)
+            yield property_reference
+
+        builtin_reference = text_type(RDF.Property if issubclass(imported_class, RDF_Property) else RDFS.Class)
+        ancestor_references = [
+            text_type(ancestor.__uri__)
+            for ancestor in imported_class.__mro__
+            if getattr(ancestor, "__uri__", None) is not None
+        ]
+        for ancestor_reference in ancestor_references + list(BUILTIN_ANCESTORS[builtin_reference]):
+            for property_name in self._properties_by_domain.get(ancestor_reference, ()):
+                yield property_name
+
+    def _build_property_proxies(self):
+        """
+        Build the list of property classes of all classes in the namespace, i.e the properties
+        of their base classes along with the ones having the class in their (inferred) domain.
+
+        Classes are visited once, in topological order of inheritance, so that the properties of
+        base classes are always known beforehand.
+
+        """
+        for class_name in self.definitions:
+            self.logger.debug("_build_property_proxies() - computing properties of class: %s", class_name)
+            property_names = self._compile_property_names(class_name)
+            self._property_names[class_name] = property_names
+            self.namespace[class_name].__properties__ = [self._resolve_type(name) for name in property_names]
@@ -0,0 +1,131 @@
+"""Persistent on-disk cache of compiled ontologies."""
+from hashlib import sha256
+from io import open
+from json import dump, load
+from logging import getLogger
+from os import listdir, makedirs, path, remove, rename
+from tempfile import NamedTemporaryFile
+
+import rdflib
+from six import text_type
+
+from ontology_alchemy.builder import COMPILED_FORMAT_VERSION
+from ontology_alchemy.version import __version__
+
+try:
+    from os import replace
+except ImportError:  # Python 2
+    def replace(source, destination):
+        # Renaming onto an existing file fails on Windows
+        try:
+            rename(source, destination)
+        except OSError:
+            remove(destination)
+            rename(source, destination)
+
+
+CACHE_FILE_EXTENSION = ".json"
+
+
+class CompiledOntologyCache(object):
+    """
+    A directory of compiled ontologies (see `OntologyBuilder.compile()`), keyed by
+    the content of the ontology definition and the versions of the libraries used to compile it.
+
+    Entries compiled by a different version of rdflib or of this library, or in a different
+    compiled format, are never looked up again and can be removed with `invalidate()`.
+
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.logger = getLogger(__name__)
+
+    def key(self, data, format=None, public_id=None):
+        """
+        Compute the cache key for an ontology definition.
+
+        :param data - the raw (bytes) content of the ontology definition
+        :param format - the format ontology is serialized in
+        :param public_id - the base URI relative URIs of the ontology definition are resolved against
+        :returns {str} the cache key
+
+        """
+        digest = sha256(data)
+        for version in (
+            format or "",
+            public_id or "",
+            rdflib.__version__,
+            __version__,
+            COMPILED_FORMAT_VERSION,
+        ):
+            digest.update(b"\0")
+            digest.update(text_type(version).encode("utf-8"))
+
+        return digest.hexdigest()
+
+    def get(self, key):
+        """
+        Retrieve a compiled ontology from the cache.
+
+        :param key - the cache key, as returned by `key()`
+        :returns {dict} the compiled ontology, or None on a cache miss
+
+        """
+        try:
+            with open(self._path(key), encoding="utf-8") as cache_file:
+                compiled = load(cache_file)
+        except (IOError, OSError, ValueError) as error:
+            self.logger.debug("get() - cache miss for key: %s (%s)", key, error)
+            return None
+
+        if compiled.get("version") != COMPILED_FORMAT_VERSION:
+            return None
+
+        return compiled
+
+    def set(self, key, compiled):
+        """
+        Store a compiled ontology in the cache.
+
+        The entry is written to a temporary file first and then moved in place, so that concurrent
+        readers never see partially written entries.
+
+        :param key - the cache key, as returned by `key()`
+        :param compiled - the compiled ontology
+
+        """
+        if not path.isdir(self.cache_dir):
+            makedirs(self.cache_dir)
+
+        with NamedTemporaryFile("w", dir=self.cache_dir, suffix=".tmp", delete=False) as cache_file:
+            dump(compiled, cache_file, separators=(",", ":"))
+
+        replace(cache_file.name, self._path(key))
+
+    def invalidate(self, key=None):
+        """
+        Remove entries from the cache.
+
+        :param key - the cache key of the entry to remove. If not provided, all entries are removed.
+
+        """
+        if key is not None:
+            filenames = [path.basename(self._path(key))]
+        elif path.isdir(self.cache_dir):
+            filenames = [
+                filename
+                for filename in listdir(self.cache_dir)
+                if filename.endswith(CACHE_FILE_EXTENSION)
+            ]
+        else:
+            filenames = []
+
+        for filename in filenames:
+            try:
+                remove(path.join(self.cache_dir, filename))
+            except OSError:
+                pass
+
+    def _path(self, key):
+        return path.join(self.cache_dir, "{}{}".format(key, CACHE_FILE_EXTENSION))
@@ -0,0 +1,421 @@
+"""Column-oriented storage of ontology class instances."""
+from array import array
+from bisect import bisect_right
+from weakref import WeakKeyDictionary
+
+from rdflib import URIRef
+from six import iteritems, text_type
+
+from ontology_alchemy.base import generate_uri
+from ontology_alchemy.serialization import DEFAULT_CHUNK_SIZE, serialize_statements
+from ontology_alchemy.terms import TermDictionary
+
+
+# Columnar stores of all classes, keyed by class
+COLUMNAR_STORES = WeakKeyDictionary()
+
+# Type code of the arrays of term IDs and offsets (4 bytes signed integers, i.e up to 2^31 values per column)
+ARRAY_TYPE_CODE = "i"
+
+
+class Column(object):
+    """
+    The values of a (multi-valued) property for all rows of a columnar store.
+
+    Values are stored as term IDs, contiguously for each row, along with the offset of the first value
+    of each row (in compressed sparse row layout). Values added to a row after values have been added
+    to subsequent rows are kept aside, in `overflow`.
+
+    """
+    __slots__ = ("name", "uri", "prototype", "term_ids", "offsets", "overflow")
+
+    def __init__(self, name, uri, prototype):
+        self.name = name
+        self.uri = uri
+        self.prototype = prototype
+        self.term_ids = array(ARRAY_TYPE_CODE)
+        self.offsets = array(ARRAY_TYPE_CODE, [0])
+        self.overflow = {}
+
+    def add(self, row, term_ids):
+        """
+        Add values to a row.
+
+        :param row - the row
+        :param term_ids - the term IDs of the values
+
+        """
+        offsets = self.offsets
+        num_rows = len(offsets) - 1
+        if row >= num_rows - 1:
+            # Rows with no values yet are padded with empty ranges
+            for _ in range(row + 1 - num_rows):
+                offsets.append(len(self.term_ids))
+            self.term_ids.extend(term_ids)
+            offsets[row + 1] = len(self.term_ids)
+        else:
+            self.overflow.setdefault(row, []).extend(term_ids)
+
+    def get(self, row):
+        """
+        :param row - the row
+        :returns {list} the term IDs of the values of a row
+
+        """
+        offsets = self.offsets
+        term_ids = []
+        if row < len(offsets) - 1:
+            term_ids = self.term_ids[offsets[row]:offsets[row + 1]].tolist()
+
+        return term_ids + self.overflow.get(row, [])
+
+    def iter_rows(self):
+        """
+        :returns iterable over the (row, term ID) pairs of all values of the column
+
+        """
+        offsets = self.offsets
+        term_ids = self.term_ids
+        for row in range(len(offsets) - 1):
+            for position in range(offsets[row], offsets[row + 1]):
+                yield row, term_ids[position]
+        for row, overflow_term_ids in sorted(iteritems(self.overflow)):
+            for term_id in overflow_term_ids:
+                yield row, term_id
+
+    def scan(self, term_id):
+        """
+        Find the rows having a given value.
+
+        The raw bytes of the term IDs are searched for the bytes of the term ID (`bytes.find()`, which runs in C),
+        rather than comparing term IDs one by one in Python, so that the cost of a scan mostly depends on the
+        number of rows found. Once a row is found, the search resumes from the next row.
+
+        :param term_id - the term ID of the value
+        :returns {list} the sorted rows
+
+        """
+        offsets = self.offsets
+        item_size = self.term_ids.itemsize
+        data = self.term_ids.tobytes()
+        pattern = array(ARRAY_TYPE_CODE, [term_id]).tobytes()
+
+        rows = []
+        position = data.find(pattern)
+        while position != -1:
+            if position % item_size:
+                # Matches the bytes of two adjacent term IDs
+                position = data.find(pattern, position + 1)
+                continue
+            row = bisect_right(offsets, position // item_size) - 1
+            rows.append(row)
+            position = data.find(pattern, offsets[row + 1] * item_size)
+
+        overflow_rows = [
+            row
+            for row, overflow_term_ids in iteritems(self.overflow)
+            if term_id in overflow_term_ids
+        ]
+        if overflow_rows:
+            rows = sorted(set(rows).union(overflow_rows))
+
+        return rows
+
+
+class ColumnarStore(object):
+    """
+    Column-oriented storage of the instances of an ontology class, as an alternative to Python objects
+    holding property proxies, for large numbers of instances.
+
+    Each instance is a row of the store. The values of each property are stored in arrays of term IDs
+    (see `TermDictionary`), which only costs a few bytes per value, distinct values being stored once.
+    Instances are accessed through thin views (see `ColumnarInstance`).
+
+    Values are validated against the range of properties, and converted, as for class instances, except for
+    references to other instances which are stored (and read back) as URIs.
+
+    >>> store = ColumnarStore.for_(ontology.Corporation)
+    >>> store.extend({"uri": uri, "label": name} for uri, name in rows)
+    >>> acme = store.append(label="Acme Inc.")
+    >>> acme.label(lang="en")
+    ['Acme Inc.']
+
+    """
+
+    def __init__(self, klass, terms=None):
+        """
+        :param klass - the ontology class
+        :param terms - the dictionary of the terms of the store. Defaults to a dictionary of its own, a dictionary
+            can be shared by several stores so that their term IDs can be compared.
+
+        """
+        self.klass = klass
+        self.terms = TermDictionary() if terms is None else terms
+        self.uris = []
+        self.columns = {}
+        # Types of the values known to be valid for each property
+        self._valid_types = {}
+
+    @classmethod
+    def for_(cls, klass):
+        """
+        Return the columnar store of a class, creating it if needed.
+
+        :param klass - the ontology class
+        :returns {ColumnarStore} the store
+
+        """
+        store = COLUMNAR_STORES.get(klass)
+        if store is None:
+            store = COLUMNAR_STORES[klass] = cls(klass)
+
+        return store
+
+    def __len__(self):
+        return len(self.uris)
+
+    def __iter__(self):
+        return (ColumnarInstance(self, row) for row in range(len(self.uris)))
+
+    def __getitem__(self, row):
+        if not 0 <= row < len(self.uris):
+            raise IndexError("{} store has no row {}".format(self.klass.__name__, row))
+
+        return ColumnarInstance(self, row)
+
+    def append(self, uri=None, **kwargs):
+        """
+        Add an instance to the store.
+
+        :param uri - the URI of the instance. If not provided, a URI is generated.
+        :param kwargs - values of the properties of the instance, as passed to the class constructor
+        :returns {ColumnarInstance} a view of the instance
+
+        """
+        return self[self._append(uri, iteritems(kwargs))]
+
+    def extend(self, records):
+        """
+        Add many instances to the store.
+
+        :param records - iterable over dicts of property values keyed by property name (and "uri"),
+            as passed to the class constructor
+        :returns {range} the rows of the added instances
+
+        """
+        start = len(self.uris)
+        for record in records:
+            record = dict(record)
+            self._append(record.pop("uri", None), iteritems(record))
+
+        return range(start, len(self.uris))
+
+    def uri(self, row):
+        """
+        :returns {rdflib.URIRef} the URI of the instance of a row
+
+        """
+        return URIRef(self.uris[row])
+
+    def get(self, row, name):
+        """
+        :param row - the row
+        :param name - the name of the property
+        :returns {list} the values of a property for the instance of a row
+
+        """
+        column = self.columns.get(name)
+        if column is None:
+            return []
+
+        decode = self.terms.decode
+        return [decode(term_id) for term_id in column.get(row)]
+
+    def add(self, row, name, values):
+        """
+        Add values of a property to the instance of a row.
+
+        :param row - the row
+        :param name - the name of the property
+        :param values - the values
+
+        """
+        column = self._column(name)
+        stored_values = [self._stored_value(column, value) for value in values]
+        column.add(row, [self.terms.encode(stored_value) for stored_value in stored_values])
+
+    def rows_with(self, name, value):
+        """
+        Find the instances having a given value for a given property, by scanning its column.
+
+        :param name - the name of the property
+        :param value - the value, e.g a literal, or an instance (or view) to find references to
+        :returns {list} the rows of the instances
+
+        """
+        column = self.columns.get(name)
+        if column is None:
+            return []
+
+        term_id = self.terms.lookup(self._to_stored_value(column, value))
+        if term_id is None:
+            return []
+
+        return column.scan(term_id)
+
+    def iter_values(self, name):
+        """
+        Iterate over the values of a property for all instances, by scanning its column.
+
+        :param name - the name of the property
+        :returns iterable over (row, value) pairs
+
+        """
+        column = self.columns.get(name)
+        if column is None:
+            return iter(())
+
+        decode = self.terms.decode
+        return ((row, decode(term_id)) for row, term_id in column.iter_rows())
+
+    def iter_rdf_statements(self):
+        """
+        Return an iterable over (subject, predicate, object) triples representing all of the instances
+        of the store, one column after the other.
+
+        """
+        decode = self.terms.decode
+        uris = self.uris
+        for column in self.columns.values():
+            for row, term_id in column.iter_rows():
+                yield (URIRef(uris[row]), column.uri, decode(term_id))
+
+    def serialize(self, stream, format="nt", graph_uri=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Serialize the RDF statements representing all of the instances of the store,
+        see `Session.serialize()`.
+
+        """
+        serialize_statements(
+            self.iter_rdf_statements(),
+            stream,
+            format=format,
+            graph_uri=graph_uri,
+            chunk_size=chunk_size,
+        )
+
+    def _append(self, uri, items):
+        # All values are validated and converted before the row is added, so that invalid records are not stored in part
+        stored_values = []
+        for name, value in items:
+            column = self._column(name)
+            stored_values.append((column, self._stored_value(column, value)))
+
+        row = len(self.uris)
+        # URIs are stored as (more compact) strings, and only converted to URIRef when read
+        self.uris.append(text_type(uri or generate_uri(self.klass.__uri__)))
+
+        encode = self.terms.encode
+        for column, stored_value in stored_values:
+            column.add(row, [encode(stored_value)])
+
+        return row
+
+    def _column(self, name):
+        column = self.columns.get(name)
+        if column is None:
+            prototype = self.klass._property_schema().get(name)
+            if prototype is None:
+                raise AttributeError("{} object has no attribute {}".format(self.klass.__name__, name))
+            column = self.columns[name] = Column(name, prototype.uri, prototype)
+            self._valid_types[name] = set()
+
+        return column
+
+    def _stored_value(self, column, value):
+        """
+        Validate a value of a property, and convert it to the value stored.
+
+        :raises ValueError if the value is not valid for the property
+
+        """
+        valid_types = self._valid_types[column.name]
+        if value.__class__ not in valid_types:
+            column.prototype.validate(value)
+            valid_types.add(value.__class__)
+
+        return self._to_stored_value(column, value)
+
+    def _to_stored_value(self, column, value):
+        uri = getattr(value, "uri", None)
+        if uri is not None:
+            # References to other instances
+            return URIRef(uri)
+
+        return column.prototype.convert(value)
+
+
+class ColumnarInstance(object):
+    """
+    A thin view of an instance stored in a `ColumnarStore`.
+
+    Properties are read as property proxies holding the values of the instance, as for class instances,
+    and values added to them (e.g `instance.label += "Acme Inc."`) are written through to the store.
+    Views pass `isinstance()` checks for the class of the store, so they can be assigned as property values.
+
+    """
+    __slots__ = ("store", "row")
+
+    def __init__(self, store, row):
+        object.__setattr__(self, "store", store)
+        object.__setattr__(self, "row", row)
+
+    @property
+    def __class__(self):
+        return self.store.klass
+
+    @property
+    def uri(self):
+        return self.store.uri(self.row)
+
+    def __eq__(self, other):
+        return isinstance(other, ColumnarInstance) and (self.store, self.row) == (other.store, other.row)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((id(self.store), self.row))
+
+    def __repr__(self):
+        return "<{} uri={}>".format(self.store.klass.__name__, self.uri)
+
+    def __getattr__(self, name):
+        prototype = self.store.klass._property_schema().get(name)
+        if prototype is None:
+            raise AttributeError("{} object has no attribute {}".format(self.store.klass.__name__, name))
+
+        property_proxy = prototype.empty_copy()
+        property_proxy.values = self.store.get(self.row, name)
+        return property_proxy
+
+    def __setattr__(self, name, property_proxy):
+        # Assigned back after augmented assigments (e.g `instance.label += ...`), with the values added
+        stored_values = self.store.get(self.row, name)
+        added_values = property_proxy.values[len(stored_values):]
+        if property_proxy.values[:len(stored_values)] != stored_values:
+            raise ValueError("{}({}): Invalid assigment. values of instances in a columnar store can only be added"
+                             .format(self.store.klass.__name__, name))
+
+        self.store.add(self.row, name, added_values)
+
+    def iter_rdf_statements(self):
+        """
+        Returns an iterable over (subject, predicate, object) triples
+        representing all of the relations and assigments represented in the instance.
+
+        """
+        uri = self.uri
+        for name, column in iteritems(self.store.columns):
+            for value in self.store.get(self.row, name):
+                yield (uri, column.uri, value)
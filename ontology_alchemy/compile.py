@@ -0,0 +1,211 @@
+"""
+Compilation of ontologies into static Python modules.
+
+The generated module defines the classes of the ontology with plain class statements, along with their labels,
+comments, domains, ranges, inverses, characteristics and properties, so that importing it builds the namespace
+without parsing the ontology nor compiling its class hierarchy, benefits from `.pyc` caching, and can be read by
+static analyzers and IDEs.
+
+Usage:
+
+    python -m ontology_alchemy.compile ontology.ttl -o my_onto.py
+
+"""
+import re
+import sys
+from argparse import ArgumentParser
+from io import open
+from keyword import iskeyword
+
+from rdflib import RDF, RDFS
+from rdflib.util import guess_format
+from six import text_type
+from six.moves import builtins
+
+from ontology_alchemy.builder import OntologyBuilder
+from ontology_alchemy.ingestion import parse
+from ontology_alchemy.version import __version__
+
+
+# Expressions of the generated module referencing the builtin types of compiled class definitions
+BUILTIN_EXPRESSIONS = {
+    text_type(RDFS.Class): "_RDFS_Class",
+    text_type(RDF.Property): "_RDF_Property",
+    text_type(RDFS.Literal): "_Literal",
+    text_type(RDF.List): "_RDF.List",
+}
+
+PYTHON_IDENTIFIER = re.compile(r"^[A-Za-z][A-Za-z0-9_]*$")
+
+MODULE_HEADER = '''# -*- coding: utf-8 -*-
+"""
+Python classes of the ontology {base_uri}{source}.
+
+Generated by ontology-alchemy {version}, do not edit. Generate again with:
+
+    python -m ontology_alchemy.compile
+
+"""
+from __future__ import unicode_literals
+
+from rdflib import Literal as _Literal, RDF as _RDF, URIRef as _URIRef
+
+from ontology_alchemy.base import RDF_Property as _RDF_Property, RDFS_Class as _RDFS_Class
+
+
+__uri__ = {base_uri!r}
+
+# All classes of the ontology, keyed by name, including those whose name is not a valid Python identifier
+__classes__ = {{}}
+
+
+def _new_class(name, bases, uri, _type=type, _str=str):
+    return _type(_str(name), bases, {{"__uri__": _URIRef(uri)}})
+'''
+
+
+def generate_module(builder, source=None):
+    """
+    Generate the source code of a Python module defining the classes of an ontology.
+
+    Classes are defined in topological order of inheritance, with plain class statements, unless their name is not
+    a valid Python identifier (or could shadow a builtin). All classes are available as attributes of the module,
+    and in its `__classes__` dict, keyed by name.
+
+    :param builder - the `OntologyBuilder` of the ontology, whose namespace is not built yet
+    :param source - the name of the file the ontology is defined in, mentioned in the module docstring
+    :returns {str} the source code of the module
+
+    """
+    compiled = builder.compile()
+    # Definitions are indexed to compute the properties of classes, without creating any class
+    builder.build_namespace(compiled, lazy=True)
+    definitions = builder.definitions
+
+    def reference(type_reference):
+        if type_reference in definitions:
+            return _class_expression(type_reference)
+        elif type_reference in BUILTIN_EXPRESSIONS:
+            return BUILTIN_EXPRESSIONS[type_reference]
+
+        raise ValueError("Cannot reference imported class {} from a generated module".format(type_reference))
+
+    lines = [MODULE_HEADER.format(
+        base_uri=text_type(compiled["base_uri"]),
+        source=" (from {})".format(source) if source else "",
+        version=__version__,
+    ).rstrip("\n")]
+    names = []
+    for class_definition in compiled["classes"]:
+        name = class_definition["name"]
+        bases = [reference(base) for base in class_definition["bases"]]
+        lines.append("")
+        if _is_identifier(name):
+            lines.append("")
+            lines.append("class {}({}):".format(name, ", ".join(bases)))
+            lines.append("    __uri__ = _URIRef({!r})".format(text_type(class_definition["uri"])))
+            lines.append("")
+            lines.append("")
+            lines.append("__classes__[{!r}] = {}".format(text_type(name), name))
+        else:
+            lines.append("__classes__[{!r}] = _new_class({!r}, ({},), {!r})".format(
+                text_type(name),
+                text_type(name),
+                ", ".join(bases),
+                text_type(class_definition["uri"]),
+            ))
+        names.append(name)
+
+    lines.append("")
+    lines.append("")
+    lines.append("# Annotations")
+    for class_definition in compiled["classes"]:
+        expression = _class_expression(class_definition["name"])
+        for key in ("label", "comment"):
+            for value, lang, datatype in class_definition.get(key, ()):
+                lines.append("{}.{} += {}".format(expression, key, _literal_expression(value, lang, datatype)))
+        for key, attribute in (("domain", "domain"), ("range", "range"), ("inverse_of", "inverseOf")):
+            for type_reference in class_definition.get(key, ()):
+                lines.append("{}.{} += {}".format(expression, attribute, reference(type_reference)))
+        if "characteristics" in class_definition:
+            lines.append("{}.__characteristics__ = frozenset([{}])".format(expression, ", ".join(
+                "_URIRef({!r})".format(text_type(uri)) for uri in class_definition["characteristics"]
+            )))
+
+    lines.append("")
+    lines.append("# Properties of the class instances, including those of their base classes")
+    for name in names:
+        property_names = builder.property_names(name)
+        if property_names:
+            lines.append("{}.__properties__ = [{}]".format(
+                _class_expression(name),
+                ", ".join(reference(property_name) for property_name in property_names),
+            ))
+
+    if not all(_is_identifier(name) for name in names):
+        lines.append("")
+        lines.append("globals().update(__classes__)")
+
+    return "\n".join(lines) + "\n"
+
+
+def compile_ontology(filename, output, format=None, base_uri=None):
+    """
+    Compile an ontology file into a Python module.
+
+    :param filename - local filesystem path to the file containing the ontology
+    :param output - path to the Python module to write, or a file-like object
+    :param format - the format the ontology is serialized in. If not provided, it is guessed from the filename.
+    :param base_uri - the base URI of the ontology. If not provided, it is inferred from its definitions.
+
+    """
+    builder = OntologyBuilder(None, base_uri=base_uri)
+    parse(builder, filename, format=format or guess_format(filename))
+    source_code = generate_module(builder, source=filename)
+
+    if hasattr(output, "write"):
+        output.write(source_code)
+        return
+
+    with open(output, "w", encoding="utf-8") as module_file:
+        module_file.write(source_code)
+
+
+def _is_identifier(name):
+    # Private and builtin names are avoided, so that generated classes never shadow the names the module relies on
+    return bool(
+        PYTHON_IDENTIFIER.match(name) and
+        not iskeyword(name) and
+        not hasattr(builtins, name)
+    )
+
+
+def _class_expression(name):
+    return name if _is_identifier(name) else "__classes__[{!r}]".format(text_type(name))
+
+
+def _literal_expression(value, lang, datatype):
+    arguments = [repr(text_type(value))]
+    if lang:
+        arguments.append("lang={!r}".format(text_type(lang)))
+    if datatype:
+        arguments.append("datatype=_URIRef({!r})".format(text_type(datatype)))
+
+    return "_Literal({})".format(", ".join(arguments))
+
+
+def main(argv=None):
+    parser = ArgumentParser(description="Compile an ontology into a Python module.")
+    parser.add_argument("filename", help="file containing the ontology")
+    parser.add_argument("-o", "--output", help="Python module to write. Defaults to the standard output.")
+    parser.add_argument("-f", "--format", help="format the ontology is serialized in, e.g turtle")
+    parser.add_argument("--base-uri", help="base URI of the ontology, if it cannot be inferred")
+    args = parser.parse_args(argv)
+
+    compile_ontology(args.filename, args.output or sys.stdout, format=args.format, base_uri=args.base_uri)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -16,7 +16,8 @@ LITERAL_PRIMITIVE_TYPES = string_types + (
     bool,
 )
 
-COMMON_PROPERTY_URIS = (
+# Kept as a set, as URIs are looked up in it for every class and property of an ontology
+COMMON_PROPERTY_URIS = frozenset((
     OWL.AnnotationProperty,
     OWL.AsymmetricProperty,
     OWL.DatatypeProperty,
@@ -30,4 +31,16 @@ COMMON_PROPERTY_URIS = (
     OWL.SymmetricProperty,
     OWL.TransitiveProperty,
     RDF.Property,
-)
+))
+
+# Characteristics of properties, as OWL types, kept on the property classes declared with them
+# (see `RDF_Property.__characteristics__`)
+PROPERTY_CHARACTERISTIC_URIS = frozenset((
+    OWL.AsymmetricProperty,
+    OWL.FunctionalProperty,
+    OWL.InverseFunctionalProperty,
+    OWL.IrreflexiveProperty,
+    OWL.ReflexiveProperty,
+    OWL.SymmetricProperty,
+    OWL.TransitiveProperty,
+))
@@ -0,0 +1,149 @@
+"""Reachability index of class hierarchies."""
+from bisect import bisect_right
+from collections import deque
+
+
+class HierarchyIndex(object):
+    """
+    A reachability index of a class hierarchy, telling whether a class descends from another, and listing
+    the descendants of a class, without walking the hierarchy.
+
+    Classes are numbered in post-order of a depth-first traversal of a spanning tree of the hierarchy (following
+    the first base of each class), so that the descendants of a class along the spanning tree are numbered
+    consecutively. Each class is then labelled with the intervals of the numbers of all of its descendants, i.e
+    its spanning tree interval, along with the intervals of the descendants it has through other bases (see
+    Agrawal, Borgida and Jagadish, "Efficient management of transitive relationships in large data and knowledge
+    bases"). Classes of hierarchies with little multiple inheritance mostly have a single interval.
+
+    Checking whether a class descends from another is then a lookup of the number of the former in the
+    intervals of the latter, and the descendants of a class are read off the classes in numbering order.
+
+    """
+
+    def __init__(self, bases):
+        """
+        :param bases - the names of the base classes of each class, keyed by class name, in topological order
+            of inheritance (base classes first). Base classes which are not part of the hierarchy are ignored.
+
+        """
+        self.bases = dict(
+            (name, tuple(base for base in base_names if base in bases))
+            for name, base_names in bases.items()
+        )
+        # Class names in numbering order, and the number of each class
+        self.order = []
+        self.numbers = {}
+        # Flattened (start, end) pairs of the sorted, disjoint intervals of numbers of the descendants of each class
+        self.intervals = {}
+
+        tree_children = dict((name, []) for name in self.bases)
+        roots = []
+        for name, base_names in self.bases.items():
+            if base_names:
+                tree_children[base_names[0]].append(name)
+            else:
+                roots.append(name)
+
+        starts = {}
+        stack = [(name, False) for name in reversed(roots)]
+        while stack:
+            name, visited = stack.pop()
+            if visited:
+                self.numbers[name] = len(self.order)
+                self.order.append(name)
+                continue
+            starts[name] = len(self.order)
+            stack.append((name, True))
+            stack.extend((child, False) for child in reversed(tree_children[name]))
+
+        children = dict((name, []) for name in self.bases)
+        for name, base_names in self.bases.items():
+            for base in base_names:
+                children[base].append(name)
+
+        # Descendants first, so that the intervals of all the children of a class are known
+        for name in reversed(list(bases)):
+            intervals = [(starts[name], self.numbers[name])]
+            for child in children[name]:
+                child_intervals = self.intervals[child]
+                # Spanning tree intervals of children are part of the spanning tree interval of their parent
+                if self.bases[child][0] != name or child_intervals != (starts[child], self.numbers[child]):
+                    intervals.extend(zip(child_intervals[::2], child_intervals[1::2]))
+            self.intervals[name] = _merge(intervals)
+
+    def __len__(self):
+        return len(self.order)
+
+    def __contains__(self, name):
+        return name in self.numbers
+
+    def is_subclass(self, name, base):
+        """
+        Check whether a class descends from another (or is the same class).
+
+        :param name - the name of the class
+        :param base - the name of the other class
+        :returns {bool} whether the class is a sub-class of the other class
+
+        """
+        number = self.numbers[name]
+        intervals = self.intervals[base]
+        if len(intervals) == 2:
+            return intervals[0] <= number <= intervals[1]
+
+        index = bisect_right(intervals, number)
+        # Numbers within an interval fall after its start (odd index), or right on its end
+        return index % 2 == 1 or (index > 0 and intervals[index - 1] == number)
+
+    def descendants(self, base):
+        """
+        :param base - the name of the class
+        :returns {list} the names of all (direct and indirect) sub-classes of a class, in numbering order
+
+        """
+        order = self.order
+        number = self.numbers[base]
+        intervals = self.intervals[base]
+        descendants = []
+        for index in range(0, len(intervals), 2):
+            descendants.extend(order[intervals[index]:intervals[index + 1] + 1])
+        descendants.remove(order[number])
+
+        return descendants
+
+    def ancestors(self, name):
+        """
+        :param name - the name of the class
+        :returns {list} the names of all (direct and indirect) base classes of a class, nearest first
+
+        """
+        ancestors = []
+        seen = set([name])
+        queue = deque([name])
+        while queue:
+            for base in self.bases[queue.popleft()]:
+                if base not in seen:
+                    seen.add(base)
+                    ancestors.append(base)
+                    queue.append(base)
+
+        return ancestors
+
+
+def _merge(intervals):
+    """
+    Merge intervals of numbers into sorted, disjoint intervals.
+
+    :param intervals - the (start, end) pairs of the intervals
+    :returns {tuple} the flattened (start, end) pairs of the merged intervals
+
+    """
+    intervals.sort()
+    merged = [intervals[0][0], intervals[0][1]]
+    for start, end in intervals[1:]:
+        if start <= merged[-1] + 1:
+            merged[-1] = max(merged[-1], end)
+        else:
+            merged.extend((start, end))
+
+    return tuple(merged)
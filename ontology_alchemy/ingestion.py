@@ -0,0 +1,235 @@
+"""Ingestion of ontology files straight into an ontology builder, without building a graph."""
+from multiprocessing import Pool, cpu_count
+from os import path
+
+from rdflib import Graph
+from rdflib.store import Store
+
+try:
+    from rdflib.plugins.parsers.ntriples import W3CNTriplesParser, r_wspace
+except ImportError:  # rdflib < 6, files are then parsed whole, see `ingest()`
+    W3CNTriplesParser = r_wspace = None
+
+
+# Formats in which every statement is serialized on its own line, so that files can be split at any line boundary
+LINE_BASED_FORMATS = ("nt", "nquads")
+
+# Number of chunks files are split into per process, so that processes which parse faster get more chunks
+CHUNKS_PER_PROCESS = 4
+
+
+class LabelledBlankNodes(dict):
+    """
+    Blank node identifiers keyed by label, as kept by the N-Triples parser, which keeps the labels of the file
+    rather than generating new identifiers, so that the blank nodes of a file parsed in chunks are consistent.
+
+    """
+
+    def get(self, label, default=None):
+        return label
+
+
+class BuilderStore(Store):
+    """
+    An rdflib store which adds the statements parsed into it straight to an ontology builder, rather than storing
+    them, so that ontologies in any format can be parsed without building a graph.
+
+    Only the statements needed to build the namespace are kept, see `OntologyBuilder.add_statements()`.
+
+    """
+    # Statements of all graphs (e.g in N-Quads or JSON-LD files) are added to a same builder,
+    # and quoted statements (in N3 formulae) are ignored
+    context_aware = True
+    formula_aware = True
+    graph_aware = True
+
+    def __init__(self, builder):
+        super(BuilderStore, self).__init__()
+        self.builder = builder
+        self.index_handlers = builder._index_handlers
+        self.bindings = {}
+
+    def add(self, triple, context, quoted=False):
+        handler = self.index_handlers.get(triple[1])
+        if handler is not None and not quoted:
+            handler(*triple)
+
+    def bind(self, prefix, namespace, override=True):
+        # Namespaces declared by files (e.g `@prefix` bindings) are passed on to the builder
+        if override or prefix not in self.bindings:
+            self.bindings[prefix] = namespace
+            self.builder.bind(prefix, namespace)
+
+    def namespace(self, prefix):
+        return self.bindings.get(prefix)
+
+    def prefix(self, namespace):
+        return next((prefix for prefix, bound in self.bindings.items() if bound == namespace), None)
+
+    def namespaces(self):
+        return iter(self.bindings.items())
+
+    def add_graph(self, graph):
+        pass
+
+    def remove_graph(self, graph):
+        pass
+
+    def __len__(self, context=None):
+        return 0
+
+
+class BatchStore(BuilderStore):
+    """
+    An rdflib store which collects the statements parsed into it that are needed to build the namespace of an ontology,
+    as (subject, object) pairs keyed by predicate, rather than adding them to the builder right away, e.g to send them
+    to another process. Repeated terms are shared, so that batches are compact once serialized.
+
+    Namespaces declared by files are still passed on to the builder.
+
+    """
+
+    def __init__(self, builder):
+        super(BatchStore, self).__init__(builder)
+        self.batch = {}
+        self.terms = {}
+
+    def add(self, triple, context, quoted=False):
+        s, p, o = triple
+        if p in self.index_handlers and not quoted:
+            pairs = self.batch.get(p)
+            if pairs is None:
+                pairs = self.batch[p] = []
+            pairs.append((self.terms.setdefault(s, s), self.terms.setdefault(o, o)))
+
+
+def parse(builder, source=None, format=None, data=None, public_id=None):
+    """
+    Parse an ontology, adding its statements straight to an ontology builder as they are parsed,
+    without building a graph.
+
+    :param builder - the `OntologyBuilder` to add the statements to
+    :param source - file-like object or local filesystem path to the file containing the ontology
+    :param format - the format the ontology is serialized in, as for `rdflib.Graph.parse()`
+    :param data - the content of the ontology, if not parsed from a source
+    :param public_id - the base URI to resolve relative URIs against, e.g that of the file data was read from
+
+    """
+    Graph(store=BuilderStore(builder)).parse(source, format=format, data=data, publicID=public_id)
+
+
+def ingest(filename, builder, format="nt", processes=None):
+    """
+    Parse an N-Triples or N-Quads file in chunks, in parallel, and add the statements needed to build
+    the namespace straight to an ontology builder, without building a graph.
+
+    The file is split into byte ranges at line boundaries, parsed in a pool of processes, and the statements
+    of each chunk are added to the builder as soon as they are parsed, in order. With versions of rdflib older
+    than 6, the file is instead parsed whole, in the current process (see `parse()`).
+
+    :param filename - local filesystem path to the file
+    :param builder - the `OntologyBuilder` to add the statements to
+    :param format - the format of the file, one of `LINE_BASED_FORMATS`
+    :param processes - the number of processes to parse the file with. Defaults to the number of CPUs.
+        The file is parsed in the current process if 1.
+
+    """
+    if format not in LINE_BASED_FORMATS:
+        raise ValueError("Cannot parse {} files in chunks, only one of: {}".format(format, LINE_BASED_FORMATS))
+    if W3CNTriplesParser is None:
+        parse(builder, filename, format=format)
+        return
+
+    processes = processes or cpu_count()
+    predicates = [predicate.n3() for predicate in builder._index_handlers]
+    chunks = [
+        (filename, start, end, predicates)
+        for start, end in split_lines(filename, processes * CHUNKS_PER_PROCESS)
+    ]
+    if processes == 1 or len(chunks) < 2:
+        for chunk in chunks:
+            _add_batch(builder, parse_chunk(chunk))
+        return
+
+    pool = Pool(processes)
+    try:
+        for batch in pool.imap(parse_chunk, chunks):
+            _add_batch(builder, batch)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def split_lines(filename, num_chunks):
+    """
+    Split a file into byte ranges of about the same size, at line boundaries.
+
+    :param filename - local filesystem path to the file
+    :param num_chunks - the number of ranges to split the file into
+    :returns {list} the (start, end) offsets of the (non-empty) ranges
+
+    """
+    size = path.getsize(filename)
+    offsets = [0]
+    with open(filename, "rb") as chunk_file:
+        for index in range(1, num_chunks):
+            chunk_file.seek(max(size * index // num_chunks, offsets[-1]))
+            # Ranges end after the line the approximate offset falls into
+            chunk_file.readline()
+            offsets.append(min(chunk_file.tell(), size))
+    offsets.append(size)
+
+    return [(start, end) for start, end in zip(offsets, offsets[1:]) if start < end]
+
+
+def parse_chunk(chunk):
+    """
+    Parse the statements of a byte range of an N-Triples or N-Quads file, e.g in a worker process of `ingest()`.
+
+    Lines are only parsed if their predicate is one of the given predicates, and the context of quads is ignored.
+    Terms repeated across statements are shared, so that batches are compact once serialized.
+
+    :param chunk - the (filename, start, end, predicates) of the range, predicates being formatted in N-Triples
+    :returns {dict} the (subject, object) pairs of the statements keyed by predicate
+
+    """
+    filename, start, end, predicates = chunk
+    predicates = set(predicate.encode("utf-8") for predicate in predicates)
+    parser = W3CNTriplesParser(bnode_context=LabelledBlankNodes())
+    terms = {}
+    batch = {}
+    with open(filename, "rb") as chunk_file:
+        chunk_file.seek(start)
+        position = start
+        for line in chunk_file:
+            if position >= end:
+                break
+            position += len(line)
+
+            # Subjects (URIs or blank nodes) cannot contain whitespace, so the predicate is always the second token
+            tokens = line.split(None, 2)
+            if len(tokens) < 3 or tokens[1] not in predicates:
+                continue
+
+            parser.line = line.decode("utf-8")
+            parser.eat(r_wspace)
+            subject = parser.subject()
+            parser.eat(r_wspace)
+            predicate = parser.predicate()
+            parser.eat(r_wspace)
+            object_ = parser.object()
+
+            pairs = batch.get(predicate)
+            if pairs is None:
+                pairs = batch[predicate] = []
+            pairs.append((terms.setdefault(subject, subject), terms.setdefault(object_, object_)))
+
+    return batch
+
+
+def _add_batch(builder, batch):
+    builder.add_statements(
+        (s, predicate, o)
+        for predicate, pairs in batch.items()
+        for s, o in pairs
+    )
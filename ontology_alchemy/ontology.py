@@ -1,26 +1,63 @@
-from rdflib import Graph
+from collections import OrderedDict
+from multiprocessing import Pool
+from os import path
+
+from rdflib import Graph, RDFS
 from rdflib.util import guess_format
-from six import string_types
+from six import string_types, text_type
+from six.moves.urllib.parse import urljoin
+from six.moves.urllib.request import pathname2url
+from toposort import toposort_flatten
 
 from ontology_alchemy.builder import OntologyBuilder
+from ontology_alchemy.cache import CompiledOntologyCache
+from ontology_alchemy.hierarchy import HierarchyIndex
+from ontology_alchemy.ingestion import LINE_BASED_FORMATS, BatchStore, ingest, parse
+from ontology_alchemy.schema import in_namespace
+from ontology_alchemy.stats import phase
+
+
+# Predicates of the statements through which an ontology references the classes of other ontologies
+REFERENCE_PREDICATES = (RDFS.subClassOf, RDFS.subPropertyOf, RDFS.domain, RDFS.range)
 
 
 class Ontology(object):
 
-    def __init__(self, namespace, graph, base_uri=None, **kwargs):
+    def __init__(self, namespace, graph, base_uri=None, builder=None, imported_classes=None, **kwargs):
         """
         Initialize an ontology given a namespace.
         A namespace encapsulates the full hierarchy of types and inheritance relations
         described by the ontology.
 
+        :param builder - the `OntologyBuilder` of a lazily built namespace. If given, classes
+            are materialized by the builder on first access. Eager namespaces are not given their builder,
+            which is built again from the graph when changes are first applied (see `apply()`).
+        :param imported_classes - the Python classes of other ontologies the namespace was built with,
+            keyed by URI (see `OntologyBuilder`)
+
         """
         self.__dict__.update(namespace)
+        self.__builder__ = builder
         self.__graph__ = graph
-        self.__terms__ = list(namespace.keys())
+        self.__terms__ = list(builder.definitions.keys() if builder else namespace.keys())
         self.__uri__ = base_uri
+        self.__imported_classes__ = imported_classes
+        # Reachability index of the class hierarchy of eager namespaces, built on first use
+        self.__hierarchy__ = None
+
+    def __getattr__(self, name):
+        # Only invoked for attributes not set on the instance, i.e classes not materialized yet
+        builder = self.__dict__.get("__builder__")
+        if builder is None or name not in builder.definitions:
+            raise AttributeError("{} object has no attribute {}".format(self.__class__.__name__, name))
+
+        klass = builder.materialize(name)
+        setattr(self, name, klass)
+        return klass
 
     @classmethod
-    def load(cls, file_or_filename, format=None):
+    def load(cls, file_or_filename, format=None, cache_dir=None, lazy=False, processes=None, keep_graph=True,
+             stats=None):
         """
         Materialize ontology into Python class hierarchy from a given
         file-like object or a filename.
@@ -30,30 +67,476 @@ class Ontology(object):
         :param format - the format ontology is serialized in.
             For list of currently supported formats (based on RDFlib which is used under the hood)
             see: http://rdflib.readthedocs.io/en/565/plugin_parsers.html
+        :param cache_dir - directory of a persistent cache of compiled ontologies. If provided,
+            the ontology is built from its cached compiled form when available, skipping RDF parsing
+            altogether, and cached otherwise. Ontologies loaded from the cache have no graph.
+        :param lazy - if True, classes are only created when first accessed as attributes of the ontology,
+            along with their ancestors and the properties in their domain. This cuts the load time and
+            memory footprint of large ontologies of which only a few classes are used.
+        :param processes - if provided, files in a line-based format (N-Triples or N-Quads) are parsed in chunks
+            across this many processes, straight into the builder (see `ontology_alchemy.ingestion`), rather than
+            into a graph. Ontologies loaded this way have no graph.
+        :param keep_graph - if False, statements are added to the builder as they are parsed, only keeping those
+            needed to build the namespace, rather than parsed into a graph. This cuts the peak memory footprint
+            of loads by the size of the graph. Ontologies loaded this way have no graph.
+        :param stats - if provided, the `BuildStats` to collect statistics of the load into, e.g the time spent
+            in each phase (parsing, indexing statements, sorting the class hierarchy, creating classes, ...).
+            Statements are indexed as they are parsed when not parsed into a graph, so that both are timed
+            as parsing.
         :returns instance of the `Ontology` object which encompasses the ontology namespace
             for all created objects and types.
 
         """
-        graph = Graph()
         if isinstance(file_or_filename, string_types):
             # Load from given filename
             if not format:
                 format = guess_format(file_or_filename)
-            graph.parse(file_or_filename, format=format)
-        else:
+        elif not format:
             # Load from file-like buffer
-            if not format:
-                raise RuntimeError("Must supply format argument when not loading from a filename")
-            graph.parse(file_or_filename, format=format)
+            raise RuntimeError("Must supply format argument when not loading from a filename")
+
+        data = None
+        if cache_dir is not None:
+            data = cls._read(file_or_filename)
+
+        parse_in_chunks = (
+            processes and format in LINE_BASED_FORMATS and
+            isinstance(file_or_filename, string_types) and path.isfile(file_or_filename)
+        )
+        if data is None and parse_in_chunks:
+            builder = OntologyBuilder(None, stats=stats)
+            with phase(stats, "parse"):
+                ingest(file_or_filename, builder, format=format, processes=processes)
+            namespace = builder.build_namespace(lazy=lazy)
+
+            return cls._from_builder(builder, namespace, graph=None, lazy=lazy)
+
+        if data is None:
+            builder, graph = cls._parse(file_or_filename, format=format, keep_graph=keep_graph, stats=stats)
+            namespace = builder.build_namespace(lazy=lazy)
+
+            return cls._from_builder(builder, namespace, graph=graph, lazy=lazy)
+
+        # Relative URIs resolve against the location of the ontology, as when parsed from the file itself
+        public_id = cls._public_id(file_or_filename)
+        cache = CompiledOntologyCache(cache_dir)
+        key = cache.key(data, format=format, public_id=public_id)
+        compiled = cache.get(key)
+        if compiled is not None:
+            builder = OntologyBuilder(None, base_uri=compiled["base_uri"], stats=stats)
+            namespace = builder.build_namespace(compiled, lazy=lazy)
+
+            return cls._from_builder(builder, namespace, graph=None, lazy=lazy)
+
+        builder, graph = cls._parse(
+            data=data, format=format, public_id=public_id, keep_graph=keep_graph, stats=stats,
+        )
+        compiled = builder.compile()
+        cache.set(key, compiled)
+        namespace = builder.build_namespace(compiled, lazy=lazy)
+
+        return cls._from_builder(builder, namespace, graph=graph, lazy=lazy)
+
+    @classmethod
+    def load_many(cls, filenames, format=None, lazy=False, processes=None, keep_graph=True):
+        """
+        Materialize several ontologies which reference (e.g import) each other into Python class hierarchies.
+
+        Files are parsed in parallel across a pool of processes, and their graphs merged by base URI, so that
+        an ontology split across several files is built as one. Ontologies are then built in order of dependency,
+        each only once, and references to the classes of other ontologies (e.g as base classes, or in the domain
+        or range of properties) resolve to their Python classes rather than to builtin types. Ontologies which
+        reference each other are built in two passes, see `OntologyBuilder.import_classes()`.
+
+        >>> ontologies = Ontology.load_many(["core.ttl", "organizations.ttl", "people.ttl"])
+        >>> organizations = ontologies["http://example.com/organizations#"]
+        >>> core = ontologies["http://example.com/core#"]
+        >>> issubclass(organizations.Corporation, core.Agent)
+        True
+
+        :param filenames - local filesystem paths to the files containing the ontology definitions
+        :param format - the format all ontologies are serialized in. If not provided, it is guessed for each file.
+        :param lazy - if True, classes are only created when first accessed, see `load()`
+        :param processes - the number of processes to parse files with. Defaults to the number of CPUs.
+            Files are parsed in the current process if 1, or if there is a single file.
+        :param keep_graph - if False, only the statements needed to build the namespaces are sent back by the
+            processes parsing files, rather than whole graphs, which cuts the time spent receiving them.
+            Ontologies loaded this way have no graph.
+        :returns {OrderedDict} the `Ontology` objects keyed by base URI, in order of dependency
+
+        """
+        sources = [(filename, format, keep_graph) for filename in filenames]
+        if processes == 1 or len(sources) < 2:
+            parsed = [_parse_ontology(source) for source in sources]
+        else:
+            pool = Pool(processes)
+            try:
+                parsed = pool.map(_parse_ontology, sources)
+            finally:
+                pool.close()
+                pool.join()
+
+        # Graphs (or batches of statements) of the ontologies, merged by base URI
+        graphs = OrderedDict()
+        for base_uri, graph in parsed:
+            if base_uri not in graphs:
+                graphs[base_uri] = graph
+            elif keep_graph:
+                graphs[base_uri] += graph
+            else:
+                for predicate, pairs in graph.items():
+                    graphs[base_uri].setdefault(predicate, []).extend(pairs)
+
+        references = dict(
+            (base_uri, _referenced_classes(graph, base_uri, graphs))
+            for base_uri, graph in graphs.items()
+        )
+        ontologies = OrderedDict()
+        for component in _dependency_components(
+            dict((base_uri, set(referenced)) for base_uri, referenced in references.items())
+        ):
+            # Ontologies which reference each other are built in two passes: first with the classes of the ontologies
+            # they depend on outside of the component, and then updated in place with the classes of each other
+            builders = OrderedDict()
+            for base_uri in component:
+                imported_classes = cls._imported_classes(references[base_uri], ontologies, exclude=component)
+                graph = graphs[base_uri] if keep_graph else None
+                builder = builders[base_uri] = OntologyBuilder(
+                    graph if keep_graph else _batch_statements(graphs[base_uri]),
+                    base_uri=base_uri,
+                    imported_classes=imported_classes,
+                )
+                namespace = builder.build_namespace(lazy=lazy)
+                ontologies[base_uri] = cls._from_builder(builder, namespace, graph=graph, lazy=lazy)
+
+            if len(component) > 1:
+                for base_uri, builder in builders.items():
+                    builder.import_classes(cls._imported_classes(
+                        dict(
+                            (dependency, class_uris)
+                            for dependency, class_uris in references[base_uri].items()
+                            if dependency in component
+                        ),
+                        ontologies,
+                    ))
+
+        return ontologies
+
+    @classmethod
+    def _imported_classes(cls, references, ontologies, exclude=()):
+        """
+        Look up the classes of other ontologies that an ontology references.
 
-        builder = OntologyBuilder(graph)
-        namespace = builder.build_namespace()
+        :param references - the URIs of the referenced classes, keyed by the base URI of the ontology they belong to
+        :param ontologies - the `Ontology` objects built so far, keyed by base URI
+        :param exclude - the base URIs of the ontologies not to look up classes of
+        :returns {dict} the Python classes, keyed by URI
+
+        """
+        imported_classes = {}
+        for dependency, class_uris in references.items():
+            if dependency in exclude:
+                continue
+            dependency_ontology = ontologies[dependency]
+            terms = set(dependency_ontology.__terms__)
+            for class_uri in class_uris:
+                name = str(class_uri.replace(dependency, ""))
+                if name in terms:
+                    imported_classes[text_type(class_uri)] = getattr(dependency_ontology, name)
+
+        return imported_classes
+
+    @classmethod
+    def _from_builder(cls, builder, namespace, graph, lazy=False):
+        return cls(
+            namespace,
+            graph=graph,
+            base_uri=builder.base_uri,
+            builder=builder if lazy else None,
+            imported_classes=builder.imported_classes,
+        )
+
+    @classmethod
+    def _parse(cls, source=None, data=None, format=None, public_id=None, keep_graph=True, stats=None):
+        """
+        Parse an ontology, into a graph or straight into its builder.
+
+        :returns {tuple} the `OntologyBuilder` of the ontology, and its graph (None if not kept)
+
+        """
+        if not keep_graph:
+            builder = OntologyBuilder(None, stats=stats)
+            with phase(stats, "parse"):
+                parse(builder, source, format=format, data=data, public_id=public_id)
+            return builder, None
+
+        graph = Graph()
+        with phase(stats, "parse"):
+            graph.parse(source, format=format, data=data, publicID=public_id)
+
+        return OntologyBuilder(graph, stats=stats), graph
+
+    @classmethod
+    def _read(cls, file_or_filename):
+        """
+        Read the raw content of an ontology definition.
+
+        :returns {bytes} the content, or None for remote (non-local) resources
+
+        """
+        if isinstance(file_or_filename, string_types):
+            if not path.isfile(file_or_filename):
+                return None
+            with open(file_or_filename, "rb") as ontology_file:
+                return ontology_file.read()
+
+        data = file_or_filename.read()
+        if isinstance(data, text_type):
+            data = data.encode("utf-8")
+
+        return data
+
+    @classmethod
+    def _public_id(cls, file_or_filename):
+        """
+        Compute the base URI rdflib resolves the relative URIs of an ontology definition against
+        when parsing it from a file.
+
+        :returns {str} the base URI, or None for file-like objects without a name
+
+        """
+        if isinstance(file_or_filename, string_types):
+            return urljoin("file:", pathname2url(path.abspath(file_or_filename)))
+
+        name = getattr(file_or_filename, "name", None)
+        return name if isinstance(name, string_types) else None
+
+    def apply(self, added=(), removed=()):
+        """
+        Apply changes (e.g a patch) to the statements of the ontology, updating its class hierarchy in place
+        rather than loading it again.
 
-        return cls(namespace, graph=graph, base_uri=builder.base_uri)
+        Only the classes affected by the changes are built again, see `OntologyBuilder.apply()`. The builder of
+        eager namespaces is built again from the graph when changes are first applied, and then kept.
+
+        >>> ontology.apply(
+        ...     added=[(EX.Startup, RDF.type, RDFS.Class), (EX.Startup, RDFS.subClassOf, EX.Corporation)],
+        ...     removed=[(EX.Partnership, RDF.type, RDFS.Class)],
+        ... )
+
+        :param added - iterable over the (subject, predicate, object) statements to add
+        :param removed - iterable over the (subject, predicate, object) statements to remove
+
+        """
+        if self.__graph__ is None:
+            raise RuntimeError("Ontology was built without its graph, e.g from a compiled ontology cache")
+
+        builder = self.__builder__
+        if builder is None:
+            builder = OntologyBuilder(self.__graph__, base_uri=self.__uri__, imported_classes=self.__imported_classes__)
+            builder.index_namespace(dict((name, getattr(self, name)) for name in self.__terms__))
+            self.__builder__ = builder
+            self.__hierarchy__ = None
+
+        added_names, updated_names, removed_names = builder.apply(added, removed)
+        for name in removed_names:
+            self.__dict__.pop(name, None)
+        for name in added_names + updated_names:
+            if name in builder.namespace:
+                setattr(self, name, builder.namespace[name])
+
+        self.__terms__ = list(builder.definitions.keys())
+
+    def is_subclass(self, cls, base):
+        """
+        Check whether a class of the ontology descends from another (or is the same class), using the reachability
+        index of the class hierarchy (see `OntologyBuilder.hierarchy()`) rather than walking the hierarchy.
+
+        Classes which are not part of the ontology (e.g imported or builtin classes) are checked with `issubclass()`.
+
+        :param cls - the class
+        :param base - the other class
+        :returns {bool} whether the class is a sub-class of the other class
+
+        """
+        name, base_name = getattr(cls, "__name__", None), getattr(base, "__name__", None)
+        if not self._is_ontology_class(name, cls) or not self._is_ontology_class(base_name, base):
+            return issubclass(cls, base)
+
+        return self._hierarchy().is_subclass(name, base_name)
+
+    def ancestors(self, cls):
+        """
+        Return all (direct and indirect) base classes of a class of the ontology, nearest first.
+        Base classes which are not part of the ontology (e.g imported or builtin classes) are not included.
+
+        :param cls - the class
+        :returns {list} the base classes
+
+        """
+        return [getattr(self, name) for name in self._hierarchy().ancestors(self._hierarchy_name(cls))]
+
+    def descendants(self, cls):
+        """
+        Return all (direct and indirect) sub-classes of a class of the ontology, read off the reachability
+        index of the class hierarchy (see `OntologyBuilder.hierarchy()`).
+
+        :param cls - the class
+        :returns {list} the sub-classes
+
+        """
+        return [getattr(self, name) for name in self._hierarchy().descendants(self._hierarchy_name(cls))]
+
+    def _hierarchy_name(self, cls):
+        """
+        :returns {str} the name of a class of the ontology
+
+        """
+        name = getattr(cls, "__name__", None)
+        if not self._is_ontology_class(name, cls):
+            raise ValueError("{} is not a class of the ontology {}".format(cls, self.__uri__))
+
+        return name
+
+    def _is_ontology_class(self, name, cls):
+        """
+        :returns {bool} whether a class is the (materialized) class of the ontology with the given name
+
+        """
+        builder = self.__builder__
+        # The namespace of builders only holds the (materialized) classes of the ontology, which are also attributes
+        # of eager ontologies
+        namespace = builder.namespace if builder is not None else self.__dict__
+
+        return namespace.get(name) is cls
+
+    def _hierarchy(self):
+        """
+        Return the reachability index of the class hierarchy, see `OntologyBuilder.hierarchy()`. Without a builder
+        (i.e for eager namespaces), the index is built from the bases of the Python classes.
+
+        :returns {HierarchyIndex} the index, keyed by class name
+
+        """
+        if self.__builder__ is not None:
+            return self.__builder__.hierarchy()
+
+        if self.__hierarchy__ is None:
+            # Classes are listed in topological order of inheritance, as in the namespace
+            self.__hierarchy__ = HierarchyIndex(OrderedDict(
+                (name, [base.__name__ for base in klass.__bases__ if self._is_ontology_class(base.__name__, base)])
+                for name, klass in ((name, self.__dict__[name]) for name in self.__terms__)
+            ))
+
+        return self.__hierarchy__
 
     def rdf_statements(self):
         """
         Return a generator expression iterating over all RDF statements encompassed in the ontology graph.
 
         """
+        if self.__graph__ is None:
+            raise RuntimeError("Ontology was built without its graph, e.g from a compiled ontology cache")
+
         return self.__graph__.triples((None, None, None))
+
+
+def _parse_ontology(source):
+    """
+    Parse an ontology file, e.g in a worker process of `Ontology.load_many()`.
+
+    The graph is returned as a whole, its store being pickled along with its indexes. Unpickling a large graph
+    costs about as much as parsing it though, so that unless the graph is kept, the file is instead parsed without
+    building a graph, into a compact batch of the statements needed to build the namespace (see `BatchStore`).
+
+    :param source - the (filename, format, keep_graph) of the file
+    :returns {tuple} the inferred base URI of the ontology, and its graph, or its batch of (subject, object) pairs
+        keyed by predicate
+
+    """
+    filename, format, keep_graph = source
+    format = format or guess_format(filename)
+    if keep_graph:
+        graph = Graph()
+        graph.parse(filename, format=format)
+        return text_type(OntologyBuilder(graph).base_uri), graph
+
+    builder = OntologyBuilder(None)
+    store = BatchStore(builder)
+    Graph(store=store).parse(filename, format=format)
+    # The base URI is inferred from the statements, along with the namespaces the file declares
+    builder.add_statements(_batch_statements(store.batch))
+
+    return text_type(builder.compile()["base_uri"]), store.batch
+
+
+def _batch_statements(batch):
+    """
+    :param batch - (subject, object) pairs keyed by predicate, see `_parse_ontology()`
+    :returns {generator} the (subject, predicate, object) statements of a batch
+
+    """
+    return ((s, predicate, o) for predicate, pairs in batch.items() for s, o in pairs)
+
+
+def _dependency_components(dependencies):
+    """
+    Group ontologies into the strongly connected components of their dependencies, i.e sets of ontologies which
+    (directly or indirectly) reference each other.
+
+    :param dependencies - the base URIs of the ontologies each ontology references, keyed by base URI
+    :returns {list} the components, as sorted tuples of base URIs, in order of dependency
+
+    """
+    reachable = {}
+    for base_uri, referenced in dependencies.items():
+        reached = set()
+        stack = list(referenced)
+        while stack:
+            dependency = stack.pop()
+            if dependency not in reached:
+                reached.add(dependency)
+                stack.extend(dependencies.get(dependency, ()))
+        reachable[base_uri] = reached
+
+    components = dict(
+        (base_uri, tuple(sorted(
+            set([base_uri]).union(dependency for dependency in reached if base_uri in reachable.get(dependency, ()))
+        )))
+        for base_uri, reached in reachable.items()
+    )
+
+    component_dependencies = {}
+    for base_uri, referenced in dependencies.items():
+        component = components[base_uri]
+        component_dependencies.setdefault(component, set()).update(
+            components[dependency] for dependency in referenced if components[dependency] != component
+        )
+
+    return toposort_flatten(component_dependencies, sort=True)
+
+
+def _referenced_classes(graph, base_uri, graphs):
+    """
+    Find the classes of other ontologies that an ontology references.
+
+    :param graph - the graph of the ontology, or its batch of statements (see `_parse_ontology()`)
+    :param base_uri - the base URI of the ontology
+    :param graphs - the graphs (or batches) of all ontologies, keyed by base URI
+    :returns {dict} the URIs of the referenced classes, keyed by the base URI of the ontology they belong to
+
+    """
+    # Longer base URIs first, so that the most specific namespace a URI is part of is found
+    base_uris = sorted(graphs, key=len, reverse=True)
+    referenced = {}
+    for predicate in REFERENCE_PREDICATES:
+        if isinstance(graph, Graph):
+            class_uris = set(graph.objects(None, predicate))
+        else:
+            class_uris = set(o for s, o in graph.get(predicate, ()))
+        for class_uri in class_uris:
+            dependency = next((uri for uri in base_uris if in_namespace(class_uri, base_uri=uri)), None)
+            if dependency is not None and dependency != base_uri:
+                referenced.setdefault(dependency, set()).add(class_uri)
+
+    return referenced
@@ -1,4 +1,6 @@
 """Proxy objects."""
+from itertools import count
+
 from rdflib import Literal
 from six import string_types, text_type
 
@@ -12,13 +14,16 @@ class PropertyProxy(object):
     of domain and range.
 
     """
+    __slots__ = ("name", "uri", "values", "domain", "range", "validator")
 
-    def __init__(self, name=None, uri=None, values=None, domain=None, range=None):
+    def __init__(self, name=None, uri=None, values=None, domain=None, range=None, validator=None):
         self.name = name
         self.uri = uri
         self.values = values or []
         self.domain = domain or []
-        self.range = range or []
+        # Kept as is when empty as well, as copies share the range validator, see `is_valid()`
+        self.range = range if range is not None else []
+        self.validator = validator
 
     def __str__(self):
         return "<PropertyProxy name={}, uri={}, domain={}, range={}, values={}>".format(
@@ -33,10 +38,7 @@ class PropertyProxy(object):
         return value in self.values
 
     def __iadd__(self, value):
-        if not self.is_valid(value):
-            raise ValueError("{}({}): Invalid assigment. property value must be one of range={}, but got: {}"
-                             .format(self.__class__.__name__, self.name, self.range, value))
-
+        self.validate(value)
         self.add_instance(value)
         return self
 
@@ -49,25 +51,278 @@ class PropertyProxy(object):
             # For exclusively literal-valued properties
             cls = LiteralPropertyProxy
 
-        return cls(
+        property_proxy = cls(
             name=property_cls.__name__,
             uri=property_cls.__uri__,
             domain=property_cls.domain,
             range=property_cls.inferred_range(),
         )
+        property_proxy.validator = property_proxy.compile_validator()
+
+        return property_proxy
 
     def add_instance(self, value):
         self.values.append(value)
 
+    def convert(self, value):
+        """
+        Convert a value assigned to the property to the value stored by the proxy (e.g an RDF literal).
+
+        :param value - the (valid) value
+        :returns the value to store
+
+        """
+        return value
+
+    def empty_copy(self):
+        """
+        Return a new proxy for the same property, with no values.
+
+        """
+        # Positional arguments are noticeably faster, as a copy is made for every property of every instance.
+        # The range validator is shared with the copy, so that it is only compiled once per property.
+        return self.__class__(self.name, self.uri, None, self.domain, self.range, self.validator)
+
+    def compile_validator(self):
+        """
+        Compile the range of the property into a validator.
+
+        :returns {RangeValidator} the validator
+
+        """
+        return RangeValidator(self.range, tuple(self.range))
+
+    def validate(self, value):
+        """
+        Check that a value can be assigned to the property.
+
+        :param value - the value
+        :raises ValueError if the value is not valid, see `is_valid()`
+
+        """
+        if not self.is_valid(value):
+            raise ValueError("{}({}): Invalid assigment. property value must be one of range={}, but got: {}"
+                             .format(self.__class__.__name__, self.name, self.range, value))
+
     def is_valid(self, value):
-        if not self.range or any(
-            isinstance(value, range_resource)
-            for range_resource in self.range
-        ):
+        validator = self.validator
+        if validator is None or validator.range is not self.range or validator.size != len(self.range):
+            # Compiled again whenever the range changes
+            validator = self.validator = self.compile_validator()
+
+        # Looking up cached results first saves a method call on hot assignment paths
+        result = validator.results.get(value.__class__)
+        if result is None:
+            result = validator.is_valid(value)
+
+        return result
+
+
+class VersionedList(list):
+    """
+    A list which changes version whenever it is modified in place, so that values derived from its items
+    can be memoized along with its version.
+
+    """
+    __slots__ = ("version",)
+
+    # Versions are issued by a counter, which is thread-safe, and unique across all lists
+    versions = count(1)
+
+    def __init__(self, *args):
+        super(VersionedList, self).__init__(*args)
+        self.version = next(VersionedList.versions)
+
+    def changed(self):
+        """
+        Change the version of the list, called whenever it is modified.
+
+        """
+        self.version = next(VersionedList.versions)
+
+    def __reduce__(self):
+        return self.__class__, (list(self),)
+
+    def __setitem__(self, index, value):
+        super(VersionedList, self).__setitem__(index, value)
+        self.changed()
+
+    def __delitem__(self, index):
+        super(VersionedList, self).__delitem__(index)
+        self.changed()
+
+    def __setslice__(self, start, stop, values):  # Python 2
+        super(VersionedList, self).__setslice__(start, stop, values)
+        self.changed()
+
+    def __delslice__(self, start, stop):  # Python 2
+        super(VersionedList, self).__delslice__(start, stop)
+        self.changed()
+
+    def __iadd__(self, values):
+        result = super(VersionedList, self).__iadd__(values)
+        self.changed()
+        return result
+
+    def __imul__(self, times):
+        result = super(VersionedList, self).__imul__(times)
+        self.changed()
+        return result
+
+    def append(self, value):
+        super(VersionedList, self).append(value)
+        self.changed()
+
+    def extend(self, values):
+        super(VersionedList, self).extend(values)
+        self.changed()
+
+    def insert(self, index, value):
+        super(VersionedList, self).insert(index, value)
+        self.changed()
+
+    def remove(self, value):
+        super(VersionedList, self).remove(value)
+        self.changed()
+
+    def pop(self, *args):
+        value = super(VersionedList, self).pop(*args)
+        self.changed()
+        return value
+
+    def clear(self):
+        del self[:]
+
+    def sort(self, *args, **kwargs):
+        super(VersionedList, self).sort(*args, **kwargs)
+        self.changed()
+
+    def reverse(self):
+        super(VersionedList, self).reverse()
+        self.changed()
+
+
+class SchemaValues(VersionedList):
+    """
+    The values of a schema property proxy, which invalidates the proxy whenever they are modified in place
+    (e.g `ontology.hasEmployee.range.values.append(...)`), see `SchemaPropertyProxy`.
+
+    """
+    __slots__ = ("proxy",)
+
+    def __init__(self, proxy, values=()):
+        self.proxy = None
+        super(SchemaValues, self).__init__(values)
+        self.proxy = proxy
+
+    def changed(self):
+        super(SchemaValues, self).changed()
+        if self.proxy is not None:
+            self.proxy.invalidate()
+
+    def __reduce__(self):
+        # Pickled (or copied) as plain lists, as the proxy is not part of the values
+        return list, (list(self),)
+
+
+class SchemaPropertyProxy(PropertyProxy):
+    """
+    A proxy class for the properties from which the inferred domain and range of property classes
+    are derived (i.e RDFS.domain and RDFS.range).
+
+    Each proxy has a version, changed whenever its values change, whether assigned through it or modified in place
+    (see `SchemaValues`), so that property classes can memoize their inferred domain and range
+    (see `RDF_Property.inferred_domain()`) along with the versions of the proxies they are derived from. `latest` is
+    the last version issued to any proxy: memoized values are only checked against the versions they depend on after
+    it changes.
+
+    """
+    __slots__ = ("version", "_values")
+
+    # Versions are issued by a counter, which is thread-safe, and unique across all proxies
+    versions = count(1)
+    latest = 0
+
+    def __init__(self, *args, **kwargs):
+        super(SchemaPropertyProxy, self).__init__(*args, **kwargs)
+        self.version = 0
+
+    @property
+    def values(self):
+        return self._values
+
+    @values.setter
+    def values(self, values):
+        assigned = getattr(self, "_values", None) is not None
+        self._values = SchemaValues(self, values)
+        if assigned:
+            # Values memoized from the replaced values are stale
+            self.invalidate()
+
+    def invalidate(self):
+        """
+        Change the version of the proxy, so that the values memoized from it are computed again.
+
+        """
+        self.version = SchemaPropertyProxy.latest = next(SchemaPropertyProxy.versions)
+
+
+class SchemaMemo(object):
+    """
+    Values derived from the values of schema property proxies (e.g the inferred range of a property class), along
+    with the version of the proxy and the memos they are derived from.
+
+    Memos are current as long as none of the proxies they are (directly or indirectly) derived from changed,
+    which is only checked again after a new version is issued to any proxy.
+
+    """
+    __slots__ = ("latest", "proxy", "version", "dependencies", "values")
+
+    def __init__(self, latest, proxy, dependencies, values):
+        """
+        :param latest - the latest version issued to any proxy, as of before the values were derived
+        :param proxy - the proxy the values are derived from, if any
+        :param dependencies - the memos the values are derived from
+        :param values - the values
+
+        """
+        self.proxy = proxy
+        # Proxies which are not versioned (e.g assigned by hand) may change without notice, and are never trusted
+        self.version = getattr(proxy, "version", None) if proxy is not None else 0
+        trusted = self.version is not None and all(dependency.latest is not None for dependency in dependencies)
+        self.latest = latest if trusted else None
+        self.dependencies = dependencies
+        self.values = values
+
+    def is_current(self):
+        """
+        :returns {bool} whether none of the proxies the values are derived from changed since they were derived
+
+        """
+        latest = SchemaPropertyProxy.latest
+        if self.latest == latest:
             return True
 
+        checked = {}
+        stack = [self]
+        while stack:
+            memo = stack.pop()
+            if memo.latest == latest or id(memo) in checked:
+                continue
+            if memo.version is None or (memo.proxy is not None and memo.proxy.version != memo.version):
+                return False
+            checked[id(memo)] = memo
+            stack.extend(memo.dependencies)
+
+        for memo in checked.values():
+            memo.latest = latest
+
+        return True
+
 
 class LiteralPropertyProxy(PropertyProxy):
+    __slots__ = ()
+
     def __call__(self, lang=None):
         if lang:
             return [
@@ -79,13 +334,48 @@ class LiteralPropertyProxy(PropertyProxy):
             return self.values
 
     def add_instance(self, value):
-        if not isinstance(value, Literal):
-            if isinstance(value, string_types):
-                # if is a textual string, enforce assigning a language tag
-                value = Literal(value, lang=DEFAULT_LANGUAGE_TAG)
+        self.values.append(self.convert(value))
 
-        self.values.append(value)
+    def convert(self, value):
+        # Checking string types first avoids the much slower `isinstance()` check against (abstract) rdflib types
+        # for other values
+        if isinstance(value, string_types) and not isinstance(value, Literal):
+            # if is a textual string, enforce assigning a language tag
+            value = Literal(value, lang=DEFAULT_LANGUAGE_TAG)
+
+        return value
+
+    def compile_validator(self):
+        return RangeValidator(self.range, LITERAL_PRIMITIVE_TYPES)
+
+
+class RangeValidator(object):
+    """
+    Checks whether values can be assigned to a property, i.e are instances of any of the types in its range.
+
+    The range is collapsed into a tuple of types, checked with a single `isinstance()` call, and as the validity
+    of a value only depends on its type, the result is cached per type (of which there are very few for a given
+    property), so that validating a value is usually a single dict lookup.
+
+    """
+    __slots__ = ("range", "size", "types", "results")
+
+    def __init__(self, range, types):
+        """
+        :param range - the range the validator is compiled from
+        :param types - the valid types. If empty, any value is valid.
+
+        """
+        self.range = range
+        self.size = len(range)
+        self.types = types
+        self.results = {}
 
     def is_valid(self, value):
-        if isinstance(value, LITERAL_PRIMITIVE_TYPES):
-            return True
+        # `__class__` rather than `type()`, which `isinstance()` checks as well (e.g for columnar instance views)
+        value_type = value.__class__
+        result = self.results.get(value_type)
+        if result is None:
+            result = self.results[value_type] = not self.types or isinstance(value, self.types)
+
+        return result
@@ -0,0 +1,412 @@
+"""Forward-chaining entailment of the statements of ontology class instances."""
+from collections import defaultdict
+from weakref import WeakKeyDictionary
+
+from rdflib import OWL, RDF, URIRef
+from six import iteritems
+
+from ontology_alchemy.base import RDF_Property, RDFS_Class
+from ontology_alchemy.proxy import PropertyProxy
+from ontology_alchemy.serialization import to_term
+from ontology_alchemy.session import Session
+
+
+class PropertyRule(object):
+    """
+    The entailment rules of a property, as compiled from its property class.
+
+    """
+    __slots__ = ("symmetric", "transitive", "super_properties", "inverses", "domain", "range")
+
+    def __init__(self, property_class, inverses):
+        """
+        :param property_class - the property class
+        :param inverses - the URIs of the inverse properties of the property
+
+        """
+        characteristics = property_class.__dict__.get("__characteristics__", ())
+        self.symmetric = OWL.SymmetricProperty in characteristics
+        self.transitive = OWL.TransitiveProperty in characteristics
+        self.super_properties = tuple(
+            URIRef(base.__uri__)
+            for base in property_class.__bases__
+            if issubclass(base, RDF_Property) and base.__uri__ is not None
+        )
+        self.inverses = tuple(inverses)
+        self.domain = _ontology_classes(property_class.domain.values)
+        self.range = _ontology_classes(property_class.range.values)
+
+    def __eq__(self, other):
+        return isinstance(other, PropertyRule) and all(
+            getattr(self, name) == getattr(other, name)
+            for name in PropertyRule.__slots__
+        )
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+
+class Reasoner(object):
+    """
+    Materializes the statements entailed by the statements of the instances of a session (i.e the values
+    of their properties), under the RDFS and OWL semantics of the properties of the ontology:
+
+    - sub-properties (rdfs:subPropertyOf): values of a property are values of its super-properties
+    - symmetric properties (owl:SymmetricProperty): `a p b` entails `b p a`
+    - transitive properties (owl:TransitiveProperty): `a p b` and `b p c` entail `a p c`
+    - inverse properties (owl:inverseOf): `a p b` entails `b q a`, for `p` and `q` inverses of each other
+    - domain and range (rdfs:domain, rdfs:range): subjects (and objects) of statements are instances
+      of the classes in the domain (and range) of their property, and thereby of their base classes
+
+    Entailment is semi-naive: statements are indexed by predicate and subject (and by object for transitive
+    properties), and each round only joins the statements derived in the previous round (the delta) with the
+    indexed statements, until no new statement is derived. Running the reasoner again, e.g after instances are
+    created or assigned new values, only reads the values added to the properties of instances since the last run
+    (instances are still visited, unless given), and only joins their statements.
+
+    The rules of properties are compiled from the property classes of the classes of the instances (along with
+    their super-properties and inverses), and of the classes registered in the session. Whenever new property
+    classes are found, or registered classes change, rules are compiled again, and the statements already indexed
+    for the properties whose rules changed are entailed again.
+
+    >>> reasoner = Reasoner()
+    >>> reasoner.run()
+    >>> reasoner.objects(alice, ontology.hasAncestor)
+    [<Person uri=...bob>, <Person uri=...carol>]
+    >>> reasoner.materialize()
+    >>> alice.hasAncestor.values
+    [<Person uri=...bob>, <Person uri=...carol>]
+
+    """
+
+    def __init__(self, session=None):
+        """
+        :param session - the session of the instances to reason over. Defaults to the current session.
+
+        """
+        self.session = session or Session.get_current()
+        # Objects of the asserted and entailed statements, keyed by predicate and subject
+        self.statements = defaultdict(lambda: defaultdict(set))
+        # Subjects of the statements of transitive properties, keyed by predicate and object
+        self.subjects = defaultdict(lambda: defaultdict(set))
+        # Entailed types of resources, keyed by URI
+        self.inferred_types = defaultdict(set)
+        # Entailed (subject, predicate, object) statements, including types, in order of entailment
+        self.inferred = []
+
+        # Property classes, keyed by URI
+        self._property_classes = {}
+        self._rules = {}
+        # Properties of the classes the property classes were found from, keyed by class, see `_find_property_classes()`
+        self._indexed_classes = {}
+        self._class_version = None
+        self._num_materialized = 0
+        # Values of the instances read so far, keyed by instance and property name, see `_asserted_statements()`
+        self._indexed_values = WeakKeyDictionary()
+
+    def run(self, instances=None):
+        """
+        Entail all statements following from the statements of the given instances,
+        along with the statements already known to the reasoner.
+
+        :param instances - the instances whose statements are added. Defaults to all instances of the session.
+        :returns {int} the number of statements entailed
+
+        """
+        if instances is None:
+            instances = list(self.session.instances)
+        changed_predicates = self._index_property_classes(instances)
+
+        num_inferred = len(self.inferred)
+        delta = [statement for statement in self._asserted_statements(instances) if self._add(*statement)]
+        # Statements indexed beforehand are entailed again under the rules which changed
+        delta.extend(
+            (s, p, o)
+            for p in changed_predicates
+            for s, objects in list(self.statements.get(p, {}).items())
+            for o in list(objects)
+        )
+        while delta:
+            entailed = []
+            for s, p, o in delta:
+                for statement in self._entail(s, p, o):
+                    if self._add(*statement):
+                        self.inferred.append(statement)
+                        entailed.append(statement)
+            delta = entailed
+
+        return len(self.inferred) - num_inferred
+
+    def objects(self, instance, property_class):
+        """
+        Return the values of a property of an instance, asserted or entailed.
+
+        :param instance - the instance
+        :param property_class - the property class
+        :returns {list} the values, as instances for the resources registered in the session, or as RDF terms
+
+        """
+        objects = self.statements[URIRef(property_class.__uri__)].get(URIRef(instance.uri), ())
+        return [self.session.get(o, o) if isinstance(o, URIRef) else o for o in objects]
+
+    def types(self, instance):
+        """
+        Return the types of an instance: its class, along with the classes it is entailed to be an instance of.
+
+        :param instance - the instance
+        :returns {list} the classes
+
+        """
+        return [instance.__class__] + sorted(
+            self.inferred_types.get(URIRef(instance.uri), ()),
+            key=lambda klass: klass.__uri__,
+        )
+
+    def is_instance(self, instance, klass):
+        """
+        Check whether an instance is an instance of a class, or is entailed to be.
+
+        :param instance - the instance
+        :param klass - the class
+        :returns {bool} whether the instance is an instance of the class
+
+        """
+        return any(issubclass(type_, klass) for type_ in self.types(instance))
+
+    def inferred_statements(self):
+        """
+        Return an iterable over the entailed (subject, predicate, object) statements, as RDF terms,
+        e.g to serialize them with `ontology_alchemy.serialization.serialize_statements()`.
+
+        """
+        return iter(self.inferred)
+
+    def materialize(self):
+        """
+        Add the values entailed since the last call to the properties of the instances of the session.
+
+        Values are only added to properties which are part of the schema of the instances (see
+        `RDFS_Class._property_schema()`) and whose range they are valid for. Entailed types are not
+        materialized, as the class of instances cannot change, see `types()`.
+
+        :returns {int} the number of values added
+
+        """
+        num_added = 0
+        for s, p, o in self.inferred[self._num_materialized:]:
+            if p == RDF.type:
+                continue
+            instance = self.session.get(s)
+            if instance is None:
+                continue
+            name = self._property_classes[p].__name__
+            if name not in instance.__class__._property_schema():
+                continue
+
+            value = self.session.get(o, o) if isinstance(o, URIRef) else o
+            property_proxy = getattr(instance, name)
+            if property_proxy.is_valid(value):
+                property_proxy.add_instance(value)
+                num_added += 1
+        self._num_materialized = len(self.inferred)
+
+        return num_added
+
+    def _index_property_classes(self, instances):
+        """
+        Index the property classes of the classes of the given instances, and of the classes registered
+        in the session, by URI, and compile their rules, whenever property classes are found or registered classes
+        changed since the last run.
+
+        :param instances - the instances
+        :returns {set} the URIs of the properties whose rules changed
+
+        """
+        classes = set(instance.__class__ for instance in instances)
+        class_version = self.session.class_version
+        if class_version != self._class_version:
+            self._class_version = class_version
+            classes.update(self.session.classes)
+
+        if not self._find_property_classes(classes):
+            return set()
+
+        # Inverse properties are inverses of each other, whichever declares it
+        inverses = defaultdict(set)
+        for uri, property_class in iteritems(self._property_classes):
+            for inverse_class in property_class.inverseOf.values:
+                if getattr(inverse_class, "__uri__", None) is not None:
+                    inverses[uri].add(URIRef(inverse_class.__uri__))
+                    inverses[URIRef(inverse_class.__uri__)].add(uri)
+
+        rules = dict(
+            (uri, PropertyRule(property_class, sorted(inverses.get(uri, ()))))
+            for uri, property_class in iteritems(self._property_classes)
+        )
+        changed_predicates = set(uri for uri, rule in iteritems(rules) if self._rules.get(uri) != rule)
+        self._rules = rules
+        for p in changed_predicates:
+            # Subjects are only indexed by object for transitive properties, see `_add()`
+            if rules[p].transitive and p not in self.subjects:
+                for s, objects in iteritems(self.statements.get(p, {})):
+                    for o in objects:
+                        self.subjects[p][o].add(s)
+
+        return changed_predicates
+
+    def _find_property_classes(self, classes):
+        """
+        Find the property classes of the given classes (or the classes themselves, for property classes) which are
+        not indexed yet, along with their super-properties and inverses. Inverses declared by the other property
+        are found among the properties of the classes in the range of the property.
+
+        :param classes - the classes
+        :returns {bool} whether any property class was found
+
+        """
+        stack = []
+        for klass in classes:
+            if not isinstance(klass, type) or not issubclass(klass, RDFS_Class):
+                continue
+            if issubclass(klass, RDF_Property):
+                stack.append(klass)
+                continue
+            properties = klass.__properties__
+            indexed = self._indexed_classes.get(klass)
+            if indexed is None or indexed[0] is not properties or indexed[1] != properties.version:
+                stack.extend(properties)
+                # Read once the properties are iterated over, as lazily built namespaces only resolve them then
+                self._indexed_classes[klass] = (properties, properties.version)
+
+        found = False
+        while stack:
+            property_class = stack.pop()
+            if getattr(property_class, "__uri__", None) is None:
+                continue
+            uri = URIRef(property_class.__uri__)
+            if self._property_classes.get(uri) is property_class:
+                continue
+
+            self._property_classes[uri] = property_class
+            found = True
+            stack.extend(
+                base
+                for base in property_class.__mro__[1:]
+                if isinstance(base, type) and issubclass(base, RDF_Property)
+            )
+            stack.extend(value for value in property_class.inverseOf.values if isinstance(value, type))
+            for range_class in _ontology_classes(property_class.range.values):
+                stack.extend(
+                    other_class
+                    for other_class in range_class.__properties__
+                    if property_class in other_class.inverseOf.values
+                )
+
+        return found
+
+    def _asserted_statements(self, instances):
+        """
+        Return the statements of the values of the given instances which were not read by a previous run, i.e
+        the values added to the properties of the instances since. Values are tracked by their position in the
+        values of each property proxy, and all values of a property are read again if they were replaced, or
+        some were removed.
+
+        :returns iterable over the asserted (subject, predicate, object) statements
+
+        """
+        rules = self._rules
+        indexed_values = self._indexed_values
+        for instance in instances:
+            try:
+                positions = indexed_values.get(instance)
+                if positions is None:
+                    positions = indexed_values[instance] = {}
+            except TypeError:
+                # Instances which cannot be weakly referenced are read in full
+                positions = {}
+
+            subject = None
+            for name, value in list(instance.__dict__.items()):
+                if not isinstance(value, PropertyProxy) or value.uri not in rules:
+                    continue
+                values = value.values
+                indexed = positions.get(name)
+                start = indexed[1] if indexed is not None and indexed[0] is values and indexed[1] <= len(values) else 0
+                positions[name] = (values, len(values))
+                if start == len(values):
+                    continue
+
+                if subject is None:
+                    subject = URIRef(instance.uri)
+                predicate = URIRef(value.uri)
+                for property_value in values[start:]:
+                    yield (subject, predicate, to_term(property_value))
+
+    def _add(self, s, p, o):
+        """
+        Index a statement.
+
+        :returns {bool} whether the statement is new
+
+        """
+        objects = self.statements[p][s]
+        if o in objects:
+            return False
+
+        objects.add(o)
+        if self._rules[p].transitive:
+            self.subjects[p][o].add(s)
+
+        return True
+
+    def _entail(self, s, p, o):
+        """
+        Entail the statements directly following from a statement, joined with the indexed statements.
+
+        :returns iterable over the entailed (subject, predicate, object) statements, which may be known already
+
+        """
+        rule = self._rules[p]
+        for super_property in rule.super_properties:
+            yield (s, super_property, o)
+        for klass in rule.domain:
+            self._add_type(s, klass)
+
+        if not isinstance(o, URIRef):
+            # Literals are never the subject of statements
+            return
+
+        for klass in rule.range:
+            self._add_type(o, klass)
+        if rule.symmetric:
+            yield (o, p, s)
+        for inverse in rule.inverses:
+            yield (o, inverse, s)
+        if rule.transitive:
+            for x in list(self.statements[p].get(o, ())):
+                yield (s, p, x)
+            for y in list(self.subjects[p].get(s, ())):
+                yield (y, p, o)
+
+    def _add_type(self, uri, klass):
+        instance = self.session.get(uri)
+        if instance is not None and isinstance(instance, klass):
+            return
+
+        types = self.inferred_types[uri]
+        if any(issubclass(type_, klass) for type_ in types):
+            return
+
+        types.add(klass)
+        self.inferred.append((uri, RDF.type, URIRef(klass.__uri__)))
+
+
+def _ontology_classes(values):
+    # Classes of an ontology, rather than builtin types (e.g literals)
+    return tuple(
+        value
+        for value in values
+        if isinstance(value, type) and issubclass(value, RDFS_Class) and value.__uri__ is not None
+    )
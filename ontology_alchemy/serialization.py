@@ -0,0 +1,169 @@
+"""Streaming serialization of RDF statements, without building an intermediate graph."""
+from io import TextIOBase
+
+from rdflib import BNode, Literal, URIRef
+from rdflib.term import Identifier
+
+
+# Supported serialization formats
+SERIALIZATION_FORMATS = ("nt", "nquads", "turtle")
+
+# Types of the RDF terms most commonly found in statements
+TERM_TYPES = frozenset((URIRef, Literal, BNode))
+
+# Default number of statements written to the stream at once
+DEFAULT_CHUNK_SIZE = 10000
+
+
+def to_term(value):
+    """
+    Convert the value of a property (e.g an ontology class instance or a Python primitive) to an RDF term.
+
+    :param value - the value to convert
+    :returns {rdflib.term.Identifier} the corresponding RDF term
+
+    """
+    # Checking exact types first is much cheaper than `isinstance()` checks against (abstract) rdflib types
+    if type(value) in TERM_TYPES or isinstance(value, Identifier):
+        return value
+    elif isinstance(value, type):
+        # Ontology classes
+        return URIRef(value.__uri__)
+
+    uri = getattr(value, "uri", None)
+    if uri is not None:
+        # Ontology class instances
+        return URIRef(uri)
+
+    return Literal(value)
+
+
+def to_resource(value):
+    """
+    Convert the subject or predicate of a statement (e.g the URI of an ontology class instance) to an RDF term.
+
+    :param value - the value to convert
+    :returns {rdflib.term.Identifier} the corresponding RDF term
+
+    """
+    if type(value) in TERM_TYPES or isinstance(value, Identifier):
+        return value
+
+    return URIRef(value)
+
+
+def iter_formatted_statements(statements):
+    """
+    Format (subject, predicate, object) statements in the N-Triples syntax.
+
+    Consecutive statements about a same subject (e.g the statements of an instance) only format it once,
+    and predicates are only formatted once overall.
+
+    :param statements - iterable over (subject, predicate, object) statements
+    :returns iterable over the formatted subject, predicate and object of each statement
+
+    """
+    formatted_predicates = {}
+    last_subject = formatted_subject = None
+    for subject, predicate, value in statements:
+        if subject is not last_subject:
+            last_subject = subject
+            formatted_subject = format_term(to_resource(subject))
+
+        formatted_predicate = formatted_predicates.get(predicate)
+        if formatted_predicate is None:
+            formatted_predicate = formatted_predicates[predicate] = format_term(to_resource(predicate))
+
+        yield formatted_subject, formatted_predicate, format_term(to_term(value))
+
+
+def format_term(term):
+    """
+    Format an RDF term in the N-Triples syntax, which is valid in the N-Quads and Turtle syntaxes as well.
+
+    :param term - the RDF term
+    :returns {str} the formatted term
+
+    """
+    term_type = type(term)
+    if term_type is URIRef:
+        return "<{}>".format(term)
+    elif term_type is Literal or isinstance(term, Literal):
+        quoted = '"{}"'.format(
+            term.replace("\\", "\\\\").replace("\n", "\\n").replace("\r", "\\r").replace('"', '\\"')
+        )
+        if term.language:
+            return "{}@{}".format(quoted, term.language)
+        elif term.datatype:
+            return "{}^^<{}>".format(quoted, term.datatype)
+
+        return quoted
+    elif term_type is BNode or isinstance(term, BNode):
+        return "_:{}".format(term)
+
+    return "<{}>".format(term)
+
+
+def serialize_statements(statements, stream, format="nt", graph_uri=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Write (subject, predicate, object) statements to a stream, as they are iterated over.
+
+    Statements are written in chunks, so that memory use does not depend on the number of statements.
+
+    :param statements - iterable over (subject, predicate, object) statements. Terms are converted with `to_term()`.
+    :param stream - text or binary (UTF-8 encoded) stream to write to
+    :param format - the serialization format, one of `SERIALIZATION_FORMATS`. When serializing to turtle,
+        consecutive statements about a same subject are grouped together.
+    :param graph_uri - the name of the graph statements belong to, when serializing to nquads.
+        If not provided, statements belong to the default graph.
+    :param chunk_size - number of statements written to the stream at once
+
+    """
+    if format not in SERIALIZATION_FORMATS:
+        raise ValueError("Unsupported serialization format: {}, must be one of: {}".format(
+            format,
+            ", ".join(SERIALIZATION_FORMATS),
+        ))
+
+    if isinstance(stream, TextIOBase):
+        write = stream.write
+    else:
+        def write(text):
+            stream.write(text.encode("utf-8"))
+
+    if format == "turtle":
+        lines = _iter_turtle_lines(statements)
+    else:
+        terminator = " .\n"
+        if format == "nquads" and graph_uri is not None:
+            terminator = " {} .\n".format(format_term(URIRef(graph_uri)))
+        lines = (
+            " ".join(formatted_statement) + terminator
+            for formatted_statement in iter_formatted_statements(statements)
+        )
+
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= chunk_size:
+            write("".join(chunk))
+            chunk = []
+
+    if chunk:
+        write("".join(chunk))
+
+
+def _iter_turtle_lines(statements):
+    subject = None
+    for statement_subject, predicate, value in iter_formatted_statements(statements):
+        predicate_object = "{} {}".format(predicate, value)
+        if statement_subject == subject:
+            yield " ;\n    {}".format(predicate_object)
+        else:
+            if subject is not None:
+                yield " .\n"
+            subject = statement_subject
+            yield "{} {}".format(subject, predicate_object)
+
+    if subject is not None:
+        yield " .\n"
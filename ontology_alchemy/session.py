@@ -1,7 +1,274 @@
 """The session is a global context for all objects created from an Ontology."""
-from itertools import chain
+import sys
+from collections import OrderedDict
+from functools import wraps
+from itertools import chain, count, islice
+from threading import Lock, local
+from weakref import WeakKeyDictionary, WeakValueDictionary
 
 from contextlib2 import contextmanager
+from six import PY2, text_type
+
+from ontology_alchemy.serialization import DEFAULT_CHUNK_SIZE, serialize_statements
+
+try:
+    from contextvars import ContextVar
+except ImportError:  # Python < 3.7
+    ContextVar = None
+
+
+_MISSING = object()
+
+# Dictionaries keep the order of insertion from Python 3.7 only, and can be iterated over in reverse from Python 3.8
+PRESERVES_ORDER = sys.version_info >= (3, 7)
+PRESERVES_REVERSED_ORDER = sys.version_info >= (3, 8)
+
+
+class OrderedWeakKeyDictionary(WeakKeyDictionary):
+    """
+    A `WeakKeyDictionary` iterating over its keys in order of insertion on all versions of Python.
+
+    """
+
+    def __init__(self):
+        WeakKeyDictionary.__init__(self)
+        self.data = OrderedDict()
+
+
+# Factories of the (weak) dictionaries registered objects are kept in, as keys, in order of registration
+ordered_dict = dict if PRESERVES_ORDER else OrderedDict
+ordered_weak_key_dict = WeakKeyDictionary if PRESERVES_ORDER else OrderedWeakKeyDictionary
+
+
+class Registry(object):
+    """
+    The classes or instances registered in a session, in order of registration.
+
+    Objects are kept as the keys of an ordered dictionary, so that checking whether an object is registered and
+    unregistering it take constant time, while the registry supports the operations of the list objects used to be
+    kept in: iteration, `len()`, `in`, indexing, comparison with lists, `+`, and `append()`, `extend()`, `+=` and
+    `remove()`, which register and unregister objects with the session.
+
+    """
+    __slots__ = ("_objects", "_register", "_unregister")
+
+    def __init__(self, objects, register, unregister):
+        """
+        :param objects - the (weak) dictionary keeping registered objects as keys
+        :param register - the function registering an object with the session
+        :param unregister - the function unregistering an object from the session
+
+        """
+        self._objects = objects
+        self._register = register
+        self._unregister = unregister
+
+    def __len__(self):
+        return len(self._objects)
+
+    def __iter__(self):
+        # Over a snapshot, so that objects can be registered while iterating, as with lists
+        return iter(_snapshot(self._objects))
+
+    def __contains__(self, obj):
+        try:
+            return obj in self._objects
+        except TypeError:
+            # Objects which cannot be weakly referenced are never registered in weak sessions
+            return False
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return _snapshot(self._objects)[index]
+
+        return _nth(self._objects, index)
+
+    def __eq__(self, other):
+        if isinstance(other, (list, Registry)):
+            return list(self) == list(other)
+
+        return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = None
+
+    def __add__(self, other):
+        return list(self) + list(other)
+
+    def __iadd__(self, objects):
+        self.extend(objects)
+        return self
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def append(self, obj):
+        self._register(obj)
+
+    def extend(self, objects):
+        for obj in objects:
+            self._register(obj)
+
+    def remove(self, obj):
+        if obj not in self:
+            raise ValueError("{!r} is not registered".format(obj))
+
+        self._unregister(obj)
+
+
+class _ThreadLocalVar(object):
+    """
+    A minimal stand-in for `contextvars.ContextVar` where it is not available, scoped per thread.
+
+    """
+
+    def __init__(self, name, default=None):
+        self.name = name
+        self.default = default
+        self._local = local()
+
+    def get(self):
+        return getattr(self._local, "value", self.default)
+
+    def set(self, value):
+        token = self.get()
+        self._local.value = value
+        return token
+
+    def reset(self, token):
+        self._local.value = token
+
+
+def _snapshot(objects):
+    """
+    Return the keys of a (weak) dictionary which other threads may update, as a list.
+
+    """
+    if isinstance(objects, WeakKeyDictionary):
+        # Iterating over a weak dictionary is not atomic, while listing its references is
+        return [obj for obj in (ref() for ref in objects.keyrefs()) if obj is not None]
+
+    return list(objects)
+
+
+def _nth(objects, index):
+    """
+    Return the key of a (weak) dictionary at a given position (which can be negative, as for lists), walking the
+    dictionary from whichever end is closest rather than listing its keys, so that the first and last keys are
+    returned in constant time.
+
+    """
+    weak = isinstance(objects, WeakKeyDictionary)
+    keys = objects.data if weak else objects
+    length = len(keys)
+    position = index + length if index < 0 else index
+    if not 0 <= position < length:
+        raise IndexError("registry index out of range")
+
+    try:
+        if position >= length // 2 and (PRESERVES_REVERSED_ORDER or not isinstance(keys, dict)):
+            obj = next(islice(reversed(keys), length - 1 - position, None))
+        else:
+            obj = next(islice(iter(keys), position, None))
+    except RuntimeError:
+        # Changed by another thread (or weak references were collected) while walking it
+        return _snapshot(objects)[index]
+
+    obj = obj() if weak else obj
+    if obj is None:
+        return _snapshot(objects)[index]
+
+    return obj
+
+
+def _locked(method):
+    """
+    Decorate a method of a session so that it holds the lock of the session.
+
+    """
+    @wraps(method)
+    def locked_method(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+
+    return locked_method
+
+
+class SessionStack(object):
+    """
+    The sessions current in the calling context, outermost first: the default session, followed by the sessions
+    pushed with `session_context()`.
+
+    Supports the operations of the list sessions used to be kept in: iteration, `len()`, indexing, comparison with
+    lists (and tuples), and `append()` and `pop()`, which push and pop sessions in the calling context only (i.e
+    the current thread or asyncio task). Prefer `session_context()`, which pops the session it pushes even if an
+    error is raised.
+
+    """
+    __slots__ = ()
+
+    def _sessions(self):
+        return (Session.default,) + _session_stack.get()
+
+    def __len__(self):
+        return len(_session_stack.get()) + 1
+
+    def __iter__(self):
+        return iter(self._sessions())
+
+    def __contains__(self, session):
+        return session in self._sessions()
+
+    def __getitem__(self, index):
+        return self._sessions()[index]
+
+    def __eq__(self, other):
+        if isinstance(other, (list, tuple, SessionStack)):
+            return list(self) == list(other)
+
+        return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def append(self, session):
+        _session_stack.set(_session_stack.get() + (session,))
+
+    def pop(self, index=-1):
+        sessions = self._sessions()
+        position = index + len(sessions) if index < 0 else index
+        if position == 0 or not 0 < position < len(sessions):
+            raise IndexError("pop of the default session" if position == 0 else "pop index out of range")
+
+        pushed = _session_stack.get()
+        _session_stack.set(pushed[:position - 1] + pushed[position:])
+        return sessions[position]
+
+
+class _SessionStackDescriptor(object):
+    """
+    Descriptor of the sessions current in the calling context, see `SessionStack`.
+
+    """
+
+    def __get__(self, session, session_class):
+        return _SESSION_STACK
+
+
+# Sessions pushed with `session_context()`, innermost last, in the current context: each thread
+# and asyncio task has its own (tasks start with the sessions of the context they are created in).
+# Stacks are immutable tuples, so that pushing a session never changes the stack of another context.
+_session_stack = (ContextVar or _ThreadLocalVar)("session_stack", default=())
+_SESSION_STACK = SessionStack()
 
 
 class Session(object):
@@ -12,7 +279,9 @@ class Session(object):
     By default a single session object is created and can be retrieved
     with Session.get_current().
     Additionally, sessions can be pushed unto a stack for limiting scope
-    using the `session_context` method, when used as a context manager or decorator:
+    using the `session_context` method, when used as a context manager or decorator.
+    Stacks are scoped to the current thread or asyncio task, so that concurrent request handlers
+    each see their own current session, while the default session is shared by all of them:
 
     >>> with session_context() as session:
     ...     # Create ontology, instantiate classes
@@ -22,23 +291,122 @@ class Session(object):
     ... assert instance not in Session.get_current().instances
 
     """
-    stack = []
+    # The session current outside of any `session_context()`
+    default = None
+
+    # The default session, followed by the sessions pushed with `session_context()` in the current context
+    stack = _SessionStackDescriptor()
+
+    def __init__(self, classes=None, instances=None, weak=False):
+        """
+        :param classes - Python classes to register
+        :param instances - Python class instances to register
+        :param weak - if True, the session only keeps weak references to registered classes and instances,
+            which are unregistered as soon as they are garbage-collected.
 
-    def __init__(self, classes=None, instances=None):
-        self.classes = classes or []
-        self.instances = instances or []
+        """
+        self.weak = weak
+        # Guards registrations updating several indexes, as sessions (e.g the default one) can be shared by threads
+        self._lock = Lock()
+        # `class_version` changes whenever classes are registered or unregistered (e.g so that indexes of the registered
+        # classes know when to be built again), versions being issued by a counter, which is thread-safe
+        self._class_versions = count(1)
+        self.clear()
+
+        for klass in classes or ():
+            self.register_class(klass)
+        for instance in instances or ():
+            self.register_instance(instance)
 
     @classmethod
     def get_current(cls):
-        return cls.stack[-1]
+        stack = _session_stack.get()
+        return stack[-1] if stack else cls.default
+
+    @property
+    def classes(self):
+        """
+        :returns {Registry} the registered classes, in order of registration
+
+        """
+        return self._class_registry
+
+    @classes.setter
+    def classes(self, classes):
+        if classes is not self._class_registry:
+            for klass in list(self._classes):
+                self.unregister_class(klass)
+            for klass in classes:
+                self.register_class(klass)
+
+    @property
+    def instances(self):
+        """
+        :returns {Registry} the registered instances, in order of registration
+
+        """
+        return self._instance_registry
+
+    @instances.setter
+    def instances(self, instances):
+        if instances is not self._instance_registry:
+            for instance in list(self._instances):
+                self.unregister_instance(instance)
+            for instance in instances:
+                self.register_instance(instance)
 
     def clear(self):
         """
         Clear the session instance of all registered objects.
 
+        Registered classes and instances are kept as the keys of dictionaries, in order of registration
+        (see `Registry`), instances being further indexed by URI and by class.
+
+        """
+        with self._lock:
+            if self.weak:
+                self._classes = ordered_weak_key_dict()
+                self._instances = ordered_weak_key_dict()
+                self.instances_by_uri = WeakValueDictionary()
+                self.instances_by_class = WeakKeyDictionary()
+            else:
+                self._classes = ordered_dict()
+                self._instances = ordered_dict()
+                self.instances_by_uri = {}
+                self.instances_by_class = {}
+            self._class_registry = Registry(self._classes, self.register_class, self.unregister_class)
+            self._instance_registry = Registry(self._instances, self.register_instance, self.unregister_instance)
+            self.class_version = next(self._class_versions)
+
+    def get(self, uri, default=None):
         """
-        self.classes = []
-        self.instances = []
+        Retrieve a registered instance by URI.
+
+        :param uri - the URI of the instance
+        :param default - the value returned if no instance with the given URI is registered
+        :returns the instance registered last with the given URI, or `default`
+
+        """
+        return self.instances_by_uri.get(text_type(uri), default)
+
+    def instances_of(self, klass, include_subclasses=True):
+        """
+        Iterate over the registered instances of a given class.
+
+        Instances are looked up in the extent of each class, so that the cost of a query
+        is proportional to the number of instances returned rather than to the size of the session.
+
+        :param klass - the Python class
+        :param include_subclasses - if True, instances of all (direct and indirect) sub-classes
+            of the class are included as well
+        :returns iterable over the instances
+
+        """
+        classes = _subclass_closure(klass) if include_subclasses else (klass,)
+        with self._lock:
+            extents = [_snapshot(self.instances_by_class.get(subclass, ())) for subclass in classes]
+
+        return chain.from_iterable(extents)
 
     def register_class(self, klass):
         """
@@ -47,16 +415,99 @@ class Session(object):
         :param klass - the Python class to register
 
         """
-        self.classes.append(klass)
+        # Single (atomic) updates, which do not need to hold the lock
+        self._classes[klass] = None
+        self.class_version = next(self._class_versions)
 
     def register_instance(self, instance):
         """
         Register a new instance of a Python class corresponding to an Ontology class.
 
+        Each index is updated with a single atomic operation, so that concurrent registrations (e.g of threads
+        sharing the default session) do not hold the lock of the session, and registering stays as fast as
+        possible in single-threaded code.
+
         :param instance - the Python class instance to register
 
         """
-        self.instances.append(instance)
+        klass = instance.__class__
+        self._instances[instance] = None
+        self.instances_by_uri[text_type(instance.uri)] = instance
+
+        extent = self.instances_by_class.get(klass)
+        if extent is None:
+            extent = self.instances_by_class.setdefault(klass, self._new_extent())
+        extent[instance] = None
+
+    if PY2:
+        # Ordered dictionaries are implemented in Python, and updating them is not atomic
+        register_instance = _locked(register_instance)
+
+    def register_instances(self, instances):
+        """
+        Register new instances of Python classes corresponding to Ontology classes, at once.
+
+        :param instances - the Python class instances to register
+
+        """
+        instances = list(instances)
+        uris = [text_type(instance.uri) for instance in instances]
+        with self._lock:
+            self._instances.update(ordered_dict.fromkeys(instances))
+            self.instances_by_uri.update(zip(uris, instances))
+
+            extent = klass = None
+            for instance in instances:
+                if instance.__class__ is not klass:
+                    klass = instance.__class__
+                    extent = self.instances_by_class.get(klass)
+                    if extent is None:
+                        extent = self.instances_by_class.setdefault(klass, self._new_extent())
+                extent[instance] = None
+
+    def _new_extent(self):
+        return ordered_weak_key_dict() if self.weak else ordered_dict()
+
+    def unregister(self, obj):
+        """
+        Unregister a Python class or class instance, if registered.
+
+        :param obj - the Python class or class instance to unregister
+
+        """
+        if isinstance(obj, type):
+            self.unregister_class(obj)
+        else:
+            self.unregister_instance(obj)
+
+    def unregister_class(self, klass):
+        """
+        Unregister a Python class, if registered. Instances of the class remain registered.
+
+        :param klass - the Python class to unregister
+
+        """
+        self._classes.pop(klass, None)
+        self.class_version = next(self._class_versions)
+
+    def unregister_instance(self, instance):
+        """
+        Unregister a Python class instance, if registered.
+
+        :param instance - the Python class instance to unregister
+
+        """
+        uri = text_type(instance.uri)
+        with self._lock:
+            if self._instances.pop(instance, _MISSING) is _MISSING:
+                return
+
+            if self.instances_by_uri.get(uri) is instance:
+                del self.instances_by_uri[uri]
+
+            extent = self.instances_by_class.get(instance.__class__)
+            if extent is not None:
+                extent.pop(instance, None)
 
     def rdf_statements(self):
         """
@@ -64,19 +515,66 @@ class Session(object):
         representing all instances created since session started.
 
         """
+        if self.weak:
+            # Instances are only referenced while their statements are iterated over, so that those
+            # which are garbage-collected meanwhile are skipped rather than kept alive
+            instances = (ref() for ref in self._instances.keyrefs())
+        else:
+            instances = list(self._instances)
+
         return chain.from_iterable(
-            instance.rdf_statements()
-            for instance in self.instances
+            instance.iter_rdf_statements()
+            for instance in instances
+            if instance is not None
+        )
+
+    def serialize(self, stream, format="nt", graph_uri=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Serialize the RDF statements representing all instances created since session started.
+
+        Statements are streamed out in chunks, without building an intermediate `rdflib.Graph`,
+        so that memory use stays flat regardless of the number of instances.
+
+        :param stream - text or binary (UTF-8 encoded) stream to write to
+        :param format - the serialization format, one of "nt", "nquads" or "turtle"
+        :param graph_uri - the name of the graph statements belong to, when serializing to nquads
+        :param chunk_size - number of statements written to the stream at once
+
+        """
+        serialize_statements(
+            self.rdf_statements(),
+            stream,
+            format=format,
+            graph_uri=graph_uri,
+            chunk_size=chunk_size,
         )
 
 
+def _subclass_closure(klass):
+    """
+    Return a given class along with all its (direct and indirect) sub-classes, each listed once.
+
+    """
+    closure = [klass]
+    visited = set(closure)
+    for subclass in closure:
+        for subclass_subclass in subclass.__subclasses__():
+            if subclass_subclass not in visited:
+                visited.add(subclass_subclass)
+                closure.append(subclass_subclass)
+
+    return closure
+
+
 @contextmanager
-def session_context():
-    session = Session()
-    Session.stack.append(session)
-    yield session
-    Session.stack.pop()
+def session_context(weak=False):
+    session = Session(weak=weak)
+    token = _session_stack.set(_session_stack.get() + (session,))
+    try:
+        yield session
+    finally:
+        _session_stack.reset(token)
 
 
 # Populate default session
-Session.stack.append(Session())
+Session.default = Session()
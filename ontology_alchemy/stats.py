@@ -0,0 +1,125 @@
+"""Instrumentation of ontology builds."""
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
+from timeit import default_timer
+
+
+class BuildStats(object):
+    """
+    Statistics of the build of an ontology, as collected when passed to `Ontology.load()` or `OntologyBuilder`:
+
+    - phases: the wall time of each phase of the build (e.g parsing, indexing statements, sorting the class hierarchy,
+      creating the Python classes), in seconds, keyed by phase name, in order. Phases run several times
+      (e.g when classes are materialized lazily) add up, and phases run within themselves are only timed once.
+    - triples: the number of statements indexed, keyed by predicate. Statements with other predicates
+      are not needed to build the namespace, and are not counted.
+    - classes_created: the number of Python classes created
+    - properties_propagated: the number of properties assigned to classes, i.e the total length of
+      the `__properties__` of all classes, including the properties inherited from their base classes
+    - skipped_uris: the URIs of the types which are not part of the ontology namespace, and are not built
+
+    >>> stats = BuildStats()
+    >>> ontology = Ontology.load("ontology.ttl", stats=stats)
+    >>> print(stats.report())
+
+    Builds not given a stats object are not instrumented at all.
+
+    """
+
+    def __init__(self, callback=None):
+        """
+        :param callback - if provided, called with the name and the wall time of each phase as it completes,
+            e.g to log or export timings
+
+        """
+        self.callback = callback
+        self.phases = OrderedDict()
+        self.triples = defaultdict(int)
+        self.classes_created = 0
+        self.properties_propagated = 0
+        self.skipped_uris = []
+        self._running = set()
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Time a phase of the build.
+
+        :param name - the name of the phase
+
+        """
+        if name in self._running:
+            # E.g classes materialized while materializing others
+            yield
+            return
+
+        self._running.add(name)
+        start = default_timer()
+        try:
+            yield
+        finally:
+            elapsed = default_timer() - start
+            self._running.discard(name)
+            self.phases[name] = self.phases.get(name, 0.0) + elapsed
+            if self.callback is not None:
+                self.callback(name, elapsed)
+
+    def counting(self, predicate, handler):
+        """
+        Wrap a handler of the statements with a given predicate so that the statements it handles are counted.
+
+        :param predicate - the predicate
+        :param handler - the handler, called with the (subject, predicate, object) of statements
+        :returns the wrapped handler
+
+        """
+        triples = self.triples
+
+        def counting_handler(s, p, o):
+            triples[predicate] += 1
+            handler(s, p, o)
+
+        return counting_handler
+
+    def report(self):
+        """
+        :returns {str} a human-readable summary of the statistics
+
+        """
+        lines = ["phases:"]
+        lines.extend("  {}: {:.3f}s".format(name, seconds) for name, seconds in self.phases.items())
+        lines.append("triples:")
+        lines.extend(
+            "  {}: {}".format(predicate, count)
+            for predicate, count in sorted(self.triples.items(), key=lambda item: (-item[1], item[0]))
+        )
+        lines.append("classes created: {}".format(self.classes_created))
+        lines.append("properties propagated: {}".format(self.properties_propagated))
+        lines.append("skipped URIs: {}".format(len(self.skipped_uris)))
+
+        return "\n".join(lines)
+
+
+class NoPhase(object):
+    """A phase of builds which are not instrumented, doing nothing."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NO_PHASE = NoPhase()
+
+
+def phase(stats, name):
+    """
+    Time a phase of a build, if instrumented.
+
+    :param stats - the `BuildStats` of the build, or None
+    :param name - the name of the phase
+    :returns a context manager
+
+    """
+    return NO_PHASE if stats is None else stats.phase(name)
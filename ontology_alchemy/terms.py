@@ -0,0 +1,78 @@
+"""Dictionaries of terms, mapping URIs and literals to compact integer IDs."""
+from threading import Lock
+
+from six import integer_types
+
+
+# Python types whose values can be equal across types (e.g `1 == 1.0 == True`), and which are therefore
+# keyed by type as well, so that each is assigned its own ID.
+NUMERIC_TYPES = frozenset(integer_types + (float, bool))
+
+
+class TermDictionary(object):
+    """
+    A dictionary of terms (URIs, literals or Python primitive values), which maps each distinct term to a compact
+    integer ID. IDs are assigned in order, starting from zero, and never change.
+
+    Terms are never removed, so that dictionaries suit terms which are repeated a lot (e.g class and property
+    URIs, or property values shared by many instances), rather than unique ones.
+
+    """
+
+    def __init__(self):
+        self.terms = []
+        self.ids = {}
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self.terms)
+
+    def __contains__(self, term):
+        return self._key(term) in self.ids
+
+    def encode(self, term):
+        """
+        Return the ID of a term, assigning it a new one if not part of the dictionary yet.
+
+        :param term - the term
+        :returns {int} the ID of the term
+
+        """
+        key = self._key(term)
+        term_id = self.ids.get(key)
+        if term_id is None:
+            # Only new terms are assigned IDs under the lock, looking up existing terms is lock-free
+            with self._lock:
+                term_id = self.ids.get(key)
+                if term_id is None:
+                    # The term is added before its ID is published, so that it can always be decoded
+                    self.terms.append(term)
+                    term_id = self.ids[key] = len(self.terms) - 1
+
+        return term_id
+
+    def lookup(self, term):
+        """
+        Return the ID of a term, without assigning it one.
+
+        :param term - the term
+        :returns {int} the ID of the term, or None if not part of the dictionary
+
+        """
+        return self.ids.get(self._key(term))
+
+    def decode(self, term_id):
+        """
+        Return the term of an ID.
+
+        :param term_id - the ID
+        :returns the term
+
+        """
+        return self.terms[term_id]
+
+    def _key(self, term):
+        if type(term) in NUMERIC_TYPES:
+            return (type(term), term)
+
+        return term
@@ -1,4 +1,8 @@
 """Fixture data used by the unit-tests."""
+from shutil import rmtree
+from tempfile import mkdtemp
+
+from contextlib2 import contextmanager
 from six import StringIO
 
 from ontology_alchemy.ontology import Ontology
@@ -80,3 +84,12 @@ def create_ontology_file_object():
 
 def create_ontology():
     return Ontology.load(create_ontology_file_object(), format="turtle")
+
+
+@contextmanager
+def temporary_directory():
+    directory = mkdtemp()
+    try:
+        yield directory
+    finally:
+        rmtree(directory)
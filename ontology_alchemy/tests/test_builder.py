@@ -1,23 +1,35 @@
 """Unit-tests for the core ontology module."""
 from hamcrest import (
     assert_that,
+    calling,
+    contains,
     contains_inanyorder,
     empty,
     equal_to,
+    has_item,
+    has_items,
     instance_of,
     is_,
+    is_in,
     is_not,
     only_contains,
+    raises,
+    same_instance,
 )
 from nose.plugins.attrib import attr
 from nose_parameterized import parameterized
+from rdflib import Graph, Literal, Namespace, OWL, RDF, RDFS, URIRef
 from six import StringIO, string_types, text_type
 
 from ontology_alchemy.base import RDFS_Class, RDF_Property
+from ontology_alchemy.builder import OntologyBuilder
 from ontology_alchemy.ontology import Ontology
 from ontology_alchemy.tests.fixtures import create_ontology_file_object, create_ontology
 
 
+EXAMPLE_NAMESPACE = Namespace("http://example.com/namespace#")
+
+
 def test_loading_from_file_stream_works():
     ontology = Ontology.load(create_ontology_file_object(), format="turtle")
 
@@ -86,6 +98,119 @@ def test_rdfs_class_hierarchy_is_valid():
     ))
 
 
+def test_indexed_and_single_pass_builds_are_equivalent():
+    graph = Graph()
+    graph.parse(create_ontology_file_object(), format="turtle")
+
+    indexed_namespace = OntologyBuilder(graph).build_namespace()
+    # A plain iterable of triples does not support pattern lookups
+    single_pass_namespace = OntologyBuilder(
+        list(graph),
+        base_uri="http://example.com/namespace#",
+    ).build_namespace()
+
+    assert_that(single_pass_namespace.keys(), contains_inanyorder(*indexed_namespace.keys()))
+    for name, klass in indexed_namespace.items():
+        other_klass = single_pass_namespace[name]
+        assert_that(
+            [base.__name__ for base in other_klass.__bases__],
+            contains_inanyorder(*[base.__name__ for base in klass.__bases__]),
+        )
+        assert_that(other_klass.label.values, contains_inanyorder(*klass.label.values))
+        assert_that(
+            [property_class.__name__ for property_class in other_klass.__properties__],
+            contains_inanyorder(*[property_class.__name__ for property_class in klass.__properties__]),
+        )
+
+
+def test_base_uri_inference_is_deterministic():
+    graph = Graph()
+    for i in range(10):
+        graph.add((EXAMPLE_NAMESPACE["Class{}".format(i)], RDF.type, RDFS.Class))
+        graph.add((Namespace("http://example.com/other#")["Class{}".format(i)], RDF.type, RDFS.Class))
+    graph.add((Namespace("http://example.com/other#")["Class10"], RDF.type, RDFS.Class))
+
+    assert_that(
+        set(OntologyBuilder(graph).base_uri for _ in range(20)),
+        contains("http://example.com/other#"),
+    )
+    assert_that(
+        OntologyBuilder(reversed(list(graph))).compile()["base_uri"],
+        equal_to("http://example.com/other#"),
+    )
+
+    # The URI the ontology declares itself as takes precedence
+    graph.add((URIRef("http://example.com/namespace"), RDF.type, OWL.Ontology))
+    assert_that(OntologyBuilder(graph).base_uri, equal_to("http://example.com/namespace#"))
+
+
+def test_base_uri_inference_takes_declared_namespaces_into_account():
+    ontology = Ontology.load(StringIO("""
+        @prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+        @prefix ex: <http://example.com/resource/> .
+
+        <http://example.com/resource/Category:Organization/Corporation> a rdfs:Class .
+        <http://example.com/resource/Category:Organization/Partnership> a rdfs:Class .
+        <http://example.com/resource/Thing> a rdfs:Class .
+    """), format="turtle", keep_graph=False)
+
+    assert_that(ontology.__uri__, equal_to("http://example.com/resource/"))
+    assert_that(ontology.__terms__, has_item("Category:Organization/Corporation"))
+
+
+def test_lazy_ontology_materializes_classes_on_first_access():
+    ontology = Ontology.load(create_ontology_file_object(), format="turtle", lazy=True)
+
+    assert_that(ontology.__terms__, contains_inanyorder(*create_ontology().__terms__))
+    assert_that("Corporation", is_not(is_in(ontology.__dict__)))
+
+    corporation = ontology.Corporation
+
+    assert_that(ontology.__dict__["Corporation"], is_(equal_to(corporation)))
+    assert_that(corporation.__bases__, contains_inanyorder(ontology.Organization))
+    assert_that(ontology.Organization.__bases__, contains_inanyorder(ontology.Thing))
+    assert_that(ontology.Thing.__bases__, contains_inanyorder(RDFS_Class))
+    assert_that(corporation.label(lang="en"), contains_inanyorder("Corporation"))
+    assert_that("Country", is_not(is_in(ontology.__builder__.namespace)))
+
+
+def test_lazy_ontology_properties_match_eager_ontology():
+    eager_ontology = create_ontology()
+    lazy_ontology = Ontology.load(create_ontology_file_object(), format="turtle", lazy=True)
+
+    for name in eager_ontology.__terms__:
+        assert_that(
+            [property_class.__name__ for property_class in getattr(lazy_ontology, name).__properties__],
+            contains_inanyorder(*set(
+                property_class.__name__ for property_class in getattr(eager_ontology, name).__properties__
+            )),
+        )
+
+    assert_that(lazy_ontology.hasExecutive.__bases__, contains_inanyorder(lazy_ontology.hasEmployee))
+    assert_that(lazy_ontology.hasEmployee.domain, contains_inanyorder(lazy_ontology.Organization))
+    assert_that(lazy_ontology.hasEmployee.range, contains_inanyorder(lazy_ontology.Person))
+
+
+def test_lazy_ontology_properties_resolve_on_concatenation():
+    lazy_ontology = Ontology.load(create_ontology_file_object(), format="turtle", lazy=True)
+    properties = lazy_ontology.Corporation.__properties__
+
+    assert_that([] + properties, contains_inanyorder(
+        lazy_ontology.hasEmployee,
+        lazy_ontology.hasExecutive,
+        lazy_ontology.naics,
+        lazy_ontology.numberOfEmployees,
+    ))
+    assert_that(properties + [], is_(equal_to(list(properties))))
+    assert_that(properties, is_(equal_to([] + properties)))
+
+
+def test_lazy_ontology_unknown_attribute_raises_attribute_error():
+    ontology = Ontology.load(create_ontology_file_object(), format="turtle", lazy=True)
+
+    assert_that(calling(getattr).with_args(ontology, "Unknown"), raises(AttributeError))
+
+
 @attr("requires_internet_connection")
 @parameterized([
     "http://www.w3.org/TR/skos-reference/skos.rdf",  # SKOS
@@ -99,3 +224,158 @@ def test_can_load_established_ontologies(ontology_uri):
     ontology = Ontology.load(ontology_uri)
 
     assert_that(ontology.__terms__, is_not(empty()))
+
+
+def test_properties_are_propagated_once_to_all_sub_classes():
+    ontology = Ontology.load(StringIO("""
+        @prefix rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#> .
+        @prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+        @prefix exampleOntology: <http://example.com/namespace#> .
+
+        exampleOntology:Thing a rdfs:Class .
+        exampleOntology:Organization a rdfs:Class ;
+            rdfs:subClassOf exampleOntology:Thing .
+        exampleOntology:Charity a rdfs:Class ;
+            rdfs:subClassOf exampleOntology:Thing .
+        exampleOntology:Foundation a rdfs:Class ;
+            rdfs:subClassOf exampleOntology:Organization, exampleOntology:Charity .
+        exampleOntology:name a rdf:Property ;
+            rdfs:domain exampleOntology:Thing .
+        exampleOntology:legalName a rdf:Property ;
+            rdfs:subPropertyOf exampleOntology:name ;
+            rdfs:domain exampleOntology:Organization .
+    """), format="turtle")
+
+    # Sub-properties are in the domain of their parent properties as well
+    assert_that(ontology.Charity.__properties__, contains_inanyorder(ontology.name, ontology.legalName))
+    assert_that(ontology.Organization.__properties__, contains_inanyorder(ontology.name, ontology.legalName))
+    assert_that(ontology.Foundation.__properties__, contains_inanyorder(ontology.name, ontology.legalName))
+
+
+def test_applied_changes_update_the_class_hierarchy_in_place():
+    ontology = create_ontology()
+    organization_class = ontology.Organization
+    startup, funded_by = EXAMPLE_NAMESPACE.Startup, EXAMPLE_NAMESPACE.fundedBy
+
+    ontology.apply(added=[
+        (startup, RDF.type, RDFS.Class),
+        (startup, RDFS.subClassOf, EXAMPLE_NAMESPACE.Corporation),
+        (funded_by, RDF.type, RDF.Property),
+        (funded_by, RDFS.domain, startup),
+        (funded_by, RDFS.range, EXAMPLE_NAMESPACE.Person),
+    ])
+    instance = ontology.Startup(label="Acme Inc.")
+    instance.fundedBy += ontology.Person()
+
+    assert_that(ontology.__terms__, has_items("Startup", "fundedBy"))
+    assert_that(instance, instance_of(ontology.Corporation))
+    assert_that(ontology.Startup.__properties__, has_items(ontology.hasEmployee, ontology.fundedBy))
+
+    ontology.apply(
+        added=[(startup, RDFS.subClassOf, EXAMPLE_NAMESPACE.Organization)],
+        removed=[(startup, RDFS.subClassOf, EXAMPLE_NAMESPACE.Corporation)],
+    )
+
+    assert_that(ontology.Organization, is_(same_instance(organization_class)))
+    assert_that(ontology.Startup.__bases__, contains(ontology.Organization))
+    assert_that(instance, is_not(instance_of(ontology.Corporation)))
+
+    ontology.apply(removed=[
+        (startup, RDF.type, RDFS.Class),
+        (startup, RDFS.subClassOf, EXAMPLE_NAMESPACE.Organization),
+    ])
+
+    assert_that("Startup", is_not(is_in(ontology.__terms__)))
+    assert_that(calling(getattr).with_args(ontology, "Startup"), raises(AttributeError))
+    assert_that(ontology.fundedBy.domain, contains(RDFS_Class))
+    assert_that(ontology.Organization.__properties__, has_item(ontology.fundedBy))
+
+
+def test_applied_changes_match_a_full_build():
+    for lazy in (False, True):
+        ontology = Ontology.load(create_ontology_file_object(), format="turtle", lazy=lazy)
+        ontology.apply(
+            added=[
+                (EXAMPLE_NAMESPACE.hasExecutive, RDFS.domain, EXAMPLE_NAMESPACE.Corporation),
+                (EXAMPLE_NAMESPACE.Country, RDFS.subClassOf, EXAMPLE_NAMESPACE.Organization),
+                (EXAMPLE_NAMESPACE.Person, RDFS.label, Literal("Human", lang="en")),
+            ],
+            removed=[(EXAMPLE_NAMESPACE.Country, RDFS.subClassOf, EXAMPLE_NAMESPACE.Thing)],
+        )
+        rebuilt_ontology = Ontology(
+            OntologyBuilder(ontology.__graph__).build_namespace(),
+            graph=ontology.__graph__,
+        )
+
+        assert_that(ontology.__terms__, contains_inanyorder(*rebuilt_ontology.__terms__))
+        for name in rebuilt_ontology.__terms__:
+            klass, rebuilt_class = getattr(ontology, name), getattr(rebuilt_ontology, name)
+            assert_that(
+                [base_class.__name__ for base_class in klass.__bases__],
+                contains_inanyorder(*[base_class.__name__ for base_class in rebuilt_class.__bases__]),
+            )
+            assert_that(
+                [property_class.__name__ for property_class in klass.__properties__],
+                contains_inanyorder(*[property_class.__name__ for property_class in rebuilt_class.__properties__]),
+            )
+            assert_that(klass.label.values, contains_inanyorder(*rebuilt_class.label.values))
+
+
+def test_applied_changes_keep_annotations_added_at_runtime():
+    ontology = create_ontology()
+    ontology.Person.label += Literal("Individual", lang="en")
+    ontology.hasEmployee.range += ontology.Organization
+
+    assert_that(ontology.__builder__, is_(None))
+
+    ontology.apply(
+        added=[(EXAMPLE_NAMESPACE.Person, RDFS.label, Literal("Human", lang="en"))],
+        removed=[(EXAMPLE_NAMESPACE.Person, RDFS.label, Literal("Person", lang="en"))],
+    )
+    ontology.apply(added=[(EXAMPLE_NAMESPACE.hasEmployee, RDFS.label, Literal("employs", lang="en"))])
+
+    assert_that(ontology.Person.label(lang="en"), contains_inanyorder("Individual", "Human"))
+    assert_that(ontology.hasEmployee.range, contains_inanyorder(ontology.Person, ontology.Organization))
+    assert_that(ontology.hasEmployee.inferred_range(), has_item(ontology.Organization))
+    assert_that(ontology.is_subclass(ontology.Person, ontology.Thing), is_(True))
+
+
+def test_applied_changes_which_cannot_be_applied_in_place_are_rejected():
+    ontology = create_ontology()
+    thing_class, has_employee_class = ontology.Thing, ontology.hasEmployee
+    ontology.apply(added=[(EXAMPLE_NAMESPACE.Startup, RDF.type, RDFS.Class)])
+    statements = set(ontology.__graph__)
+    definitions = list(ontology.__builder__.definitions.items())
+
+    for added, removed in (
+        ([(EXAMPLE_NAMESPACE.Thing, RDF.type, RDF.Property)], [(EXAMPLE_NAMESPACE.Thing, RDF.type, RDFS.Class)]),
+        ([(EXAMPLE_NAMESPACE.hasEmployee, RDFS.subPropertyOf, EXAMPLE_NAMESPACE.Person)], []),
+        ([(EXAMPLE_NAMESPACE.Startup, RDFS.subClassOf, EXAMPLE_NAMESPACE.hasEmployee)], []),
+    ):
+        assert_that(calling(ontology.apply).with_args(added=added, removed=removed), raises(ValueError))
+
+        assert_that(set(ontology.__graph__), equal_to(statements))
+        assert_that(list(ontology.__builder__.definitions.items()), equal_to(definitions))
+        assert_that(ontology.Thing, is_(same_instance(thing_class)))
+        assert_that(ontology.hasEmployee, is_(same_instance(has_employee_class)))
+        assert_that(ontology.hasEmployee.__bases__, contains(RDF_Property))
+        assert_that(ontology.Startup.__bases__, contains(RDFS_Class))
+
+    ontology.apply(added=[(EXAMPLE_NAMESPACE.Startup, RDFS.subClassOf, EXAMPLE_NAMESPACE.Corporation)])
+
+    assert_that(ontology.Startup.__bases__, contains(ontology.Corporation))
+
+
+def test_property_names_are_computed_without_creating_classes():
+    graph = Graph()
+    graph.parse(create_ontology_file_object(), format="turtle")
+    builder = OntologyBuilder(graph)
+    builder.build_namespace(lazy=True)
+
+    property_names = builder.property_names("Corporation")
+
+    assert_that(builder.namespace, is_(empty()))
+    assert_that(property_names, contains(
+        *[property_class.__name__ for property_class in create_ontology().Corporation.__properties__]
+    ))
+    assert_that(builder.property_names("Organization"), has_items(*property_names))
@@ -0,0 +1,135 @@
+"""Unit-tests for the compiled ontology cache."""
+from os import listdir, path
+
+from hamcrest import (
+    assert_that,
+    contains_inanyorder,
+    empty,
+    equal_to,
+    has_length,
+    is_,
+    is_not,
+    none,
+)
+
+from ontology_alchemy.base import RDFS_Class
+from ontology_alchemy.cache import CompiledOntologyCache
+from ontology_alchemy.ontology import Ontology
+from ontology_alchemy.tests.fixtures import (
+    RDFS_TURTLE_ONTOLOGY,
+    create_ontology_file_object,
+    temporary_directory,
+)
+
+
+RELATIVE_RDFXML_ONTOLOGY = """<?xml version="1.0"?>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" xmlns:rdfs="http://www.w3.org/2000/01/rdf-schema#">
+  <rdfs:Class rdf:about="#Thing"/>
+</rdf:RDF>
+"""
+
+
+def write_ontology(directory, content=RDFS_TURTLE_ONTOLOGY):
+    filename = path.join(directory, "ontology.ttl")
+    with open(filename, "w") as ontology_file:
+        ontology_file.write(content)
+    return filename
+
+
+def cache_entries(cache_dir):
+    return [filename for filename in listdir(cache_dir) if filename.endswith(".json")]
+
+
+def test_cold_load_populates_cache():
+    with temporary_directory() as cache_dir:
+        ontology = Ontology.load(write_ontology(cache_dir), cache_dir=cache_dir)
+
+        assert_that(ontology.__graph__, is_not(none()))
+        assert_that(cache_entries(cache_dir), has_length(1))
+
+
+def test_warm_load_rebuilds_same_namespace_without_graph():
+    with temporary_directory() as cache_dir:
+        filename = write_ontology(cache_dir)
+        cold = Ontology.load(filename, cache_dir=cache_dir)
+        warm = Ontology.load(filename, cache_dir=cache_dir)
+
+        assert_that(warm.__graph__, is_(none()))
+        assert_that(warm.__uri__, is_(equal_to(cold.__uri__)))
+        assert_that(warm.__terms__, contains_inanyorder(*cold.__terms__))
+        assert_that(warm.Thing.__bases__, contains_inanyorder(RDFS_Class))
+        assert_that(warm.Organization.__bases__, contains_inanyorder(warm.Thing))
+        assert_that(warm.Organization.__uri__, is_(equal_to(cold.Organization.__uri__)))
+        assert_that(warm.Organization.label(lang="en"), contains_inanyorder("Organization"))
+        assert_that(warm.hasEmployee.domain, contains_inanyorder(warm.Organization))
+        assert_that(warm.hasEmployee.range, contains_inanyorder(warm.Person))
+        assert_that(warm.Corporation.__properties__, contains_inanyorder(*[
+            getattr(warm, property_class.__name__)
+            for property_class in cold.Corporation.__properties__
+        ]))
+
+
+def test_file_object_load_uses_cache():
+    with temporary_directory() as cache_dir:
+        Ontology.load(create_ontology_file_object(), format="turtle", cache_dir=cache_dir)
+        ontology = Ontology.load(create_ontology_file_object(), format="turtle", cache_dir=cache_dir)
+
+        assert_that(ontology.__graph__, is_(none()))
+        assert_that(cache_entries(cache_dir), has_length(1))
+
+
+def test_relative_uris_resolve_against_file_location():
+    with temporary_directory() as cache_dir:
+        filename = path.join(cache_dir, "ontology.rdf")
+        with open(filename, "w") as ontology_file:
+            ontology_file.write(RELATIVE_RDFXML_ONTOLOGY)
+        uncached = Ontology.load(filename)
+        cold = Ontology.load(filename, cache_dir=cache_dir)
+        warm = Ontology.load(filename, cache_dir=cache_dir)
+
+        assert_that(warm.__graph__, is_(none()))
+        assert_that(cold.Thing.__uri__, is_(equal_to(uncached.Thing.__uri__)))
+        assert_that(warm.Thing.__uri__, is_(equal_to(uncached.Thing.__uri__)))
+
+
+def test_changed_content_invalidates_entry():
+    with temporary_directory() as cache_dir:
+        filename = write_ontology(cache_dir)
+        Ontology.load(filename, cache_dir=cache_dir)
+        write_ontology(cache_dir, RDFS_TURTLE_ONTOLOGY.replace("GovernmentOrganization", "Agency"))
+        ontology = Ontology.load(filename, cache_dir=cache_dir)
+
+        assert_that(ontology.__graph__, is_not(none()))
+        assert_that(ontology.__terms__, contains_inanyorder(
+            "Agency",
+            "Corporation",
+            "Country",
+            "Organization",
+            "Person",
+            "Thing",
+            "currencyCode",
+            "hasEmployee",
+            "hasExecutive",
+            "naics",
+            "numberOfEmployees",
+        ))
+        assert_that(cache_entries(cache_dir), has_length(2))
+
+
+def test_corrupted_entry_is_a_cache_miss():
+    with temporary_directory() as cache_dir:
+        filename = write_ontology(cache_dir)
+        Ontology.load(filename, cache_dir=cache_dir)
+        with open(path.join(cache_dir, cache_entries(cache_dir)[0]), "w") as cache_file:
+            cache_file.write("{")
+
+        assert_that(Ontology.load(filename, cache_dir=cache_dir).__graph__, is_not(none()))
+        assert_that(Ontology.load(filename, cache_dir=cache_dir).__graph__, is_(none()))
+
+
+def test_invalidate_removes_all_entries():
+    with temporary_directory() as cache_dir:
+        Ontology.load(write_ontology(cache_dir), cache_dir=cache_dir)
+        CompiledOntologyCache(cache_dir).invalidate()
+
+        assert_that(cache_entries(cache_dir), is_(empty()))
@@ -0,0 +1,142 @@
+"""Unit-tests for the columnar instance store."""
+from hamcrest import (
+    assert_that,
+    calling,
+    contains,
+    contains_inanyorder,
+    equal_to,
+    has_length,
+    instance_of,
+    is_,
+    is_not,
+    none,
+    raises,
+    same_instance,
+)
+from rdflib import Graph, Literal, URIRef
+from six import StringIO
+
+from ontology_alchemy.columnar import Column, ColumnarStore
+from ontology_alchemy.serialization import to_term
+from ontology_alchemy.terms import TermDictionary
+from ontology_alchemy.tests.fixtures import create_ontology
+
+
+def create_stores(ontology):
+    people = ColumnarStore(ontology.Person)
+    john = people.append(uri="http://example.com/john", label="John Doe")
+
+    organizations = ColumnarStore(ontology.Organization)
+    organizations.extend([
+        {"uri": "http://example.com/acme", "label": "Acme Inc.", "hasEmployee": john},
+        {"uri": "http://example.com/globex", "label": "Globex", "numberOfEmployees": 100},
+    ])
+
+    return people, organizations
+
+
+def test_columnar_instances_properties_can_be_read():
+    ontology = create_ontology()
+    people, organizations = create_stores(ontology)
+    acme, globex = organizations
+
+    assert_that(organizations, has_length(2))
+    assert_that(acme.uri, equal_to(URIRef("http://example.com/acme")))
+    assert_that(acme.label(lang="en"), contains("Acme Inc."))
+    assert_that(acme.hasEmployee(URIRef("http://example.com/john")), is_(True))
+    assert_that(globex.numberOfEmployees, contains(100))
+    assert_that(globex.hasEmployee.values, equal_to([]))
+    assert_that(acme, instance_of(ontology.Organization))
+
+
+def test_values_added_to_columnar_instances_are_stored():
+    ontology = create_ontology()
+    people, organizations = create_stores(ontology)
+    acme, globex = organizations
+
+    acme.label += "Acme Incorporated"
+    globex.hasEmployee += people[0]
+
+    assert_that(acme.label(lang="en"), contains("Acme Inc.", "Acme Incorporated"))
+    assert_that(organizations.rows_with("hasEmployee", people[0]), contains(0, 1))
+    assert_that(organizations.rows_with("label", "Acme Incorporated"), contains(0))
+    assert_that(organizations.rows_with("label", "Initech"), equal_to([]))
+
+
+def test_invalid_values_for_columnar_instances_raise_value_error():
+    ontology = create_ontology()
+    people, organizations = create_stores(ontology)
+
+    def invalid_assigment_clause():
+        organizations[0].hasEmployee += organizations[1]
+
+    assert_that(calling(invalid_assigment_clause), raises(ValueError))
+    assert_that(calling(organizations.append).with_args(foo="bar"), raises(AttributeError))
+
+
+def test_invalid_records_are_not_stored_in_part():
+    ontology = create_ontology()
+    people, organizations = create_stores(ontology)
+
+    assert_that(
+        calling(organizations.append).with_args(uri="http://example.com/initech", label="Initech", foo="bar"),
+        raises(AttributeError),
+    )
+    assert_that(
+        calling(organizations.append).with_args(label="Initech", hasEmployee=organizations[0]),
+        raises(ValueError),
+    )
+    assert_that(organizations, has_length(2))
+    assert_that(organizations.rows_with("label", "Initech"), equal_to([]))
+
+
+def test_columnar_store_statements_can_be_serialized():
+    ontology = create_ontology()
+    people, organizations = create_stores(ontology)
+
+    stream = StringIO()
+    organizations.serialize(stream, format="nt")
+    graph = Graph()
+    graph.parse(data=stream.getvalue(), format="nt")
+
+    assert_that(set(graph), equal_to(set(
+        (subject, predicate, to_term(value))
+        for subject, predicate, value in organizations.iter_rdf_statements()
+    )))
+    assert_that(
+        list(organizations.iter_values("label")),
+        contains_inanyorder((0, Literal("Acme Inc.", lang="en")), (1, Literal("Globex", lang="en"))),
+    )
+    assert_that(graph, has_length(4))
+
+
+def test_columnar_stores_have_their_own_terms_unless_shared():
+    ontology = create_ontology()
+    people, organizations = create_stores(ontology)
+    terms = TermDictionary()
+    employees = ColumnarStore(ontology.Person, terms=terms)
+    employers = ColumnarStore(ontology.Organization, terms=terms)
+    employees.append(label="Acme Inc.")
+    employers.append(label="Acme Inc.")
+
+    assert_that(people.terms, is_not(same_instance(organizations.terms)))
+    assert_that(people.terms.lookup(Literal("Acme Inc.", lang="en")), is_(none()))
+    assert_that(employees.terms, is_(same_instance(employers.terms)))
+    assert_that(
+        employees.columns["label"].get(0)[0],
+        is_(equal_to(employers.columns["label"].get(0)[0])),
+    )
+
+
+def test_column_scans_only_match_whole_term_ids():
+    column = Column("naics", None, None)
+    # 257 and 65536 have bytes in common with 256 across adjacent term IDs (0x00000101 0x00010000)
+    column.add(0, [257, 65536])
+    column.add(1, [256, 256])
+    column.add(3, [1, 256])
+    column.add(0, [256])
+
+    assert_that(column.scan(256), contains(0, 1, 3))
+    assert_that(column.scan(257), contains(0))
+    assert_that(column.scan(1), contains(3))
+    assert_that(column.scan(2), equal_to([]))
@@ -0,0 +1,80 @@
+"""Unit-tests for compiling ontologies into Python modules."""
+from os import path
+from types import ModuleType
+
+from hamcrest import assert_that, contains, contains_string, equal_to, is_
+from rdflib import Graph
+from six import exec_
+
+from ontology_alchemy.base import RDFS_Class
+from ontology_alchemy.builder import OntologyBuilder
+from ontology_alchemy.compile import generate_module, main
+from ontology_alchemy.ontology import Ontology
+from ontology_alchemy.tests.fixtures import RDFS_TURTLE_ONTOLOGY, create_ontology_file_object, temporary_directory
+
+
+def import_module(source_code):
+    module = ModuleType("generated_ontology")
+    exec_(compile(source_code, "generated_ontology.py", "exec"), module.__dict__)
+    return module
+
+
+def test_generated_module_matches_built_namespace():
+    ontology = Ontology.load(create_ontology_file_object(), format="turtle")
+    graph = Graph().parse(data=RDFS_TURTLE_ONTOLOGY, format="turtle")
+
+    module = import_module(generate_module(OntologyBuilder(graph)))
+
+    assert_that(sorted(module.__classes__), equal_to(sorted(ontology.__terms__)))
+    for name in ontology.__terms__:
+        klass, generated_class = getattr(ontology, name), getattr(module, name)
+        assert_that(generated_class.__uri__, equal_to(klass.__uri__))
+        assert_that(
+            [base.__name__ for base in generated_class.__bases__],
+            equal_to([base.__name__ for base in klass.__bases__]),
+        )
+        assert_that(
+            [property_class.__name__ for property_class in generated_class.__properties__],
+            equal_to([property_class.__name__ for property_class in klass.__properties__]),
+        )
+        assert_that(generated_class.label.values, equal_to(klass.label.values))
+        assert_that(generated_class.comment.values, equal_to(klass.comment.values))
+
+    assert_that(module.hasEmployee.domain.values, contains(module.Organization))
+    assert_that(module.hasExecutive.inferred_range(), contains(module.Person))
+    assert_that(issubclass(module.Corporation, RDFS_Class), is_(True))
+    corporation = module.Corporation(numberOfEmployees=10)
+    assert_that(corporation.numberOfEmployees.values, contains(10))
+
+
+def test_generated_module_names_which_are_not_identifiers():
+    graph = Graph().parse(data="""
+        @prefix rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#> .
+        @prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+        @prefix ex: <http://example.com/namespace#> .
+
+        ex:Thing a rdfs:Class .
+        ex:type a rdfs:Class; rdfs:subClassOf ex:Thing .
+        ex:has-part a rdf:Property; rdfs:domain ex:Thing .
+    """, format="turtle")
+
+    module = import_module(generate_module(OntologyBuilder(graph)))
+
+    assert_that(getattr(module, "has-part").__name__, equal_to("has-part"))
+    assert_that(module.__classes__["type"].__bases__, contains(module.Thing))
+    assert_that(module.__classes__["type"].__properties__, contains(getattr(module, "has-part")))
+
+
+def test_compile_main_writes_module():
+    with temporary_directory() as directory:
+        filename = path.join(directory, "ontology.ttl")
+        with open(filename, "w") as ontology_file:
+            ontology_file.write(RDFS_TURTLE_ONTOLOGY)
+        output = path.join(directory, "my_onto.py")
+
+        assert_that(main([filename, "-o", output]), is_(0))
+
+        with open(output) as module_file:
+            source_code = module_file.read()
+        assert_that(source_code, contains_string("class Corporation(Organization):"))
+        assert_that(import_module(source_code).__uri__, equal_to("http://example.com/namespace#"))
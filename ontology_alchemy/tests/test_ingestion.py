@@ -0,0 +1,109 @@
+"""Unit-tests for the parallel ingestion of line-based ontology files."""
+from os import path
+
+try:
+    from unittest.mock import patch
+except ImportError:  # Python 2
+    from mock import patch
+
+from hamcrest import assert_that, contains_inanyorder, equal_to, is_, none
+from rdflib import BNode, Graph, Literal, RDFS, URIRef
+
+from ontology_alchemy import ingestion
+from ontology_alchemy.builder import OntologyBuilder
+from ontology_alchemy.ingestion import ingest, parse, parse_chunk, split_lines
+from ontology_alchemy.ontology import Ontology
+from ontology_alchemy.tests.fixtures import RDFS_TURTLE_ONTOLOGY, temporary_directory
+
+
+def write_ontology(directory, format="nt"):
+    graph = Graph()
+    graph.parse(data=RDFS_TURTLE_ONTOLOGY, format="turtle")
+    lines = graph.serialize(format="nt").splitlines(True)
+    if format == "nquads":
+        lines = [line.replace(" .\n", " <http://example.com/graph> .\n") for line in lines]
+
+    filename = path.join(directory, "ontology.{}".format(format))
+    with open(filename, "w") as ontology_file:
+        ontology_file.writelines(lines)
+    return graph, filename
+
+
+def test_file_is_split_at_line_boundaries():
+    with temporary_directory() as directory:
+        _, filename = write_ontology(directory)
+        with open(filename, "rb") as ontology_file:
+            content = ontology_file.read()
+
+        ranges = split_lines(filename, 7)
+
+        assert_that(b"".join(content[start:end] for start, end in ranges), is_(equal_to(content)))
+        assert_that(all(content[end - 1:end] == b"\n" for _, end in ranges), is_(True))
+
+
+def test_chunks_only_keep_statements_of_given_predicates():
+    with temporary_directory() as directory:
+        filename = path.join(directory, "ontology.nt")
+        with open(filename, "w") as ontology_file:
+            ontology_file.write(
+                '<http://example.com/a> <{}> _:b1 .\n'
+                '<http://example.com/a>\t<{}> "A \\"quoted\\" label"@en <http://example.com/graph> .\n'
+                '<http://example.com/a> <http://example.com/ignored> "ignored" .\n'.format(RDFS.subClassOf, RDFS.label)
+            )
+
+        batch = parse_chunk((filename, 0, path.getsize(filename), [RDFS.subClassOf.n3(), RDFS.label.n3()]))
+
+    assert_that(batch, is_(equal_to({
+        RDFS.subClassOf: [(URIRef("http://example.com/a"), BNode("b1"))],
+        RDFS.label: [(URIRef("http://example.com/a"), Literal('A "quoted" label', lang="en"))],
+    })))
+
+
+def test_ingested_ontology_matches_ontology_parsed_into_a_graph():
+    with temporary_directory() as directory:
+        for format in ("nt", "nquads"):
+            graph, filename = write_ontology(directory, format)
+            expected = OntologyBuilder(graph).compile()
+            for processes in (1, 3):
+                builder = OntologyBuilder(None)
+                ingest(filename, builder, format=format, processes=processes)
+
+                assert_that(builder.compile(), is_(equal_to(expected)))
+
+        ontology = Ontology.load(filename, processes=2)
+
+    assert_that(ontology.__graph__, is_(none()))
+    assert_that(ontology.Corporation.__bases__, contains_inanyorder(ontology.Organization))
+    assert_that(ontology.hasEmployee.range, contains_inanyorder(ontology.Person))
+
+
+def test_files_are_parsed_whole_without_a_line_parser():
+    with temporary_directory() as directory:
+        graph, filename = write_ontology(directory)
+        builder = OntologyBuilder(None)
+        with patch.object(ingestion, "W3CNTriplesParser", None):
+            ingest(filename, builder, processes=2)
+
+    assert_that(builder.compile(), is_(equal_to(OntologyBuilder(graph).compile())))
+
+
+def test_ontology_streamed_into_the_builder_matches_ontology_parsed_into_a_graph():
+    graph = Graph()
+    graph.parse(data=RDFS_TURTLE_ONTOLOGY, format="turtle")
+    expected = OntologyBuilder(graph).compile()
+
+    builder = OntologyBuilder(None)
+    parse(builder, data=graph.serialize(format="xml"), format="xml")
+    assert_that(builder.compile(), is_(equal_to(expected)))
+
+    builder = OntologyBuilder(iter(graph))
+    assert_that(builder.graph, is_(none()))
+    assert_that(builder.compile(), is_(equal_to(expected)))
+
+    with temporary_directory() as directory:
+        filename = path.join(directory, "ontology.ttl")
+        graph.serialize(destination=filename, format="turtle")
+        ontology = Ontology.load(filename, keep_graph=False)
+
+    assert_that(ontology.__graph__, is_(none()))
+    assert_that(ontology.Corporation.__bases__, contains_inanyorder(ontology.Organization))
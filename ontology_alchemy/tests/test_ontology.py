@@ -0,0 +1,156 @@
+"""Unit-tests for loading ontologies."""
+from os import path
+
+from hamcrest import assert_that, contains, contains_inanyorder, has_item, is_
+from rdflib import Namespace, RDF, RDFS
+from six import StringIO
+
+from ontology_alchemy.base import RDFS_Class
+from ontology_alchemy.ontology import Ontology
+from ontology_alchemy.tests.fixtures import RDFS_TURTLE_ONTOLOGY, create_ontology_file_object, temporary_directory
+
+
+# Ontology serialized in Turtle, extending the classes and properties of `RDFS_TURTLE_ONTOLOGY`.
+EXTENDING_TURTLE_ONTOLOGY = """
+    @prefix rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#> .
+    @prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+    @prefix exampleOntology: <http://example.com/namespace#> .
+    @prefix extendingOntology: <http://example.com/extending#> .
+
+    extendingOntology:Startup a rdfs:Class;
+        rdfs:label "Startup"@en;
+        rdfs:subClassOf exampleOntology:Corporation;
+        .
+    extendingOntology:Investor a rdfs:Class;
+        rdfs:label "Investor"@en;
+        rdfs:subClassOf exampleOntology:Person;
+        .
+    extendingOntology:hasInvestor a rdf:Property;
+        rdfs:label "has investor"@en;
+        rdfs:domain exampleOntology:Organization;
+        rdfs:range extendingOntology:Investor;
+        .
+"""
+
+# Ontologies serialized in Turtle, each extending the classes of the other.
+MUTUALLY_EXTENDING_TURTLE_ONTOLOGIES = ("""
+    @prefix rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#> .
+    @prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+    @prefix a: <http://example.com/a#> .
+    @prefix b: <http://example.com/b#> .
+
+    a:Agent a rdfs:Class .
+    a:Startup a rdfs:Class; rdfs:subClassOf b:Corporation .
+    a:hasFounder a rdf:Property; rdfs:domain b:Corporation; rdfs:range a:Agent .
+""", """
+    @prefix rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#> .
+    @prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+    @prefix a: <http://example.com/a#> .
+    @prefix b: <http://example.com/b#> .
+
+    b:Corporation a rdfs:Class .
+    b:Person a rdfs:Class; rdfs:subClassOf a:Agent .
+    b:hasEmployee a rdf:Property; rdfs:domain b:Corporation; rdfs:range b:Person .
+""")
+
+EX = Namespace("http://example.com/multiple#")
+
+# Ontology serialized in Turtle, with classes having several base classes.
+MULTIPLE_INHERITANCE_TURTLE_ONTOLOGY = """
+    @prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+    @prefix ex: <http://example.com/multiple#> .
+
+    ex:Agent a rdfs:Class .
+    ex:Corporation a rdfs:Class; rdfs:subClassOf ex:Agent .
+    ex:GovernmentAgency a rdfs:Class; rdfs:subClassOf ex:Agent .
+    ex:StateOwnedCorporation a rdfs:Class; rdfs:subClassOf ex:Corporation, ex:GovernmentAgency .
+    ex:PublicUtility a rdfs:Class; rdfs:subClassOf ex:StateOwnedCorporation .
+"""
+
+
+def write_ontologies(directory, *contents):
+    filenames = []
+    for index, content in enumerate(contents):
+        filename = path.join(directory, "ontology-{}.ttl".format(index))
+        with open(filename, "w") as ontology_file:
+            ontology_file.write(content)
+        filenames.append(filename)
+    return filenames
+
+
+def test_loading_many_ontologies_resolves_references_across_ontologies():
+    with temporary_directory() as directory:
+        filenames = write_ontologies(directory, EXTENDING_TURTLE_ONTOLOGY, RDFS_TURTLE_ONTOLOGY)
+        for processes in (1, 2):
+            ontologies = Ontology.load_many(filenames, processes=processes)
+
+            assert_that(list(ontologies), contains("http://example.com/namespace#", "http://example.com/extending#"))
+            ontology = ontologies["http://example.com/namespace#"]
+            extending_ontology = ontologies["http://example.com/extending#"]
+
+            assert_that(extending_ontology.Startup.__bases__, contains(ontology.Corporation))
+            assert_that(extending_ontology.hasInvestor.domain, contains_inanyorder(ontology.Organization))
+
+            startup = extending_ontology.Startup(label="Acme Inc.")
+            startup.hasEmployee += ontology.Person(label="John Doe")
+            startup.hasInvestor += extending_ontology.Investor(label="Jane Doe")
+            assert_that(len(startup.hasInvestor.values), is_(1))
+
+
+def test_loading_many_ontologies_resolves_references_between_mutually_referencing_ontologies():
+    with temporary_directory() as directory:
+        filenames = write_ontologies(directory, *MUTUALLY_EXTENDING_TURTLE_ONTOLOGIES)
+        for processes, lazy, keep_graph in ((1, False, True), (2, False, True), (1, True, True), (2, False, False)):
+            ontologies = Ontology.load_many(filenames, processes=processes, lazy=lazy, keep_graph=keep_graph)
+
+            assert_that(list(ontologies), contains_inanyorder("http://example.com/a#", "http://example.com/b#"))
+            a, b = ontologies["http://example.com/a#"], ontologies["http://example.com/b#"]
+
+            assert_that(a.Startup.__bases__, contains(b.Corporation))
+            assert_that(b.Person.__bases__, contains(a.Agent))
+            assert_that(a.hasFounder.domain, contains(b.Corporation))
+            assert_that(a.Startup.__properties__, has_item(b.hasEmployee))
+
+            startup = a.Startup(label="Acme Inc.")
+            startup.hasEmployee += b.Person(label="John Doe")
+            startup.hasFounder += b.Person(label="Jane Doe")
+            assert_that(len(startup.hasFounder.values), is_(1))
+
+
+def test_hierarchy_queries():
+    ontology = Ontology.load(create_ontology_file_object(), format="turtle")
+
+    assert_that(ontology.is_subclass(ontology.Corporation, ontology.Thing), is_(True))
+    assert_that(ontology.is_subclass(ontology.Corporation, ontology.Corporation), is_(True))
+    assert_that(ontology.is_subclass(ontology.Thing, ontology.Corporation), is_(False))
+    assert_that(ontology.is_subclass(ontology.Person, ontology.Organization), is_(False))
+    assert_that(ontology.is_subclass(ontology.Corporation, RDFS_Class), is_(True))
+    assert_that(ontology.ancestors(ontology.Corporation), contains(ontology.Organization, ontology.Thing))
+    assert_that(ontology.descendants(ontology.Organization), contains_inanyorder(
+        ontology.Corporation,
+        ontology.GovernmentOrganization,
+    ))
+    assert_that(ontology.descendants(ontology.hasEmployee), contains(ontology.hasExecutive))
+
+
+def test_hierarchy_queries_with_multiple_inheritance():
+    ontology = Ontology.load(StringIO(MULTIPLE_INHERITANCE_TURTLE_ONTOLOGY), format="turtle", lazy=True)
+
+    assert_that(ontology.is_subclass(ontology.StateOwnedCorporation, ontology.GovernmentAgency), is_(True))
+    assert_that(ontology.is_subclass(ontology.PublicUtility, ontology.Agent), is_(True))
+    assert_that(ontology.is_subclass(ontology.Corporation, ontology.GovernmentAgency), is_(False))
+    assert_that(ontology.descendants(ontology.GovernmentAgency), contains_inanyorder(
+        ontology.StateOwnedCorporation,
+        ontology.PublicUtility,
+    ))
+    assert_that(ontology.ancestors(ontology.PublicUtility), contains_inanyorder(
+        ontology.StateOwnedCorporation,
+        ontology.Corporation,
+        ontology.GovernmentAgency,
+        ontology.Agent,
+    ))
+
+    ontology.apply(added=[(EX.Bank, RDF.type, RDFS.Class), (EX.Bank, RDFS.subClassOf, EX.Corporation)])
+
+    assert_that(ontology.descendants(ontology.Agent), has_item(ontology.Bank))
+    assert_that(ontology.is_subclass(ontology.Bank, ontology.GovernmentAgency), is_(False))
@@ -5,13 +5,21 @@ from hamcrest import (
     assert_that,
     calling,
     contains_inanyorder,
+    contains_string,
+    empty,
     equal_to,
+    has_key,
     has_length,
     is_,
+    is_not,
     raises,
+    same_instance,
 )
-from rdflib import Literal
+from rdflib import RDFS, Literal
 
+from ontology_alchemy.base import CLASS_PROPERTY_PROXIES
+from ontology_alchemy.proxy import PropertyProxy
+from ontology_alchemy.session import session_context
 from ontology_alchemy.tests.fixtures import create_ontology
 
 
@@ -61,6 +69,27 @@ def test_invalid_properties_for_a_class_instance_constructor_raise_attribute_err
     assert_that(calling(ontology.Organization).with_args(foo="bar"), raises(AttributeError))
 
 
+def test_class_level_property_proxies_are_created_on_demand():
+    ontology = create_ontology()
+
+    assert_that(CLASS_PROPERTY_PROXIES[ontology.Organization], is_not(has_key("seeAlso")))
+
+    ontology.Organization.seeAlso += "http://schema.org/Organization"
+
+    assert_that(CLASS_PROPERTY_PROXIES[ontology.Organization], has_key("seeAlso"))
+    assert_that(ontology.Organization.seeAlso, contains_inanyorder("http://schema.org/Organization"))
+    assert_that(ontology.Corporation.seeAlso.values, is_(empty()))
+
+
+def test_class_level_literal_property_assignment_works():
+    ontology = create_ontology()
+    ontology.Corporation.label += Literal("Empresa", lang="es")
+
+    assert_that(ontology.Corporation.label(lang="es"), contains_inanyorder("Empresa"))
+    assert_that(ontology.Corporation.label(lang="en"), contains_inanyorder("Corporation"))
+    assert_that(ontology.Organization.label(lang="es"), is_(equal_to(None)))
+
+
 def test_valid_property_assigment_for_a_class_instance_work():
     ontology = create_ontology()
     domain_instance = ontology.Organization(
@@ -133,6 +162,131 @@ def test_invalid_domain_property_assigment_for_a_class_instance_raises_value_err
     assert_that(calling(invalid_assigment_clause), raises(ValueError))
 
 
+def test_instance_property_proxies_are_created_on_first_access():
+    ontology = create_ontology()
+    instance = ontology.Organization(label="Acme Inc.")
+
+    assert_that(instance.__dict__, has_key("label"))
+    assert_that(instance.__dict__, is_not(has_key("hasEmployee")))
+
+    employee = ontology.Person()
+    instance.hasEmployee += employee
+
+    assert_that(instance.__dict__, has_key("hasEmployee"))
+    assert_that(instance.hasEmployee(employee), is_(True))
+    assert_that(ontology.Organization().hasEmployee(employee), is_(False))
+
+
+def test_instance_property_proxies_follow_properties_replaced_in_place():
+    ontology = create_ontology()
+    ontology.Organization().hasEmployee
+    properties = ontology.Organization.__properties__
+    properties[properties.index(ontology.hasEmployee)] = ontology.currencyCode
+
+    instance = ontology.Organization()
+
+    assert_that(instance.currencyCode.name, is_(equal_to("currencyCode")))
+    assert_that(calling(getattr).with_args(instance, "hasEmployee"), raises(AttributeError))
+
+    ontology.Organization.__properties__ = [ontology.hasEmployee]
+
+    assert_that(ontology.Organization().hasEmployee.name, is_(equal_to("hasEmployee")))
+
+
+def test_property_instance_string_representation_works():
+    ontology = create_ontology()
+    instance = ontology.hasEmployee(label="employs")
+
+    assert_that(str(instance), contains_string("domain="))
+
+
+def test_inferred_domain_of_a_sub_property_is_memoized():
+    ontology = create_ontology()
+    inferred_domain = ontology.hasExecutive.inferred_domain()
+
+    assert_that(inferred_domain, contains_inanyorder(ontology.Organization))
+    assert_that(ontology.hasExecutive.inferred_domain(), is_(equal_to(inferred_domain)))
+    assert_that(ontology.hasExecutive.__dict__, has_key("__inferred_domain__"))
+
+
+def test_inferred_range_of_a_sub_property_is_invalidated_when_range_changes():
+    ontology = create_ontology()
+    ontology.hasExecutive.inferred_range()
+    ontology.hasEmployee.range += ontology.Organization
+
+    assert_that(
+        ontology.hasExecutive.inferred_range(),
+        contains_inanyorder(ontology.Person, ontology.Organization),
+    )
+
+    ontology.hasEmployee.range = PropertyProxy(name="range", uri=RDFS.range)
+
+    assert_that(ontology.hasExecutive.inferred_range(), is_(empty()))
+
+
+def test_inferred_domain_and_range_follow_changes_of_proxy_values():
+    ontology = create_ontology()
+    ontology.hasExecutive.inferred_range()
+    ontology.hasExecutive.inferred_domain()
+    ontology.hasEmployee.range.values.append(ontology.Organization)
+    ontology.hasEmployee.domain.values[:] = [ontology.Thing]
+
+    assert_that(
+        ontology.hasExecutive.inferred_range(),
+        contains_inanyorder(ontology.Person, ontology.Organization),
+    )
+    assert_that(ontology.hasExecutive.inferred_domain(), contains_inanyorder(ontology.Thing))
+
+    ontology.hasEmployee.range.values = []
+
+    assert_that(ontology.hasExecutive.inferred_range(), is_(empty()))
+
+
+def test_inferred_range_follows_changes_of_a_replaced_range():
+    ontology = create_ontology()
+    range_proxy = ontology.hasEmployee.range = PropertyProxy(name="range", uri=RDFS.range)
+    ontology.hasExecutive.inferred_range()
+    range_proxy += ontology.Organization
+
+    assert_that(ontology.hasExecutive.inferred_range(), contains_inanyorder(ontology.Organization))
+
+
+def test_inferred_range_is_kept_when_unrelated_ranges_change():
+    ontology = create_ontology()
+    other_ontology = create_ontology()
+    inferred_range = ontology.hasExecutive._inferred("range")
+    other_ontology.hasEmployee.range += other_ontology.Organization
+
+    assert_that(ontology.hasExecutive._inferred("range"), is_(same_instance(inferred_range)))
+
+
+def test_instance_property_range_follows_property_range_changes():
+    ontology = create_ontology()
+    instance = ontology.Organization(label="Acme Inc.")
+    country = ontology.Country(label="UnitedStates")
+
+    assert_that(calling(instance.hasEmployee.__iadd__).with_args(country), raises(ValueError))
+
+    ontology.hasEmployee.range += ontology.Country
+    ontology.Organization().hasEmployee += country
+
+
+def test_range_validator_is_shared_by_instances_and_follows_proxy_range_changes():
+    ontology = create_ontology()
+    instance = ontology.Organization(label="Acme Inc.")
+    other_instance = ontology.Organization(label="Globex")
+    person = ontology.Person(label="John Doe")
+    country = ontology.Country(label="UnitedStates")
+
+    instance.hasEmployee += person
+    assert_that(instance.hasEmployee.validator, is_(same_instance(other_instance.hasEmployee.validator)))
+    assert_that(instance.hasEmployee.is_valid(country), is_(False))
+
+    instance.hasEmployee.range = instance.hasEmployee.range + [ontology.Country]
+    instance.hasEmployee += country
+    assert_that(other_instance.hasEmployee.is_valid(country), is_(False))
+
+
 def test_nonexistant_property_language_tag_returns_none():
     ontology = create_ontology()
     instance = ontology.Organization(label="Acme Inc.")
@@ -146,3 +300,58 @@ def test_instance_rdf_statements_are_valid():
 
     statements = list(instance.iter_rdf_statements())
     assert_that(statements, has_length(1))
+
+
+def test_bulk_created_instances_match_instances_created_one_at_a_time():
+    ontology = create_ontology()
+    person = ontology.Person(label="John Doe")
+
+    with session_context() as session:
+        instances = ontology.Organization.bulk_create([
+            {"uri": "http://example.com/acme", "label": "Acme Inc.", "hasEmployee": person},
+            {"label": "Acme Inc.", "numberOfEmployees": 100},
+        ])
+        instance = ontology.Organization(uri="http://example.com/acme", label="Acme Inc.", hasEmployee=person)
+
+        assert_that(session.instances_of(ontology.Organization), contains_inanyorder(instance, *instances))
+
+    assert_that(
+        set(instances[0].iter_rdf_statements()),
+        equal_to(set(instance.iter_rdf_statements())),
+    )
+    assert_that(instances[1].numberOfEmployees, contains_inanyorder(100))
+    assert_that(instances[1].uri, is_not(empty()))
+
+
+def test_bulk_created_instances_accept_unhashable_values():
+    ontology = create_ontology()
+    instances = ontology.Thing.bulk_create([{"value": ["x"]}, {"value": ["x"]}])
+
+    assert_that(instances[0].value, contains_inanyorder(["x"]))
+    assert_that(instances[1].value, contains_inanyorder(["x"]))
+
+
+def test_instances_created_from_records_work():
+    ontology = create_ontology()
+    instances = ontology.Organization.from_records(
+        [("http://example.com/acme", "Acme Inc."), ("http://example.com/globex", "Globex")],
+        fields=("uri", "label"),
+    )
+
+    assert_that(instances[1].uri, equal_to("http://example.com/globex"))
+    assert_that(instances[1].label(lang="en"), contains_inanyorder("Globex"))
+    assert_that(instances[0].hasEmployee.values, is_(empty()))
+
+
+def test_invalid_property_value_for_bulk_created_instances_raises_value_error():
+    ontology = create_ontology()
+    country = ontology.Country(label="UnitedStates")
+
+    assert_that(
+        calling(ontology.Organization.bulk_create).with_args([{"hasEmployee": country}]),
+        raises(ValueError),
+    )
+    assert_that(
+        calling(ontology.Organization.bulk_create).with_args([{"foo": "bar"}]),
+        raises(AttributeError),
+    )
@@ -0,0 +1,154 @@
+"""Unit-tests for the entailment of the statements of ontology class instances."""
+try:
+    from unittest.mock import patch
+except ImportError:  # Python 2
+    from mock import patch
+
+from hamcrest import assert_that, contains, contains_inanyorder, empty, equal_to, has_item, is_, is_not
+from rdflib import OWL, RDF, Namespace, URIRef
+from six import StringIO
+
+from ontology_alchemy.ontology import Ontology
+from ontology_alchemy.reasoning import Reasoner
+from ontology_alchemy.serialization import to_term
+from ontology_alchemy.session import session_context
+
+
+FAMILY = Namespace("http://example.com/family#")
+
+# Ontology serialized in Turtle, with properties having OWL characteristics.
+OWL_TURTLE_ONTOLOGY = """
+    @prefix rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#> .
+    @prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+    @prefix owl: <http://www.w3.org/2002/07/owl#> .
+    @prefix ex: <http://example.com/family#> .
+
+    ex:Agent a rdfs:Class .
+    ex:Person a rdfs:Class; rdfs:subClassOf ex:Agent .
+    ex:Parent a rdfs:Class; rdfs:subClassOf ex:Person .
+    ex:knows a rdf:Property, owl:SymmetricProperty; rdfs:domain ex:Agent; rdfs:range ex:Agent .
+    ex:hasAncestor a rdf:Property, owl:TransitiveProperty; rdfs:domain ex:Person; rdfs:range ex:Person .
+    ex:hasParent a rdf:Property; rdfs:subPropertyOf ex:hasAncestor; rdfs:range ex:Parent .
+    ex:hasChild a rdf:Property; owl:inverseOf ex:hasParent; rdfs:domain ex:Person .
+"""
+
+
+def test_property_characteristics_and_inverses():
+    with session_context():
+        ontology = Ontology.load(StringIO(OWL_TURTLE_ONTOLOGY), format="turtle")
+
+        assert_that(ontology.knows.__characteristics__, equal_to(frozenset([OWL.SymmetricProperty])))
+        assert_that(ontology.hasAncestor.__characteristics__, equal_to(frozenset([OWL.TransitiveProperty])))
+        assert_that(ontology.hasParent.__dict__.get("__characteristics__"), is_(None))
+        assert_that(ontology.hasChild.inverseOf.values, contains(ontology.hasParent))
+
+
+def test_reasoner_entails_statements():
+    with session_context():
+        ontology = Ontology.load(StringIO(OWL_TURTLE_ONTOLOGY), format="turtle")
+        alice = ontology.Person(uri="http://example.com/alice")
+        bob = ontology.Person(uri="http://example.com/bob")
+        carol = ontology.Person(uri="http://example.com/carol")
+        alice.hasParent += bob
+        bob.hasParent += carol
+        alice.knows += bob
+        reasoner = Reasoner()
+
+        assert_that(reasoner.run(), is_not(0))
+
+        assert_that(reasoner.objects(alice, ontology.hasAncestor), contains_inanyorder(bob, carol))
+        assert_that(reasoner.objects(bob, ontology.knows), contains(alice))
+        assert_that(reasoner.objects(carol, ontology.hasChild), contains(bob))
+        assert_that(reasoner.types(bob), contains(ontology.Person, ontology.Parent))
+        assert_that(reasoner.is_instance(carol, ontology.Parent), is_(True))
+        assert_that(reasoner.is_instance(alice, ontology.Parent), is_(False))
+        assert_that(
+            list(reasoner.inferred_statements()),
+            has_item((URIRef(bob.uri), RDF.type, URIRef(ontology.Parent.__uri__))),
+        )
+        assert_that(reasoner.run(), is_(0))
+
+        reasoner.materialize()
+
+        assert_that(alice.hasAncestor.values, contains_inanyorder(bob, carol))
+        assert_that(carol.hasChild.values, contains(bob))
+
+
+def test_reasoner_entails_new_statements_incrementally():
+    with session_context():
+        ontology = Ontology.load(StringIO(OWL_TURTLE_ONTOLOGY), format="turtle")
+        alice = ontology.Person(uri="http://example.com/alice")
+        bob = ontology.Person(uri="http://example.com/bob")
+        alice.hasAncestor += bob
+        reasoner = Reasoner()
+        reasoner.run()
+        assert_that(reasoner.objects(bob, ontology.hasAncestor), empty())
+
+        carol = ontology.Person(uri="http://example.com/carol")
+        dave = ontology.Person(uri="http://example.com/dave")
+        carol.hasAncestor += dave
+        bob.hasAncestor += carol
+
+        reasoner.run([bob, carol, dave])
+
+        assert_that(reasoner.objects(alice, ontology.hasAncestor), contains_inanyorder(bob, carol, dave))
+        assert_that(reasoner.objects(bob, ontology.hasAncestor), contains_inanyorder(carol, dave))
+
+
+def test_reasoner_derives_rules_from_the_classes_of_instances():
+    ontology = Ontology.load(StringIO(OWL_TURTLE_ONTOLOGY), format="turtle")
+    with session_context():
+        alice = ontology.Person(uri="http://example.com/alice")
+        bob = ontology.Person(uri="http://example.com/bob")
+        carol = ontology.Person(uri="http://example.com/carol")
+        alice.hasParent += bob
+        bob.hasParent += carol
+        reasoner = Reasoner()
+
+        assert_that(reasoner.run(), is_not(0))
+
+        assert_that(reasoner.objects(alice, ontology.hasAncestor), contains_inanyorder(bob, carol))
+        assert_that(reasoner.objects(carol, ontology.hasChild), contains(bob))
+
+
+def test_reasoner_entails_indexed_statements_again_when_rules_change():
+    with session_context():
+        ontology = Ontology.load(StringIO(OWL_TURTLE_ONTOLOGY), format="turtle")
+        alice = ontology.Person(uri="http://example.com/alice")
+        bob = ontology.Person(uri="http://example.com/bob")
+        alice.hasAncestor += bob
+        reasoner = Reasoner()
+        reasoner.run()
+
+        ontology.apply(added=[
+            (FAMILY.hasDescendant, RDF.type, RDF.Property),
+            (FAMILY.hasDescendant, OWL.inverseOf, FAMILY.hasAncestor),
+        ])
+
+        assert_that(reasoner.run(), is_not(0))
+
+        assert_that(reasoner.objects(bob, ontology.hasDescendant), contains(alice))
+
+
+def test_reasoner_only_reads_values_added_since_the_last_run():
+    with session_context():
+        ontology = Ontology.load(StringIO(OWL_TURTLE_ONTOLOGY), format="turtle")
+        alice = ontology.Person(uri="http://example.com/alice")
+        bob = ontology.Person(uri="http://example.com/bob")
+        carol = ontology.Person(uri="http://example.com/carol")
+        alice.hasAncestor += bob
+        reasoner = Reasoner()
+        reasoner.run()
+
+        bob.hasAncestor += carol
+        with patch("ontology_alchemy.reasoning.to_term", side_effect=to_term) as to_term_mock:
+            reasoner.run()
+
+        assert_that(to_term_mock.call_count, is_(1))
+        assert_that(reasoner.objects(alice, ontology.hasAncestor), contains_inanyorder(bob, carol))
+
+        dave = ontology.Person(uri="http://example.com/dave")
+        alice.hasAncestor.values = [dave]
+        reasoner.run()
+
+        assert_that(reasoner.objects(alice, ontology.hasAncestor), contains_inanyorder(bob, carol, dave))
@@ -1,11 +1,26 @@
 """Unit-tests for the core ontology module."""
+import asyncio
+import gc
+from threading import Event, Thread
+
 from hamcrest import (
     assert_that,
+    calling,
     contains_inanyorder,
     empty,
+    equal_to,
+    has_length,
     is_,
+    is_not,
+    none,
+    raises,
+    same_instance,
 )
+from nose_parameterized import parameterized
+from rdflib import ConjunctiveGraph, URIRef
+from six import BytesIO, StringIO
 
+from ontology_alchemy.serialization import to_term
 from ontology_alchemy.session import Session, session_context
 from ontology_alchemy.tests.fixtures import create_ontology
 
@@ -63,3 +78,227 @@ def test_session_decorator_registers_ontology_classes_properly():
     _create_ontology()
 
     assert_session_is_empty(default_session)
+
+
+def test_session_context_is_exited_when_an_exception_is_raised():
+    default_session = Session.get_current()
+
+    def raising_clause():
+        with session_context():
+            raise KeyError()
+
+    assert_that(calling(raising_clause), raises(KeyError))
+    assert_that(Session.get_current(), is_(same_instance(default_session)))
+
+
+def test_session_stack_lists_the_current_sessions():
+    with session_context() as session:
+        assert_that(Session.stack, is_(equal_to((Session.default, session))))
+        assert_that(Session.stack[-1], is_(same_instance(Session.get_current())))
+
+    assert_that(Session.stack, is_(equal_to((Session.default,))))
+
+
+def test_session_stack_pushes_and_pops_sessions_as_a_list():
+    session = Session()
+    Session.stack.append(session)
+    try:
+        assert_that(Session.get_current(), is_(same_instance(session)))
+        assert_that(Session.stack, is_(equal_to([Session.default, session])))
+    finally:
+        popped = Session.stack.pop()
+
+    assert_that(popped, is_(same_instance(session)))
+    assert_that(Session.get_current(), is_(same_instance(Session.default)))
+    assert_that(calling(Session.stack.pop), raises(IndexError))
+
+
+def test_session_contexts_are_scoped_per_thread():
+    default_session = Session.get_current()
+    ontology = create_ontology()
+    entered, checked = Event(), Event()
+    sessions = []
+
+    def scoped_thread():
+        with session_context() as session:
+            sessions.append(session)
+            ontology.Organization(uri="http://example.com/acme")
+            entered.set()
+            checked.wait()
+
+    thread = Thread(target=scoped_thread)
+    thread.start()
+    entered.wait()
+    current_session = Session.get_current()
+    checked.set()
+    thread.join()
+
+    assert_that(current_session, is_(same_instance(default_session)))
+    assert_that(sessions[0].get("http://example.com/acme"), is_not(none()))
+    assert_that(default_session.get("http://example.com/acme"), is_(none()))
+
+
+def test_session_contexts_are_scoped_per_asyncio_task():
+    task_sessions = []
+
+    async def scoped_task():
+        with session_context() as session:
+            # Let the other task enter its own session context
+            await asyncio.sleep(0)
+            task_sessions.append(Session.get_current() is session)
+
+    async def run_tasks():
+        with session_context() as session:
+            await asyncio.gather(scoped_task(), scoped_task())
+            return Session.get_current() is session
+
+    assert_that(asyncio.run(run_tasks()), is_(True))
+    assert_that(task_sessions, contains_inanyorder(True, True))
+
+
+def test_session_indexes_instances_by_uri_and_class():
+    with session_context() as session:
+        ontology = create_ontology()
+        instance = ontology.Organization(uri="http://example.com/acme", label="Acme Inc.")
+
+        assert_that(instance in session.instances, is_(True))
+        assert_that(session.get(URIRef("http://example.com/acme")), is_(same_instance(instance)))
+        assert_that(session.instances_by_class[ontology.Organization], contains_inanyorder(instance))
+        assert_that(session.get("http://example.com/unknown"), is_(none()))
+
+
+def test_unregistered_instances_are_removed_from_all_indexes():
+    with session_context() as session:
+        ontology = create_ontology()
+        instance = ontology.Organization(uri="http://example.com/acme")
+        session.unregister(instance)
+        session.unregister(instance)
+        session.unregister(ontology.Organization)
+
+        assert_that(session.instances, is_(empty()))
+        assert_that(session.get("http://example.com/acme"), is_(none()))
+        assert_that(session.instances_by_class[ontology.Organization], is_(empty()))
+        assert_that(ontology.Organization in session.classes, is_(False))
+
+
+def test_registered_instances_support_the_list_api():
+    with session_context() as session:
+        ontology = create_ontology()
+        acme = ontology.Organization(uri="http://example.com/acme")
+        initech = ontology.Organization(uri="http://example.com/initech")
+        globex = ontology.Organization(uri="http://example.com/globex")
+        session.unregister(globex)
+        session.instances += [globex]
+
+        assert_that(session.instances, is_(equal_to([acme, initech, globex])))
+        assert_that(session.instances[-1], is_(same_instance(globex)))
+        assert_that(session.instances[1], is_(same_instance(initech)))
+        assert_that(session.instances[-3], is_(same_instance(acme)))
+        assert_that(session.instances[1:], is_(equal_to([initech, globex])))
+        assert_that(calling(session.instances.__getitem__).with_args(3), raises(IndexError))
+        assert_that(session.get("http://example.com/globex"), is_(same_instance(globex)))
+
+        session.instances.remove(initech)
+
+        assert_that(list(session.instances), is_(equal_to([acme, globex])))
+        assert_that(calling(session.instances.remove).with_args(initech), raises(ValueError))
+        assert_that(session.instances_by_class[ontology.Organization], contains_inanyorder(acme, globex))
+
+        session.instances = []
+
+        assert_that(session.instances, is_(empty()))
+        assert_that(session.get("http://example.com/acme"), is_(none()))
+
+
+def test_weak_session_does_not_keep_instances_alive():
+    with session_context(weak=True) as session:
+        ontology = create_ontology()
+        instance = ontology.Organization(uri="http://example.com/acme")
+
+        assert_that(session.get("http://example.com/acme"), is_(same_instance(instance)))
+
+        other_instance = ontology.Organization(uri="http://example.com/initech")
+
+        assert_that(session.instances[0], is_(same_instance(instance)))
+        assert_that(session.instances[-1], is_(same_instance(other_instance)))
+
+        del instance, other_instance
+        gc.collect()
+
+        assert_that(session.instances, is_(empty()))
+        assert_that(session.get("http://example.com/acme"), is_(none()))
+
+
+def test_weak_session_statements_skip_instances_collected_during_export():
+    with session_context(weak=True) as session:
+        ontology = create_ontology()
+        acme = ontology.Organization(uri="http://example.com/acme", label="Acme Inc.")
+        initech = ontology.Organization(uri="http://example.com/initech", label="Initech")
+        statements = session.rdf_statements()
+
+        del initech
+        gc.collect()
+
+        assert_that(
+            set(subject for subject, _, _ in statements),
+            is_(equal_to(set([acme.uri]))),
+        )
+
+
+def test_instances_of_a_class_include_instances_of_its_sub_classes():
+    with session_context() as session:
+        ontology = create_ontology()
+        organization = ontology.Organization()
+        corporation = ontology.Corporation()
+        government_organization = ontology.GovernmentOrganization()
+        ontology.Person()
+
+        assert_that(
+            session.instances_of(ontology.Organization),
+            contains_inanyorder(organization, corporation, government_organization),
+        )
+        assert_that(
+            session.instances_of(ontology.Organization, include_subclasses=False),
+            contains_inanyorder(organization),
+        )
+        assert_that(list(session.instances_of(ontology.Country)), is_(empty()))
+
+
+def test_session_rdf_statements_cover_all_instances():
+    with session_context() as session:
+        ontology = create_ontology()
+        ontology.Organization(label="Acme Inc.", comment="A corporation")
+        ontology.Person(label="John Doe")
+
+        assert_that(list(session.rdf_statements()), has_length(3))
+
+
+@parameterized.expand([
+    ("nt", ),
+    ("nquads", ),
+    ("turtle", ),
+])
+def test_session_serialization_can_be_parsed_back(format):
+    with session_context() as session:
+        ontology = create_ontology()
+        organization = ontology.Organization(uri="http://example.com/acme", label='Acme "Inc."\nSolar panels')
+        person = ontology.Person(uri="http://example.com/john", label="John Doe")
+        organization.hasEmployee += person
+        organization.numberOfEmployees += 100
+
+        stream = StringIO()
+        session.serialize(stream, format=format, chunk_size=2)
+
+    graph = ConjunctiveGraph()
+    graph.parse(data=stream.getvalue(), format=format)
+
+    assert_that(set(graph), equal_to(set(
+        (URIRef(subject), predicate, to_term(value))
+        for subject, predicate, value in session.rdf_statements()
+    )))
+    assert_that(graph, has_length(4))
+
+
+def test_session_serialization_to_unsupported_format_raises_value_error():
+    with session_context() as session:
+        assert_that(calling(session.serialize).with_args(BytesIO(), format="xml"), raises(ValueError))
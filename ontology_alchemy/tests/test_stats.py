@@ -0,0 +1,44 @@
+"""Unit-tests for the instrumentation of ontology builds."""
+from hamcrest import assert_that, contains, equal_to, greater_than, has_entries, has_items, is_
+from rdflib import Graph, Namespace, RDF, RDFS
+
+from ontology_alchemy.builder import OntologyBuilder
+from ontology_alchemy.ontology import Ontology
+from ontology_alchemy.stats import BuildStats
+from ontology_alchemy.tests.fixtures import create_ontology_file_object
+
+
+def test_load_collects_build_stats():
+    phases = []
+    stats = BuildStats(callback=lambda name, seconds: phases.append(name))
+
+    ontology = Ontology.load(create_ontology_file_object(), format="turtle", stats=stats)
+
+    assert_that(list(stats.phases), has_items(
+        "parse",
+        "index",
+        "toposort",
+        "compile_definitions",
+        "create_types",
+        "build_property_proxies",
+    ))
+    assert_that(phases, equal_to(list(stats.phases)))
+    assert_that(stats.triples, has_entries({RDF.type: 11, RDFS.subClassOf: 5, RDFS.domain: 4}))
+    assert_that(stats.classes_created, equal_to(len(ontology.__terms__)))
+    assert_that(stats.properties_propagated, greater_than(0))
+
+
+def test_build_stats_skipped_uris():
+    EX = Namespace("http://example.com/namespace#")
+    OTHER = Namespace("http://example.org/other#")
+    graph = Graph()
+    graph.add((EX.Person, RDF.type, RDFS.Class))
+    graph.add((EX.Employee, RDF.type, RDFS.Class))
+    graph.add((EX.Employee, RDFS.subClassOf, EX.Person))
+    graph.add((OTHER.Agent, RDF.type, RDFS.Class))
+    stats = BuildStats()
+
+    OntologyBuilder(graph, base_uri=str(EX), stats=stats).build_namespace()
+
+    assert_that(stats.skipped_uris, contains(OTHER.Agent))
+    assert_that(stats.classes_created, is_(2))
@@ -0,0 +1,25 @@
+"""Unit-tests for term dictionaries."""
+from hamcrest import assert_that, equal_to, is_, is_not, none, same_instance
+from rdflib import Literal, URIRef
+
+from ontology_alchemy.terms import TermDictionary
+
+
+def test_terms_are_assigned_stable_ids_in_order():
+    terms = TermDictionary()
+    uri = URIRef("http://example.com/acme")
+
+    assert_that(terms.encode(uri), equal_to(0))
+    assert_that(terms.encode(Literal("Acme Inc.", lang="en")), equal_to(1))
+    assert_that(terms.encode(URIRef("http://example.com/acme")), equal_to(0))
+    assert_that(terms.decode(0), is_(same_instance(uri)))
+    assert_that(terms.lookup(URIRef("http://example.com/globex")), is_(none()))
+    assert_that(len(terms), equal_to(2))
+
+
+def test_equal_numbers_of_different_types_are_distinct_terms():
+    terms = TermDictionary()
+
+    assert_that(terms.encode(1), is_not(equal_to(terms.encode(True))))
+    assert_that(terms.encode(1), is_not(equal_to(terms.encode(1.0))))
+    assert_that(terms.decode(terms.encode(True)), is_(same_instance(True)))
@@ -0,0 +1,2 @@
+"""Package version."""
+__version__ = "0.2.0"
@@ -11,7 +11,7 @@ setup(
     author="Globality Engineering",
     author_email="engineering@globality.com",
     url="https://github.com/globality-corp/ontology-alchemy",
-    packages=find_packages(exclude=["*.tests", "*.tests.*", "tests.*", "tests"]),
+    packages=find_packages(exclude=["*.tests", "*.tests.*", "tests.*", "tests", "benchmarks", "benchmarks.*"]),
     include_package_data=True,
     zip_safe=False,
     keywords="ontology-alchemy",